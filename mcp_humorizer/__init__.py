@@ -14,7 +14,9 @@ from __future__ import annotations
 __all__ = [
     "__version__",
     "comedicize_text",
+    "comedicize_text_async",
     "Settings",
+    "get_settings",
     "HumorStyle",
     "Provider",
     "build_system_prompt",
@@ -22,5 +24,5 @@ __all__ = [
 
 __version__ = "0.1.0"
 
-from .engine import comedicize_text
-from .config import Settings, HumorStyle, Provider, build_system_prompt
+from .engine import comedicize_text, comedicize_text_async
+from .config import Settings, HumorStyle, Provider, build_system_prompt, get_settings
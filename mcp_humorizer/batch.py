@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, get_args
+
+from .config import HumorStyle, Settings
+from .engine import comedicize_text_async, comedicize_texts_coalesced_async
+
+logger = logging.getLogger(__name__)
+
+# Coalescing: only texts up to this length are merged, at most this many per completion
+COALESCE_MAX_CHARS = 600
+COALESCE_MAX_ITEMS = 4
+
+STYLES = frozenset(get_args(HumorStyle))
+
+OnResult = Callable[[Dict[str, Any]], Awaitable[None]]
+# Identical inputs share one generation: (normalized text, style)
+_InputKey = Tuple[str, str]
+
+
+def _item_key(item: Dict[str, Any], settings: Settings) -> _InputKey:
+    text = " ".join(str(item.get("summarized_text") or "").split())
+    style = str(item.get("style") or settings.humor_style).strip().lower()
+    return text, style
+
+
+def _jobs(keys: List[_InputKey], coalesce: bool) -> List[List[_InputKey]]:
+    """Groups the distinct inputs into generation jobs, in first-seen order."""
+    if not coalesce:
+        return [[key] for key in keys]
+
+    jobs: List[List[_InputKey]] = []
+    open_groups: Dict[str, List[_InputKey]] = {}
+    for key in keys:
+        text, style = key
+        if len(text) > COALESCE_MAX_CHARS:
+            jobs.append([key])
+            continue
+        group = open_groups.get(style)
+        if group is None or len(group) >= COALESCE_MAX_ITEMS:
+            group = open_groups[style] = []
+            jobs.append(group)
+        group.append(key)
+    return jobs
+
+
+async def _run_job(job: List[_InputKey], settings: Settings) -> List[Tuple[_InputKey, str]]:
+    style_settings = settings.model_copy(update={"humor_style": job[0][1]})
+    texts = [text for text, _ in job]
+    if len(job) == 1:
+        outputs = [await comedicize_text_async(texts[0], style_settings)]
+    else:
+        outputs = await comedicize_texts_coalesced_async(texts, style_settings)
+    return list(zip(job, outputs))
+
+
+async def comedicize_batch_async(
+    items: List[Dict[str, Any]],
+    settings: Settings,
+    on_result: Optional[OnResult] = None,
+    coalesce: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Comedicizes a batch of {"id", "summarized_text", "style"} items concurrently.
+
+    Items with the same text and style are generated once. With coalesce, short
+    texts of the same style are merged into multi-part completions. on_result
+    is awaited with each item's result as soon as it is ready. Returns the
+    results in input order: {"id", "comedic_text"}, or {"id", "error"} for an
+    item with an unknown style.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    waiting: Dict[_InputKey, List[int]] = {}
+    errors: List[int] = []
+    for index, item in enumerate(items):
+        key = _item_key(item, settings)
+        if key[1] not in STYLES:
+            results[index] = {"id": item.get("id"), "error": f"Unknown style: {key[1]}"}
+            errors.append(index)
+            continue
+        waiting.setdefault(key, []).append(index)
+
+    for index in errors:
+        if on_result is not None:
+            await on_result(results[index])
+
+    tasks = [asyncio.ensure_future(_run_job(job, settings)) for job in _jobs(list(waiting), coalesce)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for key, comedic_text in await finished:
+                for index in waiting[key]:
+                    results[index] = {"id": items[index].get("id"), "comedic_text": comedic_text}
+                    if on_result is not None:
+                        await on_result(results[index])
+    finally:
+        # A cancelled batch (client gone) cancels the generations still running
+        for task in tasks:
+            task.cancel()
+
+    duplicates = len(items) - len(errors) - len(waiting)
+    if duplicates:
+        logger.info("Batch of %d items: %d duplicate inputs generated once", len(items), duplicates)
+    return results  # type: ignore[return-value]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPENAI_URL = "https://api.openai.com/v1"
+
+# Keep-alive pool per provider client; completions are long requests, so a
+# handful of warm connections covers steady traffic.
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+
+class ClientError(Exception):
+    pass
+
+
+def _client_key(settings: Settings) -> Tuple[Any, ...]:
+    """Settings fields a provider client depends on; a change rebuilds the client."""
+    return (settings.model_provider, settings.api_key, settings.api_url, settings.timeout)
+
+
+def _http_client(settings: Settings, asynchronous: bool = False):
+    """
+    Shared httpx client with a keep-alive pool. HTTP/2 is used when the optional
+    'h2' package is installed, HTTP/1.1 keep-alive otherwise.
+    """
+    import httpx  # type: ignore
+
+    try:
+        import h2  # type: ignore  # noqa: F401
+        http2 = True
+    except Exception:
+        http2 = False
+
+    client_class = httpx.AsyncClient if asynchronous else httpx.Client
+    return client_class(
+        http2=http2,
+        timeout=settings.timeout,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+def _build_openai(settings: Settings, asynchronous: bool):
+    try:
+        from openai import AsyncOpenAI, OpenAI  # type: ignore
+    except Exception as e:  # pragma: no cover
+        raise ClientError(f"OpenAI SDK import failed: {e}")
+
+    client_class = AsyncOpenAI if asynchronous else OpenAI
+    return client_class(
+        api_key=settings.api_key,
+        base_url=settings.api_url or DEFAULT_OPENAI_URL,
+        timeout=settings.timeout,
+        http_client=_http_client(settings, asynchronous),
+    )
+
+
+def _build_anthropic(settings: Settings, asynchronous: bool):
+    try:
+        import anthropic  # type: ignore
+    except Exception as e:  # pragma: no cover
+        raise ClientError(f"Anthropic SDK import failed: {e}")
+
+    client_class = anthropic.AsyncAnthropic if asynchronous else anthropic.Anthropic
+    return client_class(
+        api_key=settings.api_key,
+        timeout=settings.timeout,
+        http_client=_http_client(settings, asynchronous),
+    )
+
+
+_BUILDERS = {
+    "openai": _build_openai,
+    "anthropic": _build_anthropic,
+}
+
+
+class ClientRegistry:
+    """
+    Process-wide provider clients.
+
+    A client (and its connection pool) is created on first use and reused by
+    every later request, so requests skip client construction and TLS
+    handshakes. It is rebuilt only when the settings it was built from change.
+    Sync and async clients of a provider are kept separately.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, Tuple[Tuple[Any, ...], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, settings: Settings, asynchronous: bool = False):
+        provider = settings.model_provider
+        builder = _BUILDERS.get(provider)
+        if builder is None:
+            raise ClientError(f"No client for provider: {provider}")
+
+        slot = f"{provider}:async" if asynchronous else provider
+        key = _client_key(settings)
+        with self._lock:
+            entry = self._clients.get(slot)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+            client = builder(settings, asynchronous)
+            self._clients[slot] = (key, client)
+        if entry is not None:
+            # The old client is not closed here: requests still running on it
+            # finish, and it is released once they drop their reference.
+            logger.info("Settings changed; rebuilt %s client", provider)
+        return client
+
+    def close(self) -> None:
+        with self._lock:
+            clients = [client for _, client in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            _close(client)
+
+
+def _close(client) -> None:
+    # Async clients can only be closed from their event loop; dropping them
+    # releases the pooled sockets
+    if inspect.iscoroutinefunction(getattr(client, "close", None)):
+        return
+    try:
+        client.close()
+    except Exception as e:  # pragma: no cover
+        logger.debug("Closing provider client failed: %s", e)
+
+
+registry = ClientRegistry()
+
+
+def get_client(settings: Settings):
+    """Returns the shared client of settings.model_provider."""
+    return registry.get(settings)
+
+
+def get_async_client(settings: Settings):
+    """Returns the shared async client of settings.model_provider."""
+    return registry.get(settings, asynchronous=True)
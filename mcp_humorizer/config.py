@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import os
 import random
-from typing import Literal, Optional
+import threading
+from functools import lru_cache
+from typing import Literal, Optional, Tuple
 
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field
+from dotenv import dotenv_values, find_dotenv
+from pydantic import BaseModel, ConfigDict, Field
 
 
 Provider = Literal["openai", "anthropic", "none"]
@@ -35,8 +37,17 @@ class Settings(BaseModel):
       - MAX_OUTPUT_TOKENS: upper bound on output length (default: 400)
       - TEMPERATURE: sampling temperature (default: 0.7)
       - SEED: optional deterministic seed if supported by provider (optional)
+      - MAX_CONCURRENCY: concurrent generations per provider in the server (default: 8)
+      - RESPONSE_CACHE_SIZE: cached rewrite keys in memory, 0 disables the cache (default: 256)
+      - RESPONSE_CACHE_TTL: seconds a cached rewrite is served (default: 86400)
+      - RESPONSE_CACHE_DIR: optional directory for the on-disk cache tier
+      - RESPONSE_VARIANTS: rewrites pooled per key and served at random (default: 0, off)
+
+    Settings are immutable; use ``model_copy(update=...)`` for per-run overrides.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     model_provider: Provider = Field(default="none")
     api_key: Optional[str] = Field(default=None)
     api_url: Optional[str] = Field(default=None)
@@ -47,26 +58,33 @@ class Settings(BaseModel):
     max_output_tokens: int = Field(default=400)
     temperature: float = Field(default=0.7)
     seed: Optional[int] = Field(default=None)
+    max_concurrency: int = Field(default=8)
+
+    response_cache_size: int = Field(default=256)
+    response_cache_ttl: float = Field(default=86400.0)
+    response_cache_dir: Optional[str] = Field(default=None)
+    response_variants: int = Field(default=0)
 
     @classmethod
     def from_env(cls) -> "Settings":
-        # Load .env if present (non-destructive by default)
-        load_dotenv(override=False)
+        # .env is read afresh on every call and fills in what the process
+        # environment does not set; os.environ itself is left untouched
+        env = {**_dotenv_values(), **os.environ}
 
-        provider = os.getenv("MODEL_PROVIDER", "none").strip().lower()
+        provider = env.get("MODEL_PROVIDER", "none").strip().lower()
         if provider not in ("openai", "anthropic", "none"):
             provider = "none"
 
         # Prefer generic API_KEY, then provider-specific variables
         api_key = (
-            os.getenv("API_KEY")
-            or os.getenv("OPENAI_API_KEY")
-            or os.getenv("ANTHROPIC_API_KEY")
+            env.get("API_KEY")
+            or env.get("OPENAI_API_KEY")
+            or env.get("ANTHROPIC_API_KEY")
         )
 
-        api_url = os.getenv("API_URL")
+        api_url = env.get("API_URL")
 
-        humor_style = os.getenv("HUMOR_STYLE", "light").strip().lower()
+        humor_style = env.get("HUMOR_STYLE", "light").strip().lower()
         allowed_styles = {
             "sarcastic",
             "light",
@@ -80,25 +98,30 @@ class Settings(BaseModel):
         if humor_style not in allowed_styles:
             humor_style = "light"
 
-        model_name = os.getenv("MODEL_NAME", None)
+        model_name = env.get("MODEL_NAME", None)
 
-        def _float(env: str, default: float) -> float:
+        def _float(name: str, default: float) -> float:
             try:
-                return float(os.getenv(env, str(default)))
+                return float(env.get(name, str(default)))
             except ValueError:
                 return default
 
-        def _int(env: str, default: int) -> int:
+        def _int(name: str, default: int) -> int:
             try:
-                return int(os.getenv(env, str(default)))
+                return int(env.get(name, str(default)))
             except ValueError:
                 return default
 
         timeout = _float("HTTP_TIMEOUT", 30.0)
         max_output_tokens = _int("MAX_OUTPUT_TOKENS", 400)
         temperature = _float("TEMPERATURE", 0.7)
-        seed_env = os.getenv("SEED")
+        seed_env = env.get("SEED")
         seed = int(seed_env) if seed_env and seed_env.isdigit() else None
+        max_concurrency = _int("MAX_CONCURRENCY", 8)
+        response_cache_size = _int("RESPONSE_CACHE_SIZE", 256)
+        response_cache_ttl = _float("RESPONSE_CACHE_TTL", 86400.0)
+        response_cache_dir = env.get("RESPONSE_CACHE_DIR") or None
+        response_variants = _int("RESPONSE_VARIANTS", 0)
 
         return cls(
             model_provider=provider,  # type: ignore[arg-type]
@@ -110,76 +133,80 @@ class Settings(BaseModel):
             max_output_tokens=max_output_tokens,
             temperature=temperature,
             seed=seed,
+            max_concurrency=max_concurrency,
+            response_cache_size=response_cache_size,
+            response_cache_ttl=response_cache_ttl,
+            response_cache_dir=response_cache_dir,
+            response_variants=response_variants,
         )
 
 
-def _build_comedy_card_prompt(style: HumorStyle = None) -> str:
-    """Generate an accessible, high-impact comedic card prompt.
-    Randomly selects both a humor style and one comedian tone.
-    Ensures output is plain, loud, and emotionally easy to follow.
-    """
-    
-    edgy_styles = ["sarcastic", "absurd", "deadpan", "roast", "random", "nihilistic_fury", "disappointed_humanity"]
-    if not style or style not in edgy_styles:
-        style = random.choice(edgy_styles)
-
-    all_comics = [
-        "George Carlin", "Bill Hicks", "Doug Stanhope", "Anthony Jeselnik", "Frankie Boyle",
-        "Jimmy Carr", "Ricky Gervais", "Louis C.K.", "Jim Jefferies", "Sam Kinison",
-        "Norm Macdonald", "Chris Morris", "Eric André", "Bo Burnham", "Maria Bamford",
-        "Andy Kaufman", "Eddie Pepitone", "Stewart Lee", "Dave Attell", "Chris Farley",
-        "Mitch Hedberg", "Rick Mayall", "Eddie Izzard", "Tim Dillon",
-        "Donald Trump (as absurd performer)"
-    ]
-
-    chosen_tone = random.choice(all_comics)
-
-    style_desc = {
-        "sarcastic": (
-            f"as 'Precision Sarcasm' — channel {chosen_tone}. "
-            "Use confident mockery and simple language. "
-            "Pretend to understand everything while clearly losing control. "
-            "Be direct, mean, and funny in a way anyone can follow. 4-5 sentences."
-        ),
-        "absurd": (
-            f"as 'Controlled Absurdism' — channel {chosen_tone}. "
-            "Start normal, then drift into cartoon logic. "
-            "Use clear, dumb images — things melting, screaming, breaking. "
-            "No poetic fluff. 4-5 sentences of nonsense that still feels real."
-        ),
-        "deadpan": (
-            f"as 'Deadpan Nihilism' — channel {chosen_tone}. "
-            "Sound calm while describing disasters. "
-            "Simple, short sentences. Let horror sit in silence. 4-5 sentences."
-        ),
-        "roast": (
-            f"as 'Surgical Roast' — channel {chosen_tone}. "
-            "Target situations, not people. "
-            "Start polite, then tear everything apart with plain insults. "
-            "Keep it mean but obvious. 4-5 sentences total."
-        ),
-        "random": (
-            f"as 'Chaotic Spontaneity' — channel {chosen_tone}. "
-            "Bounce between topics like your brain is buffering. "
-            "Make it loud, weird, and readable. 4-5 sentences of organized stupidity."
-        ),
-        "nihilistic_fury": (
-            f"as 'Apex of Nihilistic Fury' — channel {chosen_tone}. "
-            "Start with impossible violence or pain, then say the real news clearly. "
-            "Swear if it feels real. Act like the story is personally ruining your life. "
-            "End in total nonsense, but use simple, dumb words so anyone gets it. "
-            "4-5 sentences of meltdown energy."
-        ),
-        "disappointed_humanity": (
-            f"as 'Perpetual Disappointment' — channel {chosen_tone}. "
-            "Sound like a tired teacher for the entire species. "
-            "State the real news plainly, then sigh through how predictable humans are. "
-            "Use simple, everyday words; be weary, unimpressed, a bit sad, not cruel. "
-            "End on a resigned punch, 4-5 sentences."
-        )
-    }[style]
-
-    return f"""
+EDGY_STYLES = (
+    "sarcastic",
+    "absurd",
+    "deadpan",
+    "roast",
+    "random",
+    "nihilistic_fury",
+    "disappointed_humanity",
+)
+
+ALL_COMICS = (
+    "George Carlin", "Bill Hicks", "Doug Stanhope", "Anthony Jeselnik", "Frankie Boyle",
+    "Jimmy Carr", "Ricky Gervais", "Louis C.K.", "Jim Jefferies", "Sam Kinison",
+    "Norm Macdonald", "Chris Morris", "Eric André", "Bo Burnham", "Maria Bamford",
+    "Andy Kaufman", "Eddie Pepitone", "Stewart Lee", "Dave Attell", "Chris Farley",
+    "Mitch Hedberg", "Rick Mayall", "Eddie Izzard", "Tim Dillon",
+    "Donald Trump (as absurd performer)",
+)
+
+# Style descriptions; {tone} is the comedian seed
+STYLE_DESC = {
+    "sarcastic": (
+        "as 'Precision Sarcasm' — channel {tone}. "
+        "Use confident mockery and simple language. "
+        "Pretend to understand everything while clearly losing control. "
+        "Be direct, mean, and funny in a way anyone can follow. 4-5 sentences."
+    ),
+    "absurd": (
+        "as 'Controlled Absurdism' — channel {tone}. "
+        "Start normal, then drift into cartoon logic. "
+        "Use clear, dumb images — things melting, screaming, breaking. "
+        "No poetic fluff. 4-5 sentences of nonsense that still feels real."
+    ),
+    "deadpan": (
+        "as 'Deadpan Nihilism' — channel {tone}. "
+        "Sound calm while describing disasters. "
+        "Simple, short sentences. Let horror sit in silence. 4-5 sentences."
+    ),
+    "roast": (
+        "as 'Surgical Roast' — channel {tone}. "
+        "Target situations, not people. "
+        "Start polite, then tear everything apart with plain insults. "
+        "Keep it mean but obvious. 4-5 sentences total."
+    ),
+    "random": (
+        "as 'Chaotic Spontaneity' — channel {tone}. "
+        "Bounce between topics like your brain is buffering. "
+        "Make it loud, weird, and readable. 4-5 sentences of organized stupidity."
+    ),
+    "nihilistic_fury": (
+        "as 'Apex of Nihilistic Fury' — channel {tone}. "
+        "Start with impossible violence or pain, then say the real news clearly. "
+        "Swear if it feels real. Act like the story is personally ruining your life. "
+        "End in total nonsense, but use simple, dumb words so anyone gets it. "
+        "4-5 sentences of meltdown energy."
+    ),
+    "disappointed_humanity": (
+        "as 'Perpetual Disappointment' — channel {tone}. "
+        "Sound like a tired teacher for the entire species. "
+        "State the real news plainly, then sigh through how predictable humans are. "
+        "Use simple, everyday words; be weary, unimpressed, a bit sad, not cruel. "
+        "End on a resigned punch, 4-5 sentences."
+    ),
+}
+
+_CARD_TEMPLATE = """
         You are a Comedy Card Planner.
         You don’t write the jokes; you design the structure another agent will use,
         based on this style: {style_desc}
@@ -199,7 +226,7 @@ def _build_comedy_card_prompt(style: HumorStyle = None) -> str:
         INTERNAL PLAN (do not print this; use it only to plan):
         [Title]: <short hook 3–7 words>
         Style: {style}
-        ComedianSeed: {chosen_tone}
+        ComedianSeed: {tone}
         ToneNotes: <how it should sound>
         Structure: Setup → Turn → Tag → optional Collapse
         Devices: <Overreaction, Irony, Contrast, Confident Wrongness, Smash-Cut>
@@ -214,17 +241,9 @@ def _build_comedy_card_prompt(style: HumorStyle = None) -> str:
         CATALOGS:
         Angles: Overreaction, Everyday Meltdown, Process Farce, Dumb Analogy
         Devices: Irony, Frame Shift, Exaggeration, Paraprosdokian, Smash-Cut
-    """
-
-
-def build_system_prompt(style: HumorStyle) -> str:
-    """Compose the Humor Engine system prompt for Skibidi News.
-    Produces 4-5 sentence accessible rants that are chaotic but understandable.
-    """
-    
-    card = _build_comedy_card_prompt(style)
+"""
 
-    return f"""You are the Humor Engine for Skibidi News.
+_SYSTEM_TEMPLATE = """You are the Humor Engine for Skibidi News.
 
         Use the following as an INTERNAL PLAN ONLY. Never reveal or copy any part of it:
         <PLAN>
@@ -246,3 +265,113 @@ def build_system_prompt(style: HumorStyle) -> str:
         - Swearing allowed when natural; exaggeration mandatory.
         - End on a strong, ridiculous visual or one-liner.
         Return only the rewritten comedic text."""
+
+
+# Environment variables read by Settings.from_env; a change to any of them
+# (or to the .env file) invalidates the cached snapshot
+SETTINGS_ENV_VARS = (
+    "MODEL_PROVIDER",
+    "API_KEY",
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "API_URL",
+    "HUMOR_STYLE",
+    "MODEL_NAME",
+    "HTTP_TIMEOUT",
+    "MAX_OUTPUT_TOKENS",
+    "TEMPERATURE",
+    "SEED",
+    "MAX_CONCURRENCY",
+    "RESPONSE_CACHE_SIZE",
+    "RESPONSE_CACHE_TTL",
+    "RESPONSE_CACHE_DIR",
+    "RESPONSE_VARIANTS",
+)
+
+_settings_lock = threading.Lock()
+_settings_snapshot: Optional[Tuple[tuple, Settings]] = None
+_dotenv_path: Optional[str] = None
+
+
+def _dotenv_file() -> str:
+    global _dotenv_path
+    if _dotenv_path is None:
+        _dotenv_path = find_dotenv() or ""
+    return _dotenv_path
+
+
+def _dotenv_values() -> dict:
+    path = _dotenv_file()
+    if not path:
+        return {}
+    # Keys without a value ("FOO" alone on a line) come back as None
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+def _dotenv_mtime() -> Optional[float]:
+    path = _dotenv_file()
+    if not path:
+        return None
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def get_settings() -> Settings:
+    """
+    Snapshot of Settings.from_env(), rebuilt only when one of SETTINGS_ENV_VARS
+    or the .env file changed since the last call.
+    """
+    global _settings_snapshot
+    mtime = _dotenv_mtime()
+    snapshot = _settings_snapshot
+    if snapshot is not None and snapshot[0] == _settings_key(mtime):
+        return snapshot[1]
+
+    with _settings_lock:
+        settings = Settings.from_env()
+        _settings_snapshot = (_settings_key(mtime), settings)
+    return settings
+
+
+def _settings_key(dotenv_mtime: Optional[float]) -> tuple:
+    return (dotenv_mtime,) + tuple(os.environ.get(name) for name in SETTINGS_ENV_VARS)
+
+
+def _pick_style_index(style: Optional[str]) -> int:
+    """Index of style in EDGY_STYLES; other styles get a random one."""
+    if style in EDGY_STYLES:
+        return EDGY_STYLES.index(style)
+    return random.randrange(len(EDGY_STYLES))
+
+
+@lru_cache(maxsize=len(EDGY_STYLES) * len(ALL_COMICS))
+def _card_prompt(style_index: int, comic_index: int) -> str:
+    style = EDGY_STYLES[style_index]
+    tone = ALL_COMICS[comic_index]
+    style_desc = STYLE_DESC[style].format(tone=tone)
+    return _CARD_TEMPLATE.format(style_desc=style_desc, style=style, tone=tone)
+
+
+@lru_cache(maxsize=len(EDGY_STYLES) * len(ALL_COMICS))
+def _system_prompt(style_index: int, comic_index: int) -> str:
+    return _SYSTEM_TEMPLATE.format(card=_card_prompt(style_index, comic_index))
+
+
+def _build_comedy_card_prompt(style: HumorStyle = None) -> str:
+    """Generate an accessible, high-impact comedic card prompt.
+    Randomly selects both a humor style and one comedian tone.
+    Ensures output is plain, loud, and emotionally easy to follow.
+    """
+    return _card_prompt(_pick_style_index(style), random.randrange(len(ALL_COMICS)))
+
+
+def build_system_prompt(style: HumorStyle) -> str:
+    """Compose the Humor Engine system prompt for Skibidi News.
+    Produces 4-5 sentence accessible rants that are chaotic but understandable.
+
+    Every (style, comedian seed) prompt is built once and cached; each call
+    only draws the random indices.
+    """
+    return _system_prompt(_pick_style_index(style), random.randrange(len(ALL_COMICS)))
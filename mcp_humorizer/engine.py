@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Optional
+import re
+from typing import Dict, List, Optional, Tuple
 
+from . import response_cache
+from .clients import ClientError, get_async_client, get_client
 from .config import Settings, build_system_prompt
 
-# Providers are optional; imports are inside functions to avoid import errors
-# if users don't install all SDKs.
+# Providers are optional; SDK imports happen when a client is first built
+# (see clients.py) to avoid import errors if users don't install all SDKs.
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
@@ -15,38 +19,77 @@ class GenerationError(Exception):
     pass
 
 
-def _generate_with_openai(
-    summarized_text: str, settings: Settings, system_prompt: str
-) -> str:
-    try:
-        from openai import OpenAI  # type: ignore
-    except Exception as e:  # pragma: no cover
-        raise GenerationError(f"OpenAI SDK import failed: {e}")
+def _user_message(summarized_text: str) -> dict:
+    return {
+        "role": "user",
+        "content": f"Summarized news text:\n\n{summarized_text}\n\nRewrite as comedic text.",
+    }
+
 
+def _openai_request(summarized_text: str, settings: Settings, system_prompt: str) -> dict:
     if not settings.api_key:
         raise GenerationError("OpenAI requires an API key (API_KEY or OPENAI_API_KEY).")
+    return dict(
+        model=settings.model_name or "gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            _user_message(summarized_text),
+        ],
+        temperature=settings.temperature,
+        max_tokens=settings.max_output_tokens,
+    )
+
+
+def _openai_text(completion) -> str:
+    text = completion.choices[0].message.content or ""
+    if not text.strip():
+        raise GenerationError("OpenAI returned empty content.")
+    return text.strip()
+
+
+def _anthropic_request(summarized_text: str, settings: Settings, system_prompt: str) -> dict:
+    if not settings.api_key:
+        raise GenerationError("Anthropic requires an API key (API_KEY or ANTHROPIC_API_KEY).")
+    return dict(
+        model=settings.model_name or "claude-3-5-sonnet-latest",
+        max_tokens=settings.max_output_tokens,
+        temperature=settings.temperature,
+        system=system_prompt,
+        messages=[_user_message(summarized_text)],
+    )
+
 
-    client = OpenAI(api_key=settings.api_key,
-                    base_url=settings.api_url or "https://api.openai.com/v1")
+def _anthropic_text(msg) -> str:
+    # msg.content is a list of blocks; join text parts
+    parts = []
+    for block in getattr(msg, "content", []) or []:
+        text = getattr(block, "text", None)
+        if text:
+            parts.append(text)
+    text = "\n".join(parts).strip()
+    if not text:
+        raise GenerationError("Anthropic returned empty content.")
+    return text
 
-    model = settings.model_name or "gpt-4o-mini"
+
+def _provider_client(settings: Settings, asynchronous: bool = False):
     try:
-        completion = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user",
-                    "content": f"Summarized news text:\n\n{summarized_text}\n\nRewrite as comedic text.",
-                },
-            ],
-            temperature=settings.temperature,
-            max_tokens=settings.max_output_tokens,
-        )
-        text = completion.choices[0].message.content or ""
-        if not text.strip():
-            raise GenerationError("OpenAI returned empty content.")
-        return text.strip()
+        if asynchronous:
+            return get_async_client(settings)
+        return get_client(settings)
+    except ClientError as e:
+        raise GenerationError(str(e))
+
+
+def _generate_with_openai(
+    summarized_text: str, settings: Settings, system_prompt: str
+) -> str:
+    request = _openai_request(summarized_text, settings, system_prompt)
+    client = _provider_client(settings)
+    try:
+        return _openai_text(client.chat.completions.create(**request))
+    except GenerationError:
+        raise
     except Exception as e:
         raise GenerationError(f"OpenAI generation failed: {e}")
 
@@ -54,44 +97,69 @@ def _generate_with_openai(
 def _generate_with_anthropic(
     summarized_text: str, settings: Settings, system_prompt: str
 ) -> str:
+    request = _anthropic_request(summarized_text, settings, system_prompt)
+    client = _provider_client(settings)
     try:
-        import anthropic  # type: ignore
-    except Exception as e:  # pragma: no cover
-        raise GenerationError(f"Anthropic SDK import failed: {e}")
+        return _anthropic_text(client.messages.create(**request))
+    except GenerationError:
+        raise
+    except Exception as e:
+        raise GenerationError(f"Anthropic generation failed: {e}")
 
-    if not settings.api_key:
-        raise GenerationError("Anthropic requires an API key (API_KEY or ANTHROPIC_API_KEY).")
 
-    client = anthropic.Anthropic(api_key=settings.api_key)
-    model = settings.model_name or "claude-3-5-sonnet-latest"
+async def _agenerate_with_openai(
+    summarized_text: str, settings: Settings, system_prompt: str
+) -> str:
+    request = _openai_request(summarized_text, settings, system_prompt)
+    client = _provider_client(settings, asynchronous=True)
+    try:
+        return _openai_text(await client.chat.completions.create(**request))
+    except GenerationError:
+        raise
+    except Exception as e:
+        raise GenerationError(f"OpenAI generation failed: {e}")
+
 
+async def _agenerate_with_anthropic(
+    summarized_text: str, settings: Settings, system_prompt: str
+) -> str:
+    request = _anthropic_request(summarized_text, settings, system_prompt)
+    client = _provider_client(settings, asynchronous=True)
     try:
-        msg = client.messages.create(
-            model=model,
-            max_output_tokens=settings.max_output_tokens,
-            temperature=settings.temperature,
-            system=system_prompt,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Summarized news text:\n\n{summarized_text}\n\nRewrite as comedic text.",
-                }
-            ],
-        )
-        # msg.content is a list of blocks; join text parts
-        parts = []
-        for block in getattr(msg, "content", []) or []:
-            text = getattr(block, "text", None)
-            if text:
-                parts.append(text)
-        text = "\n".join(parts).strip()
-        if not text:
-            raise GenerationError("Anthropic returned empty content.")
-        return text
+        return _anthropic_text(await client.messages.create(**request))
+    except GenerationError:
+        raise
     except Exception as e:
         raise GenerationError(f"Anthropic generation failed: {e}")
 
 
+_GENERATORS = {
+    "openai": _generate_with_openai,
+    "anthropic": _generate_with_anthropic,
+}
+
+_ASYNC_GENERATORS = {
+    "openai": _agenerate_with_openai,
+    "anthropic": _agenerate_with_anthropic,
+}
+
+_PROVIDER_NAMES = {"openai": "OpenAI", "anthropic": "Anthropic"}
+
+# provider -> (limit, event loop, semaphore); rebuilt when Settings.max_concurrency
+# changes or on another event loop (semaphores are bound to the loop they run on)
+_semaphores: Dict[str, Tuple[int, asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def _provider_semaphore(settings: Settings) -> asyncio.Semaphore:
+    provider = settings.model_provider
+    limit = max(1, settings.max_concurrency)
+    loop = asyncio.get_running_loop()
+    entry = _semaphores.get(provider)
+    if entry is None or entry[0] != limit or entry[1] is not loop:
+        entry = _semaphores[provider] = (limit, loop, asyncio.Semaphore(limit))
+    return entry[2]
+
+
 def _humor_fallback(summarized_text: str, style: str) -> str:
     """
     Lightweight, deterministic humorizer to ensure offline functionality.
@@ -134,19 +202,134 @@ def comedicize_text(summarized_text: str, settings: Settings) -> str:
         return "No input provided. Punchline withheld until further notice."
 
     provider = settings.model_provider
-    system_prompt = build_system_prompt(settings.humor_style)
-    if provider == "openai":
-        try:
-            return _generate_with_openai(summarized_text, settings, system_prompt)
-        except GenerationError as e:
-            logger.warning("OpenAI failed, using humor fallback: %s", e)
-            return _humor_fallback(summarized_text, settings.humor_style)
-    elif provider == "anthropic":
-        try:
-            return _generate_with_anthropic(summarized_text, settings, system_prompt)
-        except GenerationError as e:
-            logger.warning("Anthropic failed, using humor fallback: %s", e)
-            return _humor_fallback(summarized_text, settings.humor_style)
-    else:
+    generate = _GENERATORS.get(provider)
+    if generate is None:
         # No provider configured; use local humorous rewrite
         return _humor_fallback(summarized_text, settings.humor_style)
+
+    cached = response_cache.lookup(summarized_text, settings)
+    if cached is not None:
+        return cached
+
+    system_prompt = build_system_prompt(settings.humor_style)
+    try:
+        text = generate(summarized_text, settings, system_prompt)
+        response_cache.store(summarized_text, settings, text)
+        return text
+    except GenerationError as e:
+        logger.warning("%s failed, using humor fallback: %s", _PROVIDER_NAMES[provider], e)
+        return _humor_fallback(summarized_text, settings.humor_style)
+
+
+async def _generate_limited(
+    summarized_text: str, settings: Settings, system_prompt: str
+) -> str:
+    """
+    Runs the provider's async generation within its concurrency limit and the
+    Settings.timeout deadline. Raises GenerationError on failure or timeout.
+    """
+    generate = _ASYNC_GENERATORS[settings.model_provider]
+
+    async def _limited() -> str:
+        async with _provider_semaphore(settings):
+            return await generate(summarized_text, settings, system_prompt)
+
+    try:
+        return await asyncio.wait_for(_limited(), timeout=settings.timeout)
+    except asyncio.TimeoutError:
+        raise GenerationError(f"timed out after {settings.timeout}s")
+
+
+async def comedicize_text_async(summarized_text: str, settings: Settings) -> str:
+    """
+    Async comedicize_text for the MCP server.
+
+    At most Settings.max_concurrency generations run per provider; the wait for
+    a slot and the provider call together must finish within Settings.timeout
+    seconds, or the deterministic fallback is returned. Cancelling the caller
+    (e.g. the MCP client disconnecting) cancels the provider request.
+    """
+    summarized_text = (summarized_text or "").strip()
+    if not summarized_text:
+        return "No input provided. Punchline withheld until further notice."
+
+    provider = settings.model_provider
+    if provider not in _ASYNC_GENERATORS:
+        return _humor_fallback(summarized_text, settings.humor_style)
+
+    cached = response_cache.lookup(summarized_text, settings)
+    if cached is not None:
+        return cached
+
+    system_prompt = build_system_prompt(settings.humor_style)
+    try:
+        text = await _generate_limited(summarized_text, settings, system_prompt)
+        response_cache.store(summarized_text, settings, text)
+        return text
+    except GenerationError as e:
+        logger.warning("%s failed, using humor fallback: %s", _PROVIDER_NAMES[provider], e)
+        return _humor_fallback(summarized_text, settings.humor_style)
+
+
+_PART_MARKER_RE = re.compile(r"^\s*\[\[(\d+)\]\]\s*", re.MULTILINE)
+
+
+def _coalesced_input(texts: List[str]) -> str:
+    return "\n\n".join(f"[[{i}]]\n{text}" for i, text in enumerate(texts, 1))
+
+
+def _coalesced_instructions(count: int) -> str:
+    return (
+        f"\n\nThe input holds {count} separate news texts, marked [[1]] to [[{count}]]. "
+        "Rewrite each one on its own, following the rules above, and start each "
+        "rewrite with its marker on a line of its own. Output nothing else."
+    )
+
+
+def _split_parts(output: str, count: int) -> Optional[List[str]]:
+    """The rewrites of a multi-part completion in marker order, or None if any is missing."""
+    matches = list(_PART_MARKER_RE.finditer(output))
+    parts: Dict[int, str] = {}
+    for match, following in zip(matches, matches[1:] + [None]):
+        end = following.start() if following is not None else len(output)
+        parts[int(match.group(1))] = output[match.end():end].strip()
+    texts = [parts.get(i, "") for i in range(1, count + 1)]
+    return texts if all(texts) else None
+
+
+async def comedicize_texts_coalesced_async(texts: List[str], settings: Settings) -> List[str]:
+    """
+    Rewrites several short texts with one multi-part completion, saving the
+    per-request overhead and the repeated system prompt. If the answer cannot
+    be split back into one rewrite per text, each text is generated on its own.
+    """
+    texts = [(text or "").strip() for text in texts]
+    provider = settings.model_provider
+    if provider not in _ASYNC_GENERATORS or len(texts) < 2 or not all(texts):
+        return list(await asyncio.gather(*(comedicize_text_async(t, settings) for t in texts)))
+
+    outputs: List[Optional[str]] = [response_cache.lookup(text, settings) for text in texts]
+    missing = [i for i, output in enumerate(outputs) if output is None]
+    if len(missing) < len(texts):
+        generated = await comedicize_texts_coalesced_async([texts[i] for i in missing], settings)
+        for i, text in zip(missing, generated):
+            outputs[i] = text
+        return outputs  # type: ignore[return-value]
+
+    system_prompt = build_system_prompt(settings.humor_style) + _coalesced_instructions(len(texts))
+    group_settings = settings.model_copy(
+        update={"max_output_tokens": settings.max_output_tokens * len(texts)}
+    )
+    try:
+        output = await _generate_limited(_coalesced_input(texts), group_settings, system_prompt)
+    except GenerationError as e:
+        logger.warning("%s failed, using humor fallback: %s", _PROVIDER_NAMES[provider], e)
+        return [_humor_fallback(text, settings.humor_style) for text in texts]
+
+    parts = _split_parts(output, len(texts))
+    if parts is not None:
+        for text, part in zip(texts, parts):
+            response_cache.store(text, settings, part)
+        return parts
+    logger.warning("Multi-part completion could not be split; generating texts one by one")
+    return list(await asyncio.gather(*(comedicize_text_async(t, settings) for t in texts)))
@@ -1,20 +1,20 @@
-from __future__ import annotations
-
+import json
 import os
 import sys
 import logging
 
 try:
     # FastMCP is the ergonomic Python helper for building MCP servers
-    from mcp.server.fastmcp import FastMCP  # type: ignore
+    from mcp.server.fastmcp import Context, FastMCP  # type: ignore
 except Exception as e:  # pragma: no cover
     print("ERROR: Missing or incompatible 'mcp' Python package. Please install with:")
     print("  pip install -r mcp_humorizer/requirements.txt")
     print(f"Details: {e}")
     sys.exit(1)
 
-from .config import Settings
-from .engine import comedicize_text
+from .batch import comedicize_batch_async
+from .config import get_settings
+from .engine import comedicize_text_async
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -23,7 +23,7 @@ app = FastMCP("mcp-humorizer")
 
 
 @app.tool()
-def comedicize(id: str, summarized_text: str) -> dict:
+async def comedicize(id: str, summarized_text: str) -> dict:
     """
     Transform summarized news text into comedic text.
 
@@ -40,17 +40,50 @@ def comedicize(id: str, summarized_text: str) -> dict:
       "comedic_text": "The economy shrank by 2%. Don’t worry, my diet is shrinking faster!"
     }
     """
-    settings = Settings.from_env()
-    result = comedicize_text(summarized_text, settings)
+    settings = get_settings()
+    result = await comedicize_text_async(summarized_text, settings)
     return {"id": id, "comedic_text": result}
 
 
+@app.tool()
+async def comedicize_batch(ctx: Context, items: list[dict], coalesce: bool = False) -> dict:
+    """
+    Transform several summarized texts into comedic text in one call.
+
+    Input:
+    {
+      "items": [{"id": "uuid", "summarized_text": "...", "style": "deadpan"}],
+      "coalesce": false
+    }
+
+    Items run concurrently; identical (text, style) inputs are generated once,
+    and with coalesce short texts of one style share a single completion.
+    Each item's result is sent as a progress notification (message is the
+    result JSON) as soon as it is ready. "style" is optional.
+
+    Output:
+    {
+      "results": [{"id": "uuid", "comedic_text": "..."}]
+    }
+    """
+    settings = get_settings()
+    done = 0
+
+    async def report(result: dict) -> None:
+        nonlocal done
+        done += 1
+        await ctx.report_progress(progress=done, total=len(items), message=json.dumps(result))
+
+    results = await comedicize_batch_async(items, settings, on_result=report, coalesce=coalesce)
+    return {"results": results}
+
+
 @app.tool()
 def health() -> dict:
     """
     Simple health check tool to verify server connectivity.
     """
-    settings = Settings.from_env()
+    settings = get_settings()
     return {
         "name": "mcp-humorizer",
         "provider": settings.model_provider,
@@ -10,8 +10,8 @@ from starlette.routing import Mount
 
 from mcp.server.fastmcp import FastMCP
 
-from .engine import comedicize_text
-from .config import Settings
+from .engine import comedicize_text_async
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +25,7 @@ api_mcp.settings.streamable_http_path = "/"
 chat_mcp.settings.streamable_http_path = "/"
 
 @chat_mcp.tool()
-def comedicize(id: str, summarized_text: str) -> dict:
+async def comedicize(id: str, summarized_text: str) -> dict:
     """
     Transform summarized news text into comedic text.
 
@@ -42,8 +42,8 @@ def comedicize(id: str, summarized_text: str) -> dict:
       "comedic_text": "The economy shrank by 2%. Don’t worry, my diet is shrinking faster!"
     }
     """
-    settings = Settings.from_env()
-    result = comedicize_text(summarized_text, settings)
+    settings = get_settings()
+    result = await comedicize_text_async(summarized_text, settings)
     return {"id": id, "comedic_text": result}
 
 
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Temperatures within one bucket share cached responses (0.6 and 0.7 do, 0.2 doesn't)
+TEMPERATURE_BUCKET = 0.25
+
+_PUNCT_RE = re.compile(r"[^\w\s%$€£.,]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normal form of a summarized text for cache keys: case, whitespace, quotes
+    and decorative punctuation don't matter; words, numbers and units do.
+    """
+    text = _PUNCT_RE.sub(" ", (text or "").lower())
+    return _SPACE_RE.sub(" ", text).strip(" .,")
+
+
+def cache_key(summarized_text: str, settings: Settings) -> str:
+    """Hash of (normalized text, style, provider, model, temperature bucket)."""
+    bucket = round(settings.temperature / TEMPERATURE_BUCKET)
+    parts = (
+        normalize_text(summarized_text),
+        settings.humor_style,
+        settings.model_provider,
+        settings.model_name or "",
+        str(bucket),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of comedic rewrites with an optional on-disk tier.
+
+    Each key holds a pool of up to ``variants`` rewrites. With variants <= 1 a
+    hit returns the cached rewrite. With a larger pool, the first ``variants``
+    requests of a key still generate (each filling a slot, repeats included)
+    and later ones get a random pooled variant, so repeated inputs stay varied
+    without new generations.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 86400.0,
+        directory: Optional[str] = None,
+        variants: int = 0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory or None
+        self.variants = max(1, variants)
+        self._entries: OrderedDict[str, Tuple[float, List[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")  # type: ignore[arg-type]
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, List[str]]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return float(data["ts"]), list(data["variants"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key: str, ts: float, pool: List[str]) -> None:
+        os.makedirs(self.directory, exist_ok=True)  # type: ignore[arg-type]
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ts": ts, "variants": pool}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+    def _prune_disk(self) -> None:
+        """Deletes on-disk entries older than the TTL."""
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.directory)  # type: ignore[arg-type]
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)  # type: ignore[arg-type]
+            try:
+                if name.endswith(".json") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def _remember(self, key: str, ts: float, pool: List[str]) -> None:
+        self._entries[key] = (ts, pool)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _pool(self, key: str) -> Optional[List[str]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        if self.directory is None:
+            return None
+        entry = self._read_disk(key)
+        if entry is None or now - entry[0] >= self.ttl:
+            return None
+        with self._lock:
+            self._remember(key, *entry)
+        return entry[1]
+
+    def get(self, key: str) -> Optional[str]:
+        """A cached rewrite for key, or None if a new one should be generated."""
+        pool = self._pool(key)
+        if not pool or len(pool) < self.variants:
+            return None
+        return random.choice(pool)
+
+    def put(self, key: str, text: str) -> None:
+        ts = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            pool = list(entry[1]) if entry is not None else []
+            # A repeated text still fills a slot, so a deterministic provider
+            # fills the pool instead of being asked forever
+            pool.append(text)
+            # Keep the newest variants
+            pool = pool[-self.variants:]
+            self._remember(key, ts, pool)
+            self._puts += 1
+            prune = self._puts % 50 == 0
+        if self.directory is not None:
+            try:
+                self._write_disk(key, ts, pool)
+            except OSError as e:
+                logger.warning("Could not persist response cache entry: %s", e)
+            if prune:
+                self._prune_disk()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache_config(settings: Settings) -> Tuple[int, float, Optional[str], int]:
+    return (
+        settings.response_cache_size,
+        settings.response_cache_ttl,
+        settings.response_cache_dir,
+        settings.response_variants,
+    )
+
+
+_cache: Optional[Tuple[tuple, ResponseCache]] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache(settings: Settings) -> Optional[ResponseCache]:
+    """The process-wide response cache, rebuilt when its settings change; None if disabled."""
+    global _cache
+    config = _cache_config(settings)
+    if config[0] <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache[0] != config:
+            _cache = (config, ResponseCache(*config))
+        return _cache[1]
+
+
+def lookup(summarized_text: str, settings: Settings) -> Optional[str]:
+    cache = get_response_cache(settings)
+    if cache is None:
+        return None
+    return cache.get(cache_key(summarized_text, settings))
+
+
+def store(summarized_text: str, settings: Settings, text: str) -> None:
+    cache = get_response_cache(settings)
+    if cache is not None:
+        cache.put(cache_key(summarized_text, settings), text)
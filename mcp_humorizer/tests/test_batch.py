@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+
+from mcp_humorizer import Settings, engine
+from mcp_humorizer.batch import comedicize_batch_async
+
+
+def test_batch_generates_identical_inputs_once(monkeypatch):
+    calls = []
+
+    async def generation(summarized_text, settings, system_prompt):
+        calls.append(summarized_text)
+        return f"joke about {summarized_text}"
+
+    monkeypatch.setitem(engine._ASYNC_GENERATORS, "openai", generation)
+    settings = Settings(model_provider="openai", api_key="sk-test", response_cache_size=0)
+    items = [
+        {"id": "a", "summarized_text": "Rates rose"},
+        {"id": "b", "summarized_text": "Rates  rose "},
+        {"id": "c", "summarized_text": "Rates rose", "style": "deadpan"},
+    ]
+    streamed = []
+
+    async def on_result(result):
+        streamed.append(result["id"])
+
+    results = asyncio.run(comedicize_batch_async(items, settings, on_result=on_result))
+
+    assert [r["id"] for r in results] == ["a", "b", "c"]
+    assert results[0]["comedic_text"] == results[1]["comedic_text"] == "joke about Rates rose"
+    # a and b share one generation; c has another style
+    assert len(calls) == 2
+    assert sorted(streamed) == ["a", "b", "c"]
+
+
+def test_batch_rejects_unknown_style_per_item():
+    settings = Settings(model_provider="none")
+    items = [
+        {"id": "ok", "summarized_text": "The economy shrank by 2% last quarter"},
+        {"id": "bad", "summarized_text": "Anything", "style": "mime"},
+    ]
+
+    results = asyncio.run(comedicize_batch_async(items, settings))
+
+    assert "shrinking faster" in results[0]["comedic_text"].lower()
+    assert results[1] == {"id": "bad", "error": "Unknown style: mime"}
+
+
+def test_batch_coalesces_short_items_of_one_style(monkeypatch):
+    prompts = []
+
+    async def multi_part(summarized_text, settings, system_prompt):
+        prompts.append(summarized_text)
+        return "\n".join(f"[[{i}]] rewrite {i}" for i in range(1, summarized_text.count("[[") + 1))
+
+    monkeypatch.setitem(engine._ASYNC_GENERATORS, "openai", multi_part)
+    settings = Settings(
+        model_provider="openai", api_key="sk-test", humor_style="roast", response_cache_size=0
+    )
+    items = [{"id": str(i), "summarized_text": f"Story {i}"} for i in range(3)]
+
+    results = asyncio.run(comedicize_batch_async(items, settings, coalesce=True))
+
+    assert len(prompts) == 1
+    assert [r["comedic_text"] for r in results] == ["rewrite 1", "rewrite 2", "rewrite 3"]
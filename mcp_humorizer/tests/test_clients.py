@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from mcp_humorizer.clients import ClientRegistry
+from mcp_humorizer.config import Settings
+
+
+def test_registry_reuses_client_for_same_settings():
+    registry = ClientRegistry()
+    settings = Settings(model_provider="openai", api_key="sk-test")
+
+    first = registry.get(settings)
+    second = registry.get(Settings(model_provider="openai", api_key="sk-test"))
+
+    assert first is second
+    registry.close()
+
+
+def test_registry_rebuilds_client_when_settings_change():
+    registry = ClientRegistry()
+    first = registry.get(Settings(model_provider="openai", api_key="sk-test"))
+    # Output-only settings (style, temperature) don't affect the client
+    same = registry.get(Settings(model_provider="openai", api_key="sk-test", temperature=0.1))
+    changed = registry.get(Settings(model_provider="openai", api_key="sk-test", timeout=5.0))
+
+    assert same is first
+    assert changed is not first
+    registry.close()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+
+from mcp_humorizer import config
+from mcp_humorizer.config import ALL_COMICS, build_system_prompt, get_settings
+
+
+def test_get_settings_reuses_snapshot_until_env_changes(monkeypatch):
+    monkeypatch.setenv("HUMOR_STYLE", "deadpan")
+    first = get_settings()
+    assert get_settings() is first
+    assert first.humor_style == "deadpan"
+
+    monkeypatch.setenv("HUMOR_STYLE", "roast")
+    changed = get_settings()
+    assert changed is not first
+    assert changed.humor_style == "roast"
+
+
+def test_system_prompt_is_cached_per_style_and_comedian():
+    prompt = build_system_prompt("deadpan")
+    assert "Deadpan Nihilism" in prompt
+    assert any(f"ComedianSeed: {comic}" in prompt for comic in ALL_COMICS)
+
+    # Same (style, comedian) pair returns the very same string object
+    assert config._system_prompt(2, 0) is config._system_prompt(2, 0)
+    assert "{" not in config._system_prompt(2, 0)
+
+
+def test_get_settings_picks_up_dotenv_edits(tmp_path, monkeypatch):
+    dotenv = tmp_path / ".env"
+    dotenv.write_text("HUMOR_STYLE=deadpan\nTEMPERATURE=0.2\n")
+    monkeypatch.setattr(config, "_dotenv_path", str(dotenv))
+    monkeypatch.setattr(config, "_settings_snapshot", None)
+    monkeypatch.delenv("HUMOR_STYLE", raising=False)
+    monkeypatch.delenv("TEMPERATURE", raising=False)
+
+    first = get_settings()
+    assert (first.humor_style, first.temperature) == ("deadpan", 0.2)
+    assert get_settings() is first
+    # Reading .env must not pin its values in the process environment
+    assert "HUMOR_STYLE" not in os.environ
+
+    dotenv.write_text("HUMOR_STYLE=roast\nTEMPERATURE=0.9\n")
+    mtime = dotenv.stat().st_mtime
+    os.utime(dotenv, (mtime + 1, mtime + 1))
+    edited = get_settings()
+    assert (edited.humor_style, edited.temperature) == ("roast", 0.9)
+
+    # The process environment still wins over .env
+    monkeypatch.setenv("HUMOR_STYLE", "wholesome")
+    assert get_settings().humor_style == "wholesome"
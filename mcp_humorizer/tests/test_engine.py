@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from mcp_humorizer import Settings, comedicize_text
+import asyncio
+import time
+
+from mcp_humorizer import Settings, comedicize_text, comedicize_text_async, engine
 
 
 def test_engine_fallback_when_provider_none_numeric_light():
@@ -36,3 +39,64 @@ def test_engine_fallback_respects_style_deadpan():
     assert summary in out
     # Deadpan specific phrasing appears in fallback variants
     assert ("we remain cautiously unimpressed" in out.lower()) or ("in other news, water is still wet" in out.lower())
+
+
+def test_async_engine_fallback_when_provider_none():
+    settings = Settings(model_provider="none", humor_style="light")
+    summary = "The economy shrank by 2% last quarter"
+    out = asyncio.run(comedicize_text_async(summary, settings))
+
+    assert summary in out
+    assert "shrinking faster" in out.lower()
+
+
+def test_async_engine_falls_back_when_provider_exceeds_timeout(monkeypatch):
+    async def slow_generation(summarized_text, settings, system_prompt):
+        await asyncio.sleep(5)
+        return "too late"
+
+    monkeypatch.setitem(engine._ASYNC_GENERATORS, "openai", slow_generation)
+    settings = Settings(model_provider="openai", api_key="sk-test", humor_style="light", timeout=0.05)
+    summary = "The economy shrank by 2% last quarter"
+
+    started = time.monotonic()
+    out = asyncio.run(comedicize_text_async(summary, settings))
+
+    assert time.monotonic() - started < 1
+    assert summary in out
+
+
+def test_async_engine_limits_concurrency_per_provider(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def generation(summarized_text, settings, system_prompt):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    monkeypatch.setitem(engine._ASYNC_GENERATORS, "openai", generation)
+    settings = Settings(
+        model_provider="openai", api_key="sk-test", max_concurrency=2, response_cache_size=0
+    )
+
+    async def run_all():
+        return await asyncio.gather(*(comedicize_text_async(f"Story {i}", settings) for i in range(6)))
+
+    assert asyncio.run(run_all()) == ["ok"] * 6
+    assert peak == 2
+
+
+def test_coalesced_completion_is_split_per_text(monkeypatch):
+    async def multi_part(summarized_text, settings, system_prompt):
+        assert "[[1]]" in summarized_text and "[[2]]" in summarized_text
+        return "[[1]]\nFirst rewrite.\n\n[[2]]\nSecond rewrite."
+
+    monkeypatch.setitem(engine._ASYNC_GENERATORS, "openai", multi_part)
+    settings = Settings(model_provider="openai", api_key="sk-test", response_cache_size=0)
+    out = asyncio.run(engine.comedicize_texts_coalesced_async(["Story one", "Story two"], settings))
+
+    assert out == ["First rewrite.", "Second rewrite."]
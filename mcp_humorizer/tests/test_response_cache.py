@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+from mcp_humorizer import Settings, engine
+from mcp_humorizer.response_cache import ResponseCache, cache_key
+
+
+def test_cache_key_ignores_formatting_but_not_settings():
+    settings = Settings(model_provider="openai", humor_style="deadpan", temperature=0.7)
+    key = cache_key("The economy shrank by 2% last quarter.", settings)
+
+    assert cache_key("  the economy shrank by 2% last quarter ", settings) == key
+    assert cache_key("“The economy” shrank by 2% last quarter!", settings) == key
+    assert cache_key("The economy shrank by 3% last quarter.", settings) != key
+    assert cache_key("The economy shrank by 2% last quarter.", settings.model_copy(update={"temperature": 0.65})) == key
+    assert cache_key("The economy shrank by 2% last quarter.", settings.model_copy(update={"temperature": 0.2})) != key
+    assert cache_key("The economy shrank by 2% last quarter.", settings.model_copy(update={"humor_style": "roast"})) != key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_variant_pool_serves_cached_variants_once_full():
+    cache = ResponseCache(variants=2)
+    cache.put("k", "first")
+    # Pool not full yet: caller should generate another variant
+    assert cache.get("k") is None
+    cache.put("k", "second")
+
+    assert {cache.get("k") for _ in range(50)} == {"first", "second"}
+
+
+def test_variant_pool_fills_with_repeated_text():
+    cache = ResponseCache(variants=3)
+    for _ in range(3):
+        assert cache.get("k") is None
+        cache.put("k", "always the same")
+
+    assert cache.get("k") == "always the same"
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    ResponseCache(directory=str(tmp_path)).put("k", "persisted")
+
+    assert ResponseCache(directory=str(tmp_path)).get("k") == "persisted"
+
+
+def test_engine_reuses_cached_rewrite_for_near_identical_text(monkeypatch, tmp_path):
+    calls = []
+
+    async def generation(summarized_text, settings, system_prompt):
+        calls.append(summarized_text)
+        return f"rewrite {len(calls)}"
+
+    monkeypatch.setitem(engine._ASYNC_GENERATORS, "openai", generation)
+    settings = Settings(
+        model_provider="openai", api_key="sk-test", humor_style="roast", response_cache_dir=str(tmp_path)
+    )
+
+    first = asyncio.run(engine.comedicize_text_async("Markets fell sharply today.", settings))
+    again = asyncio.run(engine.comedicize_text_async("markets fell sharply today", settings))
+
+    assert first == again == "rewrite 1"
+    assert len(calls) == 1
@@ -0,0 +1,129 @@
+"""
+Offline benchmark of the news pipeline (fetch + summarize) on the replay fixtures
+(synthetic unless re-recorded, see replay.py).
+
+Scenarios:
+  cold     every call starts from empty caches, as after a restart
+  warm     category pool is cached and history is kept, so every call picks new
+           articles from the cached pool and writes a new digest (the digest
+           cache misses, as it does in production)
+  failing  every provider is down
+
+Reports p50/p99 latency, articles per second and the peak memory allocated by
+one call. Runs without network access:
+    python -m mcp_news_aggr.benchmark --iterations 20 --json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+from mcp_news_aggr.fetch_news.fetch_all_news import fetch_all_news_async
+from mcp_news_aggr.replay import replay, reset_state, settle
+from mcp_news_aggr.summarize_news import summarize_articles
+
+SCENARIOS = ("cold", "warm", "failing")
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    iterations: int
+    p50_ms: float
+    p99_ms: float
+    articles_per_sec: float
+    peak_alloc_kib: float
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def aggregate(category):
+    """The aggregate_news pipeline without writing the summary file."""
+    articles = await fetch_all_news_async(category)
+    if articles:
+        await summarize_articles(articles)
+    return articles
+
+
+def _prepare(scenario):
+    if scenario == "cold":
+        reset_state()
+
+
+async def run_scenario(scenario, iterations=10, category="world", delay=0.02, summary_delay=0.0):
+    with replay(delay=delay, failing=scenario == "failing", summary_delay=summary_delay):
+        if scenario == "warm":
+            await aggregate(category)
+            await settle()
+
+        timings = []
+        articles = 0
+        for _ in range(iterations):
+            _prepare(scenario)
+            start = time.perf_counter()
+            articles += len(await aggregate(category))
+            timings.append(time.perf_counter() - start)
+            # Background collectors are not part of the call, but must not overlap the next one
+            await settle()
+
+        _prepare(scenario)
+        tracemalloc.start()
+        try:
+            await aggregate(category)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        await settle()
+
+    total = sum(timings)
+    return BenchmarkResult(
+        scenario=scenario,
+        iterations=iterations,
+        p50_ms=round(percentile(timings, 50) * 1000, 2),
+        p99_ms=round(percentile(timings, 99) * 1000, 2),
+        articles_per_sec=round(articles / total, 1) if total else 0.0,
+        peak_alloc_kib=round(peak / 1024, 1),
+    )
+
+
+async def run(scenarios, iterations, category, delay, summary_delay):
+    return [
+        await run_scenario(s, iterations, category, delay, summary_delay) for s in scenarios
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--category", default="world")
+    parser.add_argument("--delay", type=float, default=0.02, help="seconds per replayed provider request")
+    parser.add_argument("--summary-delay", type=float, default=0.0, help="seconds per stub digest")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = asyncio.run(
+        run(args.scenarios or SCENARIOS, args.iterations, args.category, args.delay, args.summary_delay)
+    )
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+        return
+    print(f"{'scenario':<10}{'p50 ms':>10}{'p99 ms':>10}{'articles/s':>12}{'peak KiB':>10}")
+    for r in results:
+        print(f"{r.scenario:<10}{r.p50_ms:>10}{r.p99_ms:>10}{r.articles_per_sec:>12}{r.peak_alloc_kib:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,44 @@ load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Background cache pre-warming for the MCP server (seconds; interval 0 disables it)
+NEWS_PREWARM_INTERVAL = float(os.getenv("NEWS_PREWARM_INTERVAL", 300))
+NEWS_PREWARM_JITTER = float(os.getenv("NEWS_PREWARM_JITTER", 30))
+# How long an expired category pool may still be served while it is refreshed
+NEWS_CACHE_STALE_TTL = float(os.getenv("NEWS_CACHE_STALE_TTL", 900))
+# Category pool cache: articles kept per category and total byte budget across categories
+NEWS_POOL_LIMIT = int(os.getenv("NEWS_POOL_LIMIT", 100))
+NEWS_CACHE_MAX_BYTES = int(os.getenv("NEWS_CACHE_MAX_BYTES", 8 * 1024 * 1024))
 
+# Digest cache: entries in memory, seconds before expiry, optional directory for the disk tier
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", 128))
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", 3600))
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR")
+
+# Directory of the per-category digest archive
+DIGEST_DIR = os.getenv("DIGEST_DIR", os.path.join(os.path.dirname(__file__), "digests"))
+
+# Maximum number of summarizer completions running at once in this process
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 4))
+
+# Token budgets of the summarizer input: per article text, and all article texts together
+SUMMARY_ARTICLE_TOKENS = int(os.getenv("SUMMARY_ARTICLE_TOKENS", 160))
+SUMMARY_INPUT_TOKENS = int(os.getenv("SUMMARY_INPUT_TOKENS", 1200))
+
+# Full-text extraction of article pages: on/off, seconds a digest waits for it,
+# extraction worker processes, cached texts and maximum bytes downloaded per page
+NEWS_FULLTEXT = os.getenv("NEWS_FULLTEXT", "0").lower() in ("1", "true", "yes")
+NEWS_FULLTEXT_BUDGET = float(os.getenv("NEWS_FULLTEXT_BUDGET", 1.5))
+NEWS_FULLTEXT_WORKERS = int(os.getenv("NEWS_FULLTEXT_WORKERS", 2))
+NEWS_FULLTEXT_CACHE_SIZE = int(os.getenv("NEWS_FULLTEXT_CACHE_SIZE", 512))
+NEWS_FULLTEXT_MAX_BYTES = int(os.getenv("NEWS_FULLTEXT_MAX_BYTES", 1024 * 1024))
+
+# Per-host provider limits: requests per second, burst size, base and maximum backoff (seconds)
+NEWS_HOST_RATE = float(os.getenv("NEWS_HOST_RATE", 2))
+NEWS_HOST_BURST = float(os.getenv("NEWS_HOST_BURST", 5))
+NEWS_HOST_BACKOFF = float(os.getenv("NEWS_HOST_BACKOFF", 5))
+NEWS_HOST_BACKOFF_MAX = float(os.getenv("NEWS_HOST_BACKOFF_MAX", 300))
+
+# Backend shared by aggregator replicas (claimed articles, category pools), e.g.
+# sqlite:////data/news_state.db; unset keeps all state in this process
+NEWS_SHARED_STATE = os.getenv("NEWS_SHARED_STATE")
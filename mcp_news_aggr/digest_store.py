@@ -0,0 +1,109 @@
+"""
+Archive of generated digests, queryable by category and time range.
+
+Every digest is appended as one JSON line to a per-category log under
+DIGEST_DIR. In memory each category only keeps the sorted timestamps of its
+digests and their byte offsets, so a range query is two binary searches plus
+one seek per returned digest. Like the history log, only bytes appended since
+the last read are indexed, so digests written by other processes show up too.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+
+from mcp_news_aggr.config import DIGEST_DIR
+
+
+class DigestStore:
+    """Append-only per-category digest log with a (timestamp, offset) index."""
+
+    def __init__(self, directory=DIGEST_DIR):
+        self.directory = directory
+        # category -> sorted timestamps and the byte offset of each record
+        self._timestamps: dict[str, list[float]] = {}
+        self._offsets: dict[str, list[int]] = {}
+        # category -> bytes of its log already indexed
+        self._indexed: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, category):
+        return os.path.join(self.directory, f"{category.lower()}.jsonl")
+
+    def _refresh(self, category):
+        """Indexes records appended to a category's log since the last call."""
+        path = self._path(category)
+        timestamps = self._timestamps.setdefault(category, [])
+        offsets = self._offsets.setdefault(category, [])
+        start = self._indexed.get(category, 0)
+        try:
+            if os.path.getsize(path) <= start:
+                return
+            with open(path, "rb") as f:
+                f.seek(start)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+
+        # Leave a partially written trailing line for the next read
+        end = chunk.rfind(b"\n") + 1
+        position = start
+        for line in chunk[:end].splitlines(keepends=True):
+            try:
+                ts = float(json.loads(line)["ts"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                position += len(line)
+                continue
+            # Writers append in time order, but keep the index sorted regardless
+            i = bisect.bisect_right(timestamps, ts)
+            timestamps.insert(i, ts)
+            offsets.insert(i, position)
+            position += len(line)
+        self._indexed[category] = start + end
+
+    def append(self, category, summary, article_count=None, ts=None) -> dict:
+        """Archives a digest and returns its record."""
+        record = {"category": category, "ts": time.time() if ts is None else ts, "summary": summary}
+        if article_count is not None:
+            record["articles"] = article_count
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            with open(self._path(category), "ab") as f:
+                f.write(line)
+            self._refresh(category)
+        return record
+
+    def _read(self, category, offsets):
+        records = []
+        with open(self._path(category), "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+
+    def range(self, category, since=None, until=None, limit=None) -> list[dict]:
+        """
+        Digests of a category with since <= ts <= until (epoch seconds), newest first.
+        """
+        with self._lock:
+            self._refresh(category)
+            timestamps = self._timestamps[category]
+            lo = 0 if since is None else bisect.bisect_left(timestamps, since)
+            hi = len(timestamps) if until is None else bisect.bisect_right(timestamps, until)
+            selected = self._offsets[category][lo:hi][::-1]
+        if limit is not None:
+            selected = selected[:limit]
+        if not selected:
+            return []
+        return self._read(category, selected)
+
+    def latest(self, category, since=None) -> dict | None:
+        """The newest digest of a category, if there is one at or after since."""
+        records = self.range(category, since=since, limit=1)
+        return records[0] if records else None
+
+
+digest_store = DigestStore()
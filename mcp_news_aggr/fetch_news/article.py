@@ -0,0 +1,62 @@
+"""
+Compact record for a fetched news article.
+
+Articles are created by the providers, kept in the category cache and the RSS
+feed states, and passed through dedup, history and the summarizer. A slotted
+class avoids a per-article dict, and source names and dates, which repeat
+across a pool, are interned so every article shares one copy of them.
+"""
+
+import sys
+
+
+class Article:
+    """
+    A single news article. ``date`` is the day it was published ('YYYY-MM-DD'),
+    ``timestamp`` the UTC publication time if it could be read, and
+    ``dedup_keys`` caches its fingerprint keys.
+    """
+
+    __slots__ = ("title", "summary", "date", "url", "source", "timestamp", "dedup_keys")
+
+    def __init__(self, title="", summary="", date="", url="", source="", timestamp=None):
+        self.title = title or ""
+        self.summary = summary or ""
+        self.date = sys.intern(date or "")
+        self.url = url or ""
+        self.source = sys.intern(source or "")
+        self.timestamp: float | None = timestamp
+        self.dedup_keys: tuple[str, int] | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        return cls(
+            data.get("title", ""),
+            data.get("summary", ""),
+            data.get("date", ""),
+            data.get("url", ""),
+            data.get("source", ""),
+            data.get("timestamp"),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "title": self.title,
+            "summary": self.summary,
+            "date": self.date,
+            "url": self.url,
+            "source": self.source,
+            "timestamp": self.timestamp,
+        }
+
+    def size(self) -> int:
+        """Approximate bytes held by this article, not counting interned strings."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.title)
+            + sys.getsizeof(self.summary)
+            + sys.getsizeof(self.url)
+        )
+
+    def __repr__(self):
+        return f"Article(title={self.title!r}, source={self.source!r}, date={self.date!r})"
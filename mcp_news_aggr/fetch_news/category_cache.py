@@ -0,0 +1,86 @@
+"""
+Memory-bounded cache of the article pool fetched for each category.
+
+Pools are trimmed to ``NEWS_POOL_LIMIT`` articles (the pool is already ordered
+by source priority and collapsed to one copy per story, so the tail is what the
+selection would reach last). The cache tracks the approximate bytes of every
+pool and evicts the least recently used categories once ``NEWS_CACHE_MAX_BYTES``
+is exceeded, so a long-running server stays at a flat memory footprint.
+
+With shared state (NEWS_SHARED_STATE) every stored pool is also written to the
+shared backend, and a lookup takes a newer pool stored by another replica.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from mcp_news_aggr.config import NEWS_CACHE_MAX_BYTES, NEWS_POOL_LIMIT
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.shared_state import shared_state
+
+
+class CategoryCache:
+    """LRU of (timestamp, pool) per category with a byte budget."""
+
+    def __init__(self, max_bytes=NEWS_CACHE_MAX_BYTES, pool_limit=NEWS_POOL_LIMIT, shared=shared_state):
+        self.max_bytes = max_bytes
+        self.pool_limit = pool_limit
+        self.shared = shared
+        self._entries: OrderedDict[str, tuple[float, list[Article], int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, category):
+        return category in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, category):
+        """Returns (timestamp, pool) for a category, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry is not None:
+                self._entries.move_to_end(category)
+
+        shared_ts = self.shared.pool_timestamp(category)
+        if shared_ts is not None and (entry is None or shared_ts > entry[0]):
+            loaded = self.shared.load_pool(category)
+            if loaded is not None:
+                ts, articles = loaded
+                pool = [Article.from_dict(a) for a in articles]
+                self._remember(category, ts, pool)
+                return ts, pool
+
+        if entry is None:
+            return None
+        return entry[0], entry[1]
+
+    def put(self, category, pool: list[Article]):
+        pool = pool[: self.pool_limit]
+        ts = time.time()
+        self._remember(category, ts, pool)
+        self.shared.store_pool(category, ts, [article.to_dict() for article in pool])
+
+    def _remember(self, category, ts, pool):
+        size = sum(article.size() for article in pool)
+        with self._lock:
+            old = self._entries.pop(category, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[category] = (ts, pool, size)
+            self._bytes += size
+            # Keep the newest entry even if it alone is over budget
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -1,5 +1,17 @@
+import calendar
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
 from GoogleNews import GoogleNews
-from mcp_news_aggr.fetch_news.fetch_utilities import parse_date
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.date_normalizer import day_string, normalize_dates
+from mcp_news_aggr.fetch_news.rate_limiter import (
+    ProviderUnavailable,
+    is_throttling_status,
+    limiter_for,
+)
 import feedparser
 
 
@@ -38,16 +50,21 @@ RSS_MAP = {
     ],
 }
 
+# GoogleNews result pages fetched per category and how many run at once.
+GOOGLE_PAGES = 9
+GOOGLE_PAGE_WORKERS = 4
+# Host the GoogleNews scraper talks to, for rate limiting
+GOOGLE_HOST = "www.google.com"
+# Google's bucket holds a whole category fetch (the search plus every page)...
+GOOGLE_BURST = 1 + GOOGLE_PAGES
+# ...and pages beyond it (batches, the pre-warmer) queue this long for a token
+# instead of being dropped, still inside the fetch engine's source timeout
+GOOGLE_PAGE_MAX_WAIT = 5.0
 
 
-def google_fetch_category_news(category, lang="en"):
+def _configured_googlenews(category, lang="en"):
     """
-    Fetches news from Google News based on a topic or a search query.
-    
-    :param search_params: A dict, e.g., {"topic": "WORLD"} or {"query": "US news"}
-    :param page_size: How many results to fetch from Google (we fetch more to filter)
-    :param lang: Language
-    :return: A list of article dictionaries
+    Returns a GoogleNews client with the topic and search set up for a category.
     """
     googlenews = GoogleNews(lang=lang, period='1d') # Look at news from the last day
 
@@ -96,57 +113,201 @@ def google_fetch_category_news(category, lang="en"):
     googlenews.search("world news")
     """
 
-    # Fetch a few pages to get a good pool of articles for filtering
-    for i in range(1, 10):
-        googlenews.get_page(i)
-    
-    results = googlenews.results()
-    
+    return googlenews
+
+
+def _google_items_to_articles(results):
+    # Basic filter to avoid articles without a proper link
+    items = [item for item in results if item.get("link", "")]
+    timestamps = normalize_dates(item.get("date", "") for item in items)
+
     articles = []
-    # We don't slice by page_size here; we return all results
-    # so fetch_all_news can filter from a larger pool.
-    for item in results:
-        title = item.get("title", "No title")
-        summary = item.get("desc", "No summary")
-        date_raw = item.get("date", "")
-        date = parse_date(date_raw)
-        url_link = item.get("link", "")
-        source = item.get("media", "Google News")
-
-        # Basic filter to avoid articles without a proper link
-        if url_link:
-            articles.append({
-                "title": title,
-                "summary": summary,
-                "date": date,
-                "url": url_link,
-                "source": source
-            })
+    for item, timestamp in zip(items, timestamps):
+        articles.append(Article(
+            item.get("title", "No title"),
+            item.get("desc", "No summary"),
+            day_string(timestamp),
+            item["link"],
+            item.get("media", "Google News"),
+            timestamp,
+        ))
 
     return articles
 
 
-def feedparser_fetch_category_news(category: str, lang="en"):
-    category = category.lower()
+def _google_limiter():
+    return limiter_for(GOOGLE_HOST, burst=GOOGLE_BURST)
 
-    feeds = RSS_MAP.get(category, RSS_MAP["world"])
 
-    articles = []
+def _fetch_google_page(googlenews, page):
+    limiter = _google_limiter()
+    limiter.acquire(max_wait=GOOGLE_PAGE_MAX_WAIT)
+    # GoogleNews keeps results on the instance, so each page gets its own copy.
+    worker = copy.copy(googlenews)
+    worker.clear()
+    try:
+        worker.get_page(page)
+    except Exception:
+        limiter.record_failure()
+        raise
+    return worker.results()
 
-    for url in feeds:
-        try:
-            feed = feedparser.parse(url)
 
-            for entry in feed.entries:
-                articles.append({
-                    "title": entry.get("title", ""),
-                    "summary": entry.get("summary", entry.get("description", "")),
-                    "date": entry.get("published", ""),
-                    "url": entry.get("link", ""),
-                    "source": entry.get("source", {}).get("title", "") if entry.get("source") else url
-                })
+def google_iter_category_news(category, lang="en", pages=GOOGLE_PAGES, max_workers=GOOGLE_PAGE_WORKERS):
+    """
+    Streams articles from Google News for a category as result pages arrive.
 
-        except Exception as e:
-            print(f"Failed to parse RSS feed {url}: {e}")
+    Pages are fetched concurrently by a bounded worker pool. Closing the generator
+    early (e.g. once the caller has enough fresh articles) cancels the pages that
+    have not started yet.
+
+    :param category: One of the AVAILABLE_CATEGORIES
+    :param lang: Language
+    :param pages: How many result pages to fetch (we fetch more to filter)
+    :param max_workers: How many pages are fetched at the same time
+    :return: A generator of Article records
+    """
+    limiter = _google_limiter()
+    limiter.acquire()
+    try:
+        googlenews = _configured_googlenews(category, lang)
+    except Exception:
+        limiter.record_failure()
+        raise
+
+    # search() already loaded the first batch of results. The scraper swallows
+    # HTTP errors, so an empty search can't be told apart from a quiet topic and
+    # isn't counted against the host.
+    first_results = googlenews.results()
+    if not first_results:
+        return
+    limiter.record_success()
+    yield from _google_items_to_articles(first_results)
+
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google-page")
+    futures = [pool.submit(_fetch_google_page, googlenews, i) for i in range(1, pages + 1)]
+    try:
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except ProviderUnavailable as e:
+                # A page refused by the limiter is skipped; the other pages still count
+                print(f"Skipped Google News page: {e}")
+                continue
+            yield from _google_items_to_articles(results)
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def feeds_for_category(category: str):
+    """Returns the RSS feed URLs configured for a category (world feeds as default)."""
+    return RSS_MAP.get(category.lower(), RSS_MAP["world"])
+
+
+@dataclass
+class _FeedState:
+    """Conditional-GET validators and parsed entries of one feed URL."""
+
+    etag: str | None = None
+    modified: str | None = None
+    # Entry id -> article, in feed order; the cursor of entries already processed
+    articles: dict[str, Article] = field(default_factory=dict)
+
+
+_feed_states: dict[str, _FeedState] = {}
+_feed_states_lock = threading.Lock()
+
+
+def _entry_id(entry):
+    return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+
+def _entry_to_article(entry, url, timestamp):
+    return Article(
+        entry.get("title", ""),
+        entry.get("summary", entry.get("description", "")),
+        day_string(timestamp) if timestamp is not None else entry.get("published", ""),
+        entry.get("link", ""),
+        entry.get("source", {}).get("title", "") if entry.get("source") else url,
+        timestamp,
+    )
+
+
+def _entry_timestamps(entries):
+    """UTC timestamps of feed entries; feedparser's own parse is used when it has one."""
+    timestamps = [
+        calendar.timegm(entry.published_parsed) if entry.get("published_parsed") else None
+        for entry in entries
+    ]
+    unparsed = [i for i, timestamp in enumerate(timestamps) if timestamp is None]
+    if unparsed:
+        fallback = normalize_dates(entries[i].get("published", "") for i in unparsed)
+        for i, timestamp in zip(unparsed, fallback):
+            timestamps[i] = timestamp
+    return timestamps
+
+
+def _retry_after(feed):
+    value = feed.get("headers", {}).get("retry-after")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def feedparser_fetch_feed(url: str):
+    """
+    Parses a single RSS feed into Article records.
+
+    Requests are conditional (ETag / Last-Modified), so an unchanged feed answers
+    304 and its previous articles are returned without parsing. Entries seen on an
+    earlier fetch reuse their Article; only new entries are converted.
+
+    The host's limiter is consulted first. A 429/5xx or failed request backs the
+    host off and returns the previous articles; with none, ProviderUnavailable
+    is raised so callers can decide how to report it.
+    """
+    with _feed_states_lock:
+        state = _feed_states.get(url) or _FeedState()
+        etag, modified = state.etag, state.modified
+
+    limiter = limiter_for(url)
+    limiter.acquire()
+    feed = feedparser.parse(url, etag=etag, modified=modified)
+
+    status = getattr(feed, "status", None)
+    # No status with a parse error means the request itself failed
+    if is_throttling_status(status) or (status is None and feed.get("bozo")):
+        limiter.record_failure(_retry_after(feed))
+        if state.articles:
+            return list(state.articles.values())
+        raise ProviderUnavailable(limiter.host, limiter.retry_after())
+    limiter.record_success()
+
+    if status == 304:
+        return list(state.articles.values())
+
+    entry_ids = [_entry_id(entry) for entry in feed.entries]
+    new_entries = [
+        entry for entry_id, entry in zip(entry_ids, feed.entries) if entry_id not in state.articles
+    ]
+    converted = {
+        _entry_id(entry): _entry_to_article(entry, url, timestamp)
+        for entry, timestamp in zip(new_entries, _entry_timestamps(new_entries))
+    }
+
+    articles = {}
+    for entry_id in entry_ids:
+        articles[entry_id] = state.articles.get(entry_id) or converted[entry_id]
+
+    with _feed_states_lock:
+        _feed_states[url] = _FeedState(
+            etag=feed.get("etag"),
+            modified=feed.get("modified"),
+            articles=articles,
+        )
+
+    return list(articles.values())
 
-    return articles
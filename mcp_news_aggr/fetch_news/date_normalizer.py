@@ -0,0 +1,129 @@
+"""
+Normalizes the publication dates providers hand us into UTC timestamps.
+
+GoogleNews reports relative phrases ("35 minutes ago", "2 days ago",
+"yesterday") or short absolute dates ("Nov 29, 2023"); RSS feeds use RFC 822
+("Sat, 17 Oct 2026 09:00:00 +0000") and sometimes ISO 8601. ``normalize_dates``
+resolves a whole batch against one reference time. Absolute strings repeat a
+lot within a pool, so their parses are memoized. Dates that cannot be read come
+back as None instead of being guessed as "now", so rankers can tell them apart.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Iterable
+
+_RELATIVE_RE = re.compile(
+    r"\b(?P<count>\d+|an?|one)\s*(?P<unit>sec|second|min|minute|hr|hour|day|week|month|year)s?\.?\s+ago"
+)
+_UNIT_SECONDS = {
+    "sec": 1,
+    "second": 1,
+    "min": 60,
+    "minute": 60,
+    "hr": 3600,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+_DAY_WORDS = {"just now": 0, "now": 0, "today": 0, "yesterday": 1}
+
+# Absolute formats tried after RFC 822 and ISO 8601, most common first
+_FORMATS = (
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%d.%m.%Y",
+)
+# Formats without a year; the reference year is assumed
+_YEARLESS_FORMATS = ("%b %d", "%B %d", "%d %b", "%d %B")
+
+
+def _relative_seconds(text: str) -> float | None:
+    if text in _DAY_WORDS:
+        return _DAY_WORDS[text] * 86400.0
+    match = _RELATIVE_RE.search(text)
+    if match is None:
+        return None
+    count = match["count"]
+    count = int(count) if count.isdigit() else 1
+    return float(count * _UNIT_SECONDS[match["unit"]])
+
+
+@lru_cache(maxsize=4096)
+def _absolute_timestamp(text: str) -> float | None:
+    """UTC timestamp of an absolute date string; naive dates are taken as UTC."""
+    parsed = None
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        pass
+    if parsed is None:
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            pass
+    if parsed is None:
+        for fmt in _FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _yearless_timestamp(text: str, now: datetime) -> float | None:
+    for fmt in _YEARLESS_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        parsed = parsed.replace(year=now.year, tzinfo=timezone.utc)
+        # "Dec 30" read on Jan 2 is last year's
+        if parsed > now + timedelta(days=1):
+            parsed = parsed.replace(year=now.year - 1)
+        return parsed.timestamp()
+    return None
+
+
+def parse_timestamp(raw: str, now: datetime) -> float | None:
+    """UTC timestamp of one date string relative to ``now`` (an aware datetime)."""
+    text = (raw or "").strip()
+    if not text:
+        return None
+    lowered = text.lower()
+    seconds = _relative_seconds(lowered)
+    if seconds is not None:
+        return now.timestamp() - seconds
+    timestamp = _absolute_timestamp(text)
+    if timestamp is None:
+        timestamp = _yearless_timestamp(text, now)
+    return timestamp
+
+
+def normalize_dates(raw_dates: Iterable[str], now: datetime | None = None) -> list[float | None]:
+    """
+    UTC timestamps for a batch of date strings, all resolved against one reference time.
+    """
+    now = now or datetime.now(timezone.utc)
+    return [parse_timestamp(raw, now) for raw in raw_dates]
+
+
+def day_string(timestamp: float | None, now: datetime | None = None) -> str:
+    """'YYYY-MM-DD' of a timestamp in local time, or of ``now`` if it is unknown."""
+    if timestamp is None:
+        return (now or datetime.now()).strftime("%Y-%m-%d")
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
@@ -1,9 +1,21 @@
-from mcp_news_aggr.fetch_news.category_fetcher import google_fetch_category_news, feedparser_fetch_category_news
+from mcp_news_aggr.config import NEWS_CACHE_STALE_TTL
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.category_cache import CategoryCache
+from mcp_news_aggr.fetch_news.fetch_engine import (
+    category_sources,
+    fetch_from_sources,
+    wait_for_background,
+)
+from mcp_news_aggr.fetch_news.fingerprint import DuplicateIndex, collapse_near_duplicates
 from mcp_news_aggr.fetch_news.history_manager import (
+    article_fingerprint,
+    get_duplicate_index_today,
     get_fetched_today,
     log_fetched_articles,
 )
-import urllib.error
+from mcp_news_aggr.fetch_news.ranker import rank_articles
+from collections import Counter
+import asyncio
 import time
 
 
@@ -18,95 +30,253 @@ AVAILABLE_CATEGORIES = (
     "asia",
 )
 
-_category_cache: dict[str, tuple[float, list[dict]]] = {}
+_category_cache = CategoryCache()
 CACHE_TTL = 120
-BACKOFF_ON_429 = 5
+STALE_TTL = max(NEWS_CACHE_STALE_TTL, CACHE_TTL)
+ARTICLES_PER_FETCH = 3
+# Distinct new stories a cold fetch waits for before returning early, so the
+# ranker has a real choice instead of the first three that arrived
+CANDIDATES_PER_FETCH = ARTICLES_PER_FETCH * 4
 CANONICAL_BY_KEY = {key.lower(): key for key in AVAILABLE_CATEGORIES}
+# Rounds of re-ranking when other replicas claim picked articles first
+CLAIM_ATTEMPTS = 3
 
 
-def fetch_all_news(category: str | None):
+# How often each category was requested; the pre-warmer refreshes hot ones first.
+_category_hits: Counter[str] = Counter()
+# Full-pool refreshes currently running, at most one per category.
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+def _store_in_cache(category):
+    def _store(outcome):
+        if outcome.articles:
+            pool = collapse_near_duplicates(outcome.articles)
+            _category_cache.put(category, pool)
+    return _store
+
+
+def hot_categories():
+    """Returns AVAILABLE_CATEGORIES ordered from most to least requested."""
+    return sorted(AVAILABLE_CATEGORIES, key=lambda c: -_category_hits[c])
+
+
+async def _refresh(category):
+    try:
+        outcome = await fetch_from_sources(
+            category_sources(category),
+            on_complete=_store_in_cache(category),
+        )
+        for source, error in outcome.errors.items():
+            print(f"Refresh of {category}: provider {source} failed: {error}")
+        return outcome.articles
+    finally:
+        _refreshing.pop(category, None)
+
+
+def pool_age(category: str) -> float | None:
+    """Seconds since the cached pool of a category (possibly another replica's) was fetched."""
+    entry = _category_cache.get(category)
+    return None if entry is None else time.time() - entry[0]
+
+
+def refresh_category(category: str) -> asyncio.Task:
     """
-    Fetches 3 new news articles from a single randomly chosen category.
-    
-    This function ensures that no article is fetched more than once per day.
+    Re-fetches the full article pool of a category into the cache.
+
+    Concurrent callers share a single in-flight refresh per category.
     """
-    requested = (category or "world").lower()
-    chosen_category = CANONICAL_BY_KEY.get(requested, "world")
-    print(f"Fetching news for category: {chosen_category}")
+    task = _refreshing.get(category)
+    if task is None:
+        task = asyncio.create_task(_refresh(category))
+        _refreshing[category] = task
+    return task
+
 
-    # 2. Get articles already fetched today
+def _new_article_filter(extra_index=None):
+    """
+    Returns a predicate accepting articles not fetched today, exactly or as the
+    same story elsewhere. extra_index also rejects stories already picked in
+    the current call.
+    """
     fetched_urls_today = get_fetched_today()
+    stories_today = get_duplicate_index_today()
 
-    # 3. Fetch a pool of possible articles (more than 3, to filter)
-    # We fetch 20 to have a good chance of finding 3 new ones.
+    def is_new(article):
+        return (
+            article_fingerprint(article) not in fetched_urls_today
+            and not stories_today.has_article(article)
+            and not (extra_index is not None and extra_index.has_article(article))
+        )
+
+    return is_new
+
+
+async def _article_pool(chosen_category, is_new):
+    """
+    Returns the candidate article pool of a category, collapsed to one copy per
+    story, from the cache or by querying all providers concurrently.
+    """
     # ---------- CACHING / RATE-LIMIT PROTECTION ----------
     now = time.time()
-    if chosen_category in _category_cache:
-        ts, cached = _category_cache[chosen_category]
+    entry = _category_cache.get(chosen_category)
+    if entry is not None:
+        ts, cached = entry
         if now - ts < CACHE_TTL:
             print("Using cached results (TTL not expired).")
-            all_possible_articles = cached
-        else:
-            all_possible_articles = None
-    else:
-        all_possible_articles = None
+            return cached
+        if now - ts < STALE_TTL:
+            # Stale-while-revalidate: answer now, refresh in the background.
+            print("Using stale cached results, refreshing in background.")
+            refresh_category(chosen_category)
+            return cached
     # ------------------------------------------------------
 
-    if all_possible_articles is None:
-        # ---- PRIMARY PROVIDER: GoogleNews scraper ----
-        try:
-            print("Trying Google News provider...")
-            all_possible_articles = google_fetch_category_news(chosen_category)
-
-            # If Google returns nonsense or 0 results → treat as failure
-            if not all_possible_articles:
-                raise ValueError("Google provider returned empty list.")
-
-            # Cache result
-            _category_cache[chosen_category] = (time.time(), all_possible_articles)
+    if chosen_category in _refreshing:
+        print("Waiting for in-flight refresh of this category...")
+        pool = await asyncio.shield(_refreshing[chosen_category])
+        if pool:
+            return pool
 
-        except Exception as e:
-            print(f"Google provider failed: {e}")
+    # ---- ALL PROVIDERS AT ONCE: GoogleNews scraper + every RSS feed ----
+    print("Querying all news providers concurrently...")
+    # Syndicated copies of one story count once towards the early return
+    distinct = DuplicateIndex()
 
-            try:
-                print("Trying RSS fallback provider...")
-                all_possible_articles = feedparser_fetch_category_news(chosen_category)
+    def accept(article):
+        if not is_new(article) or distinct.has_article(article):
+            return False
+        distinct.add_article(article)
+        return True
 
-                if not all_possible_articles:
-                    raise ValueError("RSS provider returned empty list.")
+    outcome = await fetch_from_sources(
+        category_sources(chosen_category),
+        first_n=CANDIDATES_PER_FETCH,
+        accept=accept,
+        on_complete=_store_in_cache(chosen_category),
+    )
+    for source, error in outcome.errors.items():
+        print(f"Provider {source} failed: {error}")
 
-                _category_cache[chosen_category] = (time.time(), all_possible_articles)
+    if outcome.articles:
+        return collapse_near_duplicates(outcome.articles)
+    entry = _category_cache.get(chosen_category)
+    if entry is not None:
+        print("Using cached result as last resort.")
+        return entry[1]
+    # Throttled providers are skipped by their host limiters; the caller reports
+    # degraded_hosts() instead of waiting here.
+    print("No cache available — returning empty list.")
+    return []
 
-            except Exception as e2:
-                print(f"RSS fallback failed: {e2}")
 
-                if chosen_category in _category_cache:
-                    print("Using cached result as last resort.")
-                    all_possible_articles = _category_cache[chosen_category][1]
-                else:
-                    print("No cache available — returning empty list.")
-                    time.sleep(BACKOFF_ON_429)
-                    return []
+def _pick_new(pool, is_new, picked=None):
+    """
+    Picks the ARTICLES_PER_FETCH best new articles of a pool by freshness,
+    novelty against today's history and source / topic diversity, and logs them.
 
-    # 4. Filter out any articles we've already fetched today
+    Picks are claimed in the history log; when another replica got an article
+    first, the rest of the pool is re-filtered against its claims and ranked
+    again for the missing slots. Claims block on the shared state, so async
+    callers run this in a worker thread.
+    """
     new_articles = []
-    for article in all_possible_articles:
-        key = (article.get("title", ""), article.get("summary", ""), article.get("source", ""))
-        if key not in fetched_urls_today:
-            new_articles.append(article)
-            if len(new_articles) >= 3:
-                break
-        
-        # 5. Stop once we have 3 new articles
-        if len(new_articles) >= 3:
+    candidates = [article for article in pool if is_new(article)]
+    for _ in range(CLAIM_ATTEMPTS):
+        wanted = ARTICLES_PER_FETCH - len(new_articles)
+        ranked = rank_articles(candidates, wanted, get_duplicate_index_today())
+        won = log_fetched_articles(ranked)
+        new_articles.extend(won)
+        if picked is not None:
+            for article in won:
+                picked.add_article(article)
+        if len(won) == len(ranked):
             break
-            
-    # 6. Log the newly fetched articles to our history
+        # The history index now includes the claims that beat ours
+        candidates = [article for article in candidates if article not in ranked and is_new(article)]
+    return new_articles
+
+
+def _canonical_category(category):
+    requested = (category or "world").lower()
+    return CANONICAL_BY_KEY.get(requested, "world")
+
+
+async def fetch_all_news_async(category: str | None):
+    """
+    Fetches 3 new news articles from a single category.
+
+    All providers are queried concurrently; the call returns as soon as 12
+    distinct stories not fetched today have arrived (the ranker picks the best
+    3 of them), while the remaining sources keep filling the category cache in
+    the background.
+
+    This function ensures that no article is fetched more than once per day.
+    """
+    chosen_category = _canonical_category(category)
+    _category_hits[chosen_category] += 1
+    print(f"Fetching news for category: {chosen_category}")
+
+    # Loading today's history may read other replicas' claims from shared state
+    is_new = await asyncio.to_thread(_new_article_filter)
+    all_possible_articles = await _article_pool(chosen_category, is_new)
+
+    # Filter out any articles we've already fetched today and rank the rest. The
+    # pool is already collapsed to one copy per story.
+    new_articles = await asyncio.to_thread(_pick_new, all_possible_articles, is_new)
+
     if new_articles:
-        log_fetched_articles(new_articles)
         print(f"Found and logged {len(new_articles)} new articles.")
     else:
         print("No new articles found for this category today.")
 
-    # 7. Return only the 3 (or fewer) new articles
     return new_articles
+
+
+async def fetch_news_batch_async(categories: list[str]) -> dict[str, list[Article]]:
+    """
+    Fetches up to 3 new articles for each of several categories at once.
+
+    The category pools are fetched concurrently, then one dedup pass picks the
+    articles in the given order, so a story shown under one category is not
+    repeated under another. Returns {canonical category: articles}.
+    """
+    chosen = list(dict.fromkeys(_canonical_category(c) for c in categories))
+    if not chosen:
+        return {}
+    for category in chosen:
+        _category_hits[category] += 1
+    print(f"Fetching news for categories: {', '.join(chosen)}")
+
+    picked = DuplicateIndex()
+    is_new = await asyncio.to_thread(_new_article_filter, picked)
+    pools = await asyncio.gather(*(_article_pool(c, is_new) for c in chosen))
+
+    results = {}
+    for category, pool in zip(chosen, pools):
+        results[category] = await asyncio.to_thread(_pick_new, pool, is_new, picked)
+
+    logged = sum(len(articles) for articles in results.values())
+    if logged:
+        print(f"Found and logged {logged} new articles.")
+    return results
+
+
+async def _fetch_and_settle(category):
+    articles = await fetch_all_news_async(category)
+    # asyncio.run cancels what is still running on return, so let the background
+    # collectors and refreshes finish filling the category cache first
+    await wait_for_background()
+    if _refreshing:
+        await asyncio.gather(*_refreshing.values(), return_exceptions=True)
+    return articles
+
+
+def fetch_all_news(category: str | None):
+    """
+    Synchronous wrapper around fetch_all_news_async for scripts and CLI use.
+
+    Unlike the async call it returns only once every provider finished or timed
+    out, so the full pool is cached and provider health is recorded.
+    """
+    return asyncio.run(_fetch_and_settle(category))
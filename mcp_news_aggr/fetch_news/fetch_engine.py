@@ -0,0 +1,242 @@
+"""
+Concurrent fetch engine for news providers.
+
+Every source (the GoogleNews scraper and each RSS feed of a category) runs at
+the same time in a worker thread. Articles are streamed back to the event loop
+as soon as a source produces them, so a call costs roughly the latency of the
+slowest source instead of the sum of all of them. With ``first_n`` set, the
+engine returns as soon as enough acceptable articles have arrived and lets the
+remaining sources finish in the background.
+
+A source's timeout starts when a worker picks it up, not when it is queued, so
+a large batch waiting for free workers is not blamed on its providers. A
+source that gets no worker within the timeout is dropped without running and
+without touching its health score.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Iterable
+
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.category_fetcher import (
+    feedparser_fetch_feed,
+    feeds_for_category,
+    google_iter_category_news,
+)
+from mcp_news_aggr.fetch_news.provider_health import order_sources, record_fetch
+from mcp_news_aggr.fetch_news.rate_limiter import ProviderUnavailable
+
+# Seconds each source gets before its (partial) results are given up on.
+SOURCE_TIMEOUT = 8.0
+
+# Network-bound worker threads shared by every fetch.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="news-source")
+
+# Collectors still running after an early return; kept referenced until done.
+_background_collectors: set[asyncio.Task] = set()
+
+_STARTED = object()
+_DONE = object()
+
+Source = tuple[str, Callable[[], Iterable[Article]]]
+
+
+@dataclass
+class FetchOutcome:
+    """Articles gathered from a set of sources, in source priority order."""
+
+    articles: list[Article] = field(default_factory=list)
+    complete: bool = True
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def category_sources(category: str) -> list[Source]:
+    """
+    Returns the (name, fetch) pairs for a category in priority order: the
+    GoogleNews scraper and each RSS feed, ranked by their health scores.
+    Sources that keep failing are left out until they are due for a probe.
+    """
+    sources: list[Source] = [("google", partial(google_iter_category_news, category))]
+    for url in feeds_for_category(category):
+        sources.append((url, partial(feedparser_fetch_feed, url)))
+    return order_sources(sources)
+
+
+def _post(loop, queue, item):
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+    except RuntimeError:
+        # The loop is gone (e.g. a sync caller's asyncio.run already returned).
+        pass
+
+
+def _drain_source(loop, queue, stop, name, fetch):
+    """Runs in a worker thread: pushes each article of a source onto the queue."""
+    _post(loop, queue, (name, _STARTED))
+    articles = None
+    try:
+        articles = iter(fetch())
+        for article in articles:
+            if stop.is_set():
+                break
+            _post(loop, queue, (name, article))
+    except Exception as e:
+        _post(loop, queue, (name, e))
+    finally:
+        # Streaming sources (generators) release their own workers on close.
+        close = getattr(articles, "close", None)
+        if close is not None:
+            close()
+        _post(loop, queue, (name, _DONE))
+
+
+def _merge(names, by_source):
+    articles = []
+    for name in names:
+        articles.extend(by_source[name])
+    return articles
+
+
+async def _collect(sources, timeout, first_n, accept, early, on_complete):
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    names = [name for name, _ in sources]
+    by_source: dict[str, list[Article]] = {name: [] for name in names}
+    errors: dict[str, str] = {}
+    # Sources refused by our own limiter before sending a request
+    throttled: set[str] = set()
+    # Sources that never got a worker
+    not_started: set[str] = set()
+    pending = set(names)
+    accepted = 0
+    fresh: dict[str, int] = {name: 0 for name in names}
+    latency: dict[str, float] = {}
+
+    submitted = time.monotonic()
+    started: dict[str, float] = {}
+    workers = {
+        name: loop.run_in_executor(_executor, _drain_source, loop, queue, stop, name, fetch)
+        for name, fetch in sources
+    }
+
+    def deadline(name):
+        # Waiting for a worker and running each get the full timeout
+        return started.get(name, submitted) + timeout
+
+    try:
+        while pending:
+            now = time.monotonic()
+            for name in [name for name in pending if deadline(name) <= now]:
+                pending.discard(name)
+                if name in started:
+                    errors[name] = f"timed out after {timeout:.1f}s"
+                else:
+                    # Still queued: drop it without running
+                    workers[name].cancel()
+                    not_started.add(name)
+                    errors[name] = f"not started within {timeout:.1f}s, fetch workers busy"
+            if not pending:
+                break
+            try:
+                name, item = await asyncio.wait_for(
+                    queue.get(), min(deadline(name) for name in pending) - now
+                )
+            except asyncio.TimeoutError:
+                continue
+            if name not in pending:
+                continue
+
+            if item is _STARTED:
+                started[name] = time.monotonic()
+            elif item is _DONE:
+                pending.discard(name)
+                latency[name] = time.monotonic() - started.get(name, submitted)
+            elif isinstance(item, Exception):
+                errors[name] = str(item)
+                if isinstance(item, ProviderUnavailable) and item.local:
+                    throttled.add(name)
+            else:
+                by_source[name].append(item)
+                is_fresh = accept is None or accept(item)
+                if is_fresh:
+                    fresh[name] += 1
+                if first_n and is_fresh:
+                    accepted += 1
+                    if accepted >= first_n and not early.done():
+                        early.set_result(
+                            FetchOutcome(_merge(names, by_source), False, dict(errors))
+                        )
+    finally:
+        # Tell worker threads still iterating to stop producing, and drop
+        # sources still waiting for a worker.
+        stop.set()
+        for worker in workers.values():
+            worker.cancel()
+
+    for name in names:
+        # Neither self-throttling nor a busy worker pool says anything about
+        # the provider; they must not demote the source
+        if name in throttled or name in not_started:
+            continue
+        record_fetch(
+            name,
+            latency.get(name, timeout),
+            failed=name in errors,
+            fresh=fresh[name] if accept is not None else None,
+        )
+
+    outcome = FetchOutcome(_merge(names, by_source), len(latency) == len(names), errors)
+    if on_complete is not None:
+        on_complete(outcome)
+    return outcome
+
+
+async def fetch_from_sources(
+    sources: list[Source],
+    timeout: float = SOURCE_TIMEOUT,
+    first_n: int | None = None,
+    accept: Callable[[Article], bool] | None = None,
+    on_complete: Callable[[FetchOutcome], None] | None = None,
+) -> FetchOutcome:
+    """
+    Fans out to all sources at once and gathers their articles.
+
+    :param sources: (name, fetch) pairs; ``fetch`` is a blocking callable returning
+        an iterable of Article records and runs in a worker thread. Generators are
+        consumed as they yield, so paged sources stream their results.
+    :param timeout: Seconds each source is given before it is reported as timed out.
+    :param first_n: If set, return as soon as this many acceptable articles arrived.
+        The outcome is then marked incomplete and collection continues in the background.
+    :param accept: Predicate deciding which articles count towards ``first_n``.
+    :param on_complete: Called with the full outcome once every source finished or
+        timed out, also when the call itself returned early.
+    """
+    loop = asyncio.get_running_loop()
+    early = loop.create_future()
+    collector = asyncio.create_task(
+        _collect(sources, timeout, first_n, accept, early, on_complete)
+    )
+
+    if not first_n:
+        return await collector
+
+    await asyncio.wait({collector, early}, return_when=asyncio.FIRST_COMPLETED)
+    if collector.done():
+        return collector.result()
+
+    _background_collectors.add(collector)
+    collector.add_done_callback(_background_collectors.discard)
+    return early.result()
+
+
+async def wait_for_background():
+    """Waits for the collectors still running after calls that returned early."""
+    if _background_collectors:
+        await asyncio.gather(*_background_collectors, return_exceptions=True)
@@ -1,23 +1,14 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 
-def parse_date(date_str):
+from mcp_news_aggr.fetch_news.date_normalizer import day_string, parse_timestamp
+
+
+def parse_date(date_str, now=None):
     """
-    Parses a relative date string from Google News into a YYYY-MM-DD format.
+    Parses a Google News date string (relative or absolute) into YYYY-MM-DD format.
+
+    Unreadable dates fall back to today; use date_normalizer.normalize_dates for
+    timestamps that keep them unknown.
     """
-    today = datetime.today()
-    date_str = date_str.lower()
-    
-    if "today" in date_str:
-        return today.strftime("%Y-%m-%d")
-    elif "yesterday" in date_str:
-        return (today - timedelta(days=1)).strftime("%Y-%m-%d")
-    elif "hours ago" in date_str or "minutes ago" in date_str:
-        return today.strftime("%Y-%m-%d")
-    else:
-        try:
-            # Try parsing formats like "Nov 29, 2023"
-            parsed_date = datetime.strptime(date_str, "%b %d, %Y")
-            return parsed_date.strftime("%Y-%m-%d")
-        except ValueError:
-            # Fallback for other unhandled formats
-            return today.strftime("%Y-%m-%d")
+    now = now or datetime.now(timezone.utc)
+    return day_string(parse_timestamp(date_str, now))
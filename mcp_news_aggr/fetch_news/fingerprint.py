@@ -0,0 +1,201 @@
+"""
+Article fingerprints for cross-provider duplicate detection.
+
+The same story syndicated by Reuters, BBC and Google News arrives with different
+links, titles suffixed with the publisher and slightly edited summaries. Two keys
+catch those copies:
+
+- a canonical URL (tracking parameters, fragments and ``www.`` removed), and
+- a 64-bit SimHash of the normalized title + summary, where near-duplicates
+  differ in only a few bits.
+
+Token hashes are memoized and accumulated with a single big-int sum per article,
+so fingerprinting stays well under a millisecond per article.
+"""
+
+import hashlib
+import html
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from mcp_news_aggr.config import NEWS_CACHE_MAX_BYTES
+from mcp_news_aggr.fetch_news.article import Article
+
+# Maximum number of differing SimHash bits for two articles to count as the same story
+NEAR_DUPLICATE_DISTANCE = 3
+
+_TRACKING_PARAMS = {"ved", "usg", "gclid", "fbclid", "oc", "ocid", "cmpid", "ref", "rss", "taid"}
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+# " - Reuters", " | BBC News", " — SMI DIGITAL" publisher suffixes on titles
+_PUBLISHER_SUFFIX_RE = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,60}$")
+
+_BITS = 64
+# Each SimHash bit gets an 8-bit lane in the accumulator, so at most 255 tokens count
+_MAX_TOKENS = 255
+_BANDS = 4
+_BAND_BITS = _BITS // _BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+# Memoized token hashes get an eighth of the pool cache's memory budget; an entry
+# (bigram token, 512-bit spread hash, LRU link) takes up to about 300 bytes
+SPREAD_CACHE_BYTES = NEWS_CACHE_MAX_BYTES // 8
+_SPREAD_CACHE_ENTRIES = max(256, SPREAD_CACHE_BYTES // 320)
+
+# Every byte value with its 8 bits widened to 8-bit lanes (0b101 -> 0x010001)
+_SPREAD_BYTE = [
+    sum(1 << (8 * bit) for bit in range(8) if value >> bit & 1) for value in range(256)
+]
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes an article URL so the same page links compare equal.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    path, query = parts.path, parts.query
+    # The GoogleNews scraper glues "&ved=...&usg=..." onto the path without a "?"
+    if not query and "&" in path:
+        path, query = path.split("&", 1)
+
+    params = sorted(
+        (k, v)
+        for k, v in parse_qsl(query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = path.rstrip("/")
+    query = urlencode(params)
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def normalize_text(title: str, summary: str) -> list[str]:
+    """Lowercased word tokens of title + summary without markup or publisher suffix."""
+    title = _PUBLISHER_SUFFIX_RE.sub("", html.unescape(title or ""))
+    summary = _TAG_RE.sub(" ", html.unescape(summary or ""))
+    return [w for w in _WORD_RE.findall(f"{title} {summary}".lower()) if len(w) > 2]
+
+
+@lru_cache(maxsize=_SPREAD_CACHE_ENTRIES)
+def _spread_hash(token: str) -> int:
+    """Hash of a token with every bit widened to an 8-bit lane, ready for summing."""
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    spread = 0
+    for i, byte in enumerate(digest):
+        spread |= _SPREAD_BYTE[byte] << (64 * i)
+    return spread
+
+
+def simhash(tokens: list[str]) -> int:
+    """64-bit SimHash over word unigrams and bigrams."""
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    features = features[:_MAX_TOKENS]
+    if not features:
+        return 0
+
+    total = sum(map(_spread_hash, features))
+    counts = total.to_bytes(_BITS, "little")
+    threshold = len(features) / 2
+    value = 0
+    for i, count in enumerate(counts):
+        if count > threshold:
+            value |= 1 << i
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def article_keys(article: Article) -> tuple[str, int]:
+    """
+    Returns (canonical URL, SimHash) of an article, computed once per article.
+    """
+    keys = article.dedup_keys
+    if keys is None:
+        keys = (
+            canonicalize_url(article.url),
+            simhash(normalize_text(article.title, article.summary)),
+        )
+        article.dedup_keys = keys
+    return keys
+
+
+class DuplicateIndex:
+    """
+    Answers "have we seen this story?" by canonical URL or SimHash distance.
+
+    SimHashes are split into 4 bands of 16 bits; two hashes within 3 bits of each
+    other always share at least one band, so only that band's bucket is compared.
+    """
+
+    __slots__ = ("_urls", "_buckets", "max_distance")
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        self._urls: set[str] = set()
+        self._buckets: dict[tuple[int, int], list[int]] = {}
+        self.max_distance = max_distance
+
+    def __len__(self):
+        return len(self._urls)
+
+    def add(self, url_key: str, value: int):
+        if url_key:
+            self._urls.add(url_key)
+        if value:
+            for band in range(_BANDS):
+                key = (band, value >> (band * _BAND_BITS) & _BAND_MASK)
+                self._buckets.setdefault(key, []).append(value)
+
+    def is_duplicate(self, url_key: str, value: int) -> bool:
+        if url_key and url_key in self._urls:
+            return True
+        if not value:
+            return False
+        for band in range(_BANDS):
+            key = (band, value >> (band * _BAND_BITS) & _BAND_MASK)
+            for other in self._buckets.get(key, ()):
+                if hamming_distance(value, other) <= self.max_distance:
+                    return True
+        return False
+
+    def nearest_distance(self, value: int) -> int | None:
+        """
+        Smallest SimHash distance to an indexed story sharing a band with value,
+        or None if no story is in any of its buckets.
+        """
+        if not value:
+            return None
+        nearest = None
+        for band in range(_BANDS):
+            key = (band, value >> (band * _BAND_BITS) & _BAND_MASK)
+            for other in self._buckets.get(key, ()):
+                distance = hamming_distance(value, other)
+                if nearest is None or distance < nearest:
+                    nearest = distance
+        return nearest
+
+    def add_article(self, article: Article):
+        self.add(*article_keys(article))
+
+    def has_article(self, article: Article) -> bool:
+        return self.is_duplicate(*article_keys(article))
+
+
+def collapse_near_duplicates(articles: list[Article]) -> list[Article]:
+    """
+    Drops later copies of the same story, keeping the first (highest priority) one.
+    """
+    index = DuplicateIndex()
+    unique = []
+    for article in articles:
+        if index.has_article(article):
+            continue
+        index.add_article(article)
+        unique.append(article)
+    return unique
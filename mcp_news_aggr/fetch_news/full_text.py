@@ -0,0 +1,287 @@
+"""
+Optional full-text extraction of article pages for the summarizer.
+
+Providers only deliver a snippet (GoogleNews ``desc``, RSS ``summary``). When
+NEWS_FULLTEXT is enabled, the pages of the picked articles are downloaded with
+one pooled HTTP client and their main text is extracted in a process pool, so
+parsing never holds the event loop. Texts are cached by canonical URL (LRU).
+
+Extraction is kept off the hot path by a time budget: ``extract_full_texts``
+returns whatever is ready after NEWS_FULLTEXT_BUDGET seconds and leaves the
+rest running, so a slow publisher only means its snippet is used this time and
+the extracted text is there for the next digest of that article.
+
+Google News links point at Google, not the publisher. Older links carry the
+publisher URL in their base64 article id and are decoded locally; for the rest
+the Google page is downloaded (against the news.google.com limiter) and the
+publisher link it names is followed. Links Google only resolves in JavaScript
+yield no text, and those articles keep their snippet.
+"""
+
+import asyncio
+import atexit
+import base64
+import binascii
+import html
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+import httpx
+
+from mcp_news_aggr.config import (
+    NEWS_FULLTEXT,
+    NEWS_FULLTEXT_BUDGET,
+    NEWS_FULLTEXT_CACHE_SIZE,
+    NEWS_FULLTEXT_MAX_BYTES,
+    NEWS_FULLTEXT_WORKERS,
+)
+from mcp_news_aggr.fetch_news.fingerprint import canonicalize_url
+from mcp_news_aggr.fetch_news.rate_limiter import (
+    ProviderUnavailable,
+    host_of,
+    is_throttling_status,
+    limiter_for,
+)
+
+# Hosts whose links are redirect pages in front of the publisher's article
+REDIRECT_HOSTS = ("news.google.com",)
+# Paragraphs shorter than this many words are navigation, captions or bylines
+MIN_PARAGRAPH_WORDS = 8
+# Extracted text is cut to this many characters; the summarizer packs it further
+MAX_TEXT_CHARS = 8000
+FETCH_TIMEOUT = 5.0
+USER_AGENT = "Mozilla/5.0 (compatible; mcp-news-aggregator)"
+
+_SKIPPED_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure"}
+_SPACE_RE = re.compile(r"\s+")
+_GOOGLE_ARTICLE_RE = re.compile(r"/articles/([A-Za-z0-9_-]+)")
+_EMBEDDED_URL_RE = re.compile(rb"https?://[\x21-\x7e]+")
+# Where a redirect page names its target: Google's data-n-au attribute or a meta refresh
+_REDIRECT_TARGET_RE = re.compile(
+    r'data-n-au="(https?://[^"]+)"|<meta[^>]+http-equiv="refresh"[^>]+url=(https?://[^"\'>]+)',
+    re.IGNORECASE,
+)
+
+
+class _ParagraphParser(HTMLParser):
+    """Collects the text of <p> elements outside page chrome."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs: list[str] = []
+        self._skip_depth = 0
+        self._current: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "p" and not self._skip_depth:
+            self._flush()
+            self._current = []
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "p":
+            self._flush()
+
+    def handle_data(self, data):
+        if self._current is not None and not self._skip_depth:
+            self._current.append(data)
+
+    def _flush(self):
+        if self._current is not None:
+            text = _SPACE_RE.sub(" ", "".join(self._current)).strip()
+            if len(text.split()) >= MIN_PARAGRAPH_WORDS:
+                self.paragraphs.append(text)
+        self._current = None
+
+
+def extract_main_text(page: str) -> str:
+    """
+    Main text of an HTML page: its substantial paragraphs outside navigation,
+    headers, footers and asides, in page order. Runs in the worker processes.
+    """
+    parser = _ParagraphParser()
+    try:
+        parser.feed(page)
+        parser.close()
+    except Exception:
+        pass
+    parser._flush()
+    text = ""
+    for paragraph in dict.fromkeys(parser.paragraphs):
+        if len(text) + len(paragraph) > MAX_TEXT_CHARS:
+            break
+        text += paragraph + "\n"
+    return text.strip()
+
+
+def decode_google_news_url(url: str) -> str | None:
+    """
+    Publisher URL embedded in a Google News article link, or None for links
+    whose id does not carry it (newer ids are opaque and need Google to resolve).
+    """
+    match = _GOOGLE_ARTICLE_RE.search(url)
+    if match is None:
+        return None
+    token = match.group(1)
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    # The id is a protobuf message; the URL is its first printable run
+    found = _EMBEDDED_URL_RE.search(raw)
+    return found.group().decode("ascii") if found else None
+
+
+def _redirect_target(page: str) -> str | None:
+    match = _REDIRECT_TARGET_RE.search(page)
+    if match is None:
+        return None
+    target = html.unescape(match.group(1) or match.group(2))
+    return None if host_of(target) in REDIRECT_HOSTS else target
+
+
+class FullTextCache:
+    """LRU of extracted text per canonical URL ('' marks a page without text)."""
+
+    def __init__(self, max_entries=NEWS_FULLTEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = FullTextCache()
+# Extractions running per canonical URL, shared by concurrent digests
+_in_flight: dict[str, asyncio.Task] = {}
+_client: httpx.AsyncClient | None = None
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """The pooled HTTP client, created on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=FETCH_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=NEWS_FULLTEXT_WORKERS)
+        atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+async def _download(url: str) -> str | None:
+    limiter = limiter_for(url)
+    # Never sleep for a token on the event loop; a busy host just keeps its snippet
+    limiter.acquire(max_wait=0)
+    async with _get_client().stream("GET", url) as response:
+        if response.status_code != 200:
+            # Only throttling backs the host off; a 404 or 403 just has no text
+            if is_throttling_status(response.status_code):
+                limiter.record_failure()
+            return None
+        if "html" not in response.headers.get("content-type", "html"):
+            return None
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= NEWS_FULLTEXT_MAX_BYTES:
+                break
+        limiter.record_success()
+        return bytes(body).decode(response.encoding or "utf-8", errors="replace")
+
+
+async def _fetch_page(url: str) -> str | None:
+    """The article page behind url, following Google News links to the publisher."""
+    if host_of(url) not in REDIRECT_HOSTS:
+        return await _download(url)
+    target = decode_google_news_url(url)
+    if target is not None:
+        return await _download(target)
+    page = await _download(url)
+    # An HTTP redirect already lands on the publisher; a redirect page names it
+    target = _redirect_target(page) if page else None
+    return await _download(target) if target else page
+
+
+async def _extract(key: str, url: str):
+    try:
+        page = await _fetch_page(url)
+        text = ""
+        if page:
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(_get_pool(), extract_main_text, page)
+        _cache.put(key, text)
+    except ProviderUnavailable:
+        # Not cached: the host may have capacity again for the next digest
+        pass
+    except Exception as e:
+        print(f"Full-text extraction of {url} failed: {e}")
+        _cache.put(key, "")
+    finally:
+        _in_flight.pop(key, None)
+
+
+def _extraction(url: str) -> asyncio.Task | None:
+    key = canonicalize_url(url)
+    if not key or _cache.get(key) is not None:
+        return None
+    task = _in_flight.get(key)
+    if task is None:
+        task = _in_flight[key] = asyncio.create_task(_extract(key, url))
+    return task
+
+
+async def extract_full_texts(articles, budget: float = NEWS_FULLTEXT_BUDGET) -> dict[str, str]:
+    """
+    Returns {article url: extracted main text} for the articles whose text is
+    cached or extracted within budget seconds. Disabled (empty) unless
+    NEWS_FULLTEXT is set. Extractions still running at the deadline continue
+    in the background and fill the cache.
+    """
+    if not NEWS_FULLTEXT or not articles:
+        return {}
+    pending = {task for task in (_extraction(a.url) for a in articles if a.url) if task is not None}
+    if pending and budget > 0:
+        await asyncio.wait(pending, timeout=budget)
+
+    texts = {}
+    for article in articles:
+        text = _cache.get(canonicalize_url(article.url)) if article.url else None
+        if text:
+            texts[article.url] = text
+    return texts
@@ -1,9 +1,34 @@
+import hashlib
 import json
 import os
-from datetime import datetime
-
-# JSON file that stores fetched articles by date
-DB_FILE = "mcp_news_aggr/fetch_news/fetched_articles_history.json"
+import threading
+from datetime import datetime, timedelta
+
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.fingerprint import DuplicateIndex, article_keys
+from mcp_news_aggr.fetch_news.shared_state import shared_state
+
+# Append-only JSON-lines log of fetched articles, one partition file per day
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), "history")
+# Days of history kept; older partitions are deleted during compaction
+RETENTION_DAYS = 7
+
+# Legacy single-file JSON database, imported once into the partitioned log
+DB_FILE = os.path.join(os.path.dirname(__file__), "fetched_articles_history.json")
+
+# In-memory index: day -> set of article fingerprints logged that day
+_index: dict[str, set[str]] = {}
+# Same days indexed by canonical URL and SimHash, for near-duplicate lookups
+_near_index: dict[str, DuplicateIndex] = {}
+# Bytes of each day's partition already read into the index
+_offsets: dict[str, int] = {}
+# Position in the shared claims of other replicas already read into the index
+_shared_cursors: dict[str, int] = {}
+_last_compacted_day = None
+_legacy_imported = False
+# Async callers reach the index and claims from worker threads, so that shared
+# state round trips don't block the event loop; one thread at a time updates them
+_lock = threading.RLock()
 
 
 def _get_today_str():
@@ -11,71 +36,208 @@ def _get_today_str():
     return datetime.today().strftime("%Y-%m-%d")
 
 
-def _read_db():
-    """Reads the JSON database file, or returns an empty dict if it doesn't exist."""
+def article_fingerprint(article):
+    """
+    Returns a compact, stable fingerprint of an article's (title, summary, source).
+    """
+    key = "\x1f".join((article.title, article.summary, article.source))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _partition_path(day):
+    return os.path.join(HISTORY_DIR, f"{day}.jsonl")
+
+
+def _record(article, day):
+    url_key, simhash = article_keys(article)
+    return {
+        "fp": article_fingerprint(article),
+        "u": url_key,
+        "sh": simhash,
+        "title": article.title,
+        "summary": article.summary,
+        "source": article.source,
+        "url": article.url,
+        "date": article.date or day,
+    }
+
+
+def _append_records(day, records):
+    """Appends records to a day's partition with a single write."""
+    os.makedirs(HISTORY_DIR, exist_ok=True)
+    payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    with open(_partition_path(day), "a", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def _import_legacy_db():
+    """Moves days from the old JSON file into partitions that don't exist yet."""
+    global _legacy_imported
+    _legacy_imported = True
     if not os.path.exists(DB_FILE):
-        return {}
+        return
     try:
         with open(DB_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            legacy = json.load(f)
     except (json.JSONDecodeError, FileNotFoundError):
-        return {}
+        return
 
+    cutoff = (datetime.today() - timedelta(days=RETENTION_DAYS)).strftime("%Y-%m-%d")
+    for day, articles in legacy.items():
+        if day < cutoff or os.path.exists(_partition_path(day)):
+            continue
+        _append_records(day, [_record(Article.from_dict(a), day) for a in articles])
 
-def _write_db(data):
-    """Writes data safely to the JSON database file."""
-    os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
-    with open(DB_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def _load_index(day):
+    """
+    Brings the in-memory index for a day up to date.
+
+    Only bytes appended since the last call are read, so other processes
+    writing to the same partition are picked up at the cost of their new lines.
+    """
+    with _lock:
+        if not _legacy_imported:
+            _import_legacy_db()
+
+        fingerprints = _index.setdefault(day, set())
+        near = _near_index.setdefault(day, DuplicateIndex())
+        _read_partition(day, fingerprints, near)
+
+        # Articles other replicas served today, when state is shared
+        records, _shared_cursors[day] = shared_state.claims_since(day, _shared_cursors.get(day, 0))
+        for record in records:
+            if record["fp"] not in fingerprints:
+                fingerprints.add(record["fp"])
+                near.add(record["u"], record["sh"])
+        return fingerprints
+
+
+def _read_partition(day, fingerprints, near):
+    path = _partition_path(day)
+    offset = _offsets.get(day, 0)
+    try:
+        if os.path.getsize(path) <= offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return
+
+    # Leave a partially written trailing line for the next read
+    end = chunk.rfind(b"\n") + 1
+    for line in chunk[:end].splitlines():
+        try:
+            record = json.loads(line)
+            fingerprints.add(record["fp"])
+        except (json.JSONDecodeError, KeyError):
+            continue
+        near.add(record.get("u", ""), record.get("sh", 0))
+    _offsets[day] = offset + end
+
+
+def compact_history(retention_days=RETENTION_DAYS):
+    """
+    Deletes partitions older than the retention window and rewrites the
+    remaining past days without duplicate fingerprints. Today's partition is
+    left alone because it is still being appended to.
+    """
+    if not os.path.isdir(HISTORY_DIR):
+        return
+    today = _get_today_str()
+    cutoff = (datetime.today() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+
+    for name in os.listdir(HISTORY_DIR):
+        if not name.endswith(".jsonl"):
+            continue
+        day = name[: -len(".jsonl")]
+        path = os.path.join(HISTORY_DIR, name)
+        if day >= today:
+            continue
+        # Past days are never looked up again; drop them from memory
+        _index.pop(day, None)
+        _near_index.pop(day, None)
+        _offsets.pop(day, None)
+        _shared_cursors.pop(day, None)
+        if day < cutoff:
+            os.remove(path)
+            continue
+
+        seen = set()
+        kept = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    fp = json.loads(line)["fp"]
+                except (json.JSONDecodeError, KeyError):
+                    continue
+                if fp not in seen:
+                    seen.add(fp)
+                    kept.append(line if line.endswith("\n") else line + "\n")
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(kept)
+        os.replace(tmp_path, path)
+
+
+def _maybe_compact(today):
+    """Compacts once per process and day, on the first write of the day."""
+    global _last_compacted_day
+    if _last_compacted_day != today:
+        _last_compacted_day = today
+        compact_history()
+        shared_state.prune_claims(today)
 
 
 def get_fetched_today():
     """
-    Returns a set of (title, summary, source) tuples for all articles fetched today.
+    Returns the set of fingerprints (see article_fingerprint) of all articles fetched today.
+    """
+    return _load_index(_get_today_str())
+
+
+def get_duplicate_index_today():
+    """
+    Returns the canonical-URL / SimHash index of today's articles, to catch
+    the same story arriving again from a different provider.
     """
-    db = _read_db()
     today = _get_today_str()
-    articles_list = db.get(today, [])
-    return set(
-        (a.get("title", ""), a.get("summary", ""), a.get("source", ""))
-        for a in articles_list
-    )
+    _load_index(today)
+    return _near_index[today]
 
 
 def log_fetched_articles(articles):
     """
     Logs new articles (title, summary, source) to the database for today.
-    Avoids logging duplicates.
+    Avoids logging duplicates and only appends the new records.
+
+    With shared state, an article is only logged if this replica claims it
+    first. Returns the articles that were logged. Blocks on the shared state;
+    async code calls it from a worker thread.
     """
     if not articles:
-        return
+        return []
 
-    db = _read_db()
     today = _get_today_str()
-
-    # Ensure today's entry exists
-    if today not in db:
-        db[today] = []
-
-    # Create a set for fast lookup
-    existing = set(
-        (a.get("title", ""), a.get("summary", ""), a.get("source", ""))
-        for a in db[today]
-    )
-
-    new_articles_logged = False
-    for article in articles:
-        key = (article.get("title", ""), article.get("summary", ""), article.get("source", ""))
-        if key not in existing:
-            db[today].append({
-                "title": article.get("title", ""),
-                "summary": article.get("summary", ""),
-                "source": article.get("source", ""),
-                "url": article.get("url", ""),
-                "date": article.get("date", today)
-            })
-            existing.add(key)
-            new_articles_logged = True
-
-    if new_articles_logged:
-        _write_db(db)
+    with _lock:
+        _maybe_compact(today)
+        existing = _load_index(today)
+
+        records = []
+        by_fp = {}
+        for article in articles:
+            record = _record(article, today)
+            if record["fp"] not in existing and record["fp"] not in by_fp:
+                by_fp[record["fp"]] = article
+                records.append(record)
+
+        records = shared_state.claim(today, records)
+        for record in records:
+            existing.add(record["fp"])
+        if records:
+            _append_records(today, records)
+        # Pick up what other replicas claimed meanwhile
+        _load_index(today)
+    return [by_fp[record["fp"]] for record in records]
@@ -0,0 +1,44 @@
+"""
+Background pre-warmer for the category cache.
+
+Re-fetches every category on a jittered schedule so user requests are served
+from the cache (fresh, or stale while it is being revalidated) instead of
+waiting on the scraper. The most requested categories are refreshed first.
+Categories whose pool another replica refreshed recently (shared state) are
+skipped, so N replicas do not multiply the load on the providers.
+"""
+
+import asyncio
+import random
+
+from mcp_news_aggr.config import NEWS_PREWARM_INTERVAL, NEWS_PREWARM_JITTER
+from mcp_news_aggr.fetch_news.fetch_all_news import CACHE_TTL, hot_categories, pool_age, refresh_category
+
+
+async def prewarm_forever(interval: float = NEWS_PREWARM_INTERVAL, jitter: float = NEWS_PREWARM_JITTER):
+    """
+    Refreshes all categories, hottest first, then sleeps ``interval`` ± ``jitter`` seconds.
+
+    Categories are refreshed one after another with a small random gap so the
+    pre-warmer never bursts every provider at once.
+    """
+    while True:
+        for category in hot_categories():
+            age = pool_age(category)
+            if age is not None and age < CACHE_TTL:
+                continue
+            try:
+                articles = await refresh_category(category)
+                print(f"Pre-warmed {category}: {len(articles)} articles in pool.")
+            except Exception as e:
+                print(f"Pre-warming {category} failed: {e}")
+            await asyncio.sleep(random.uniform(0, min(jitter, 5.0)))
+
+        await asyncio.sleep(max(1.0, interval + random.uniform(-jitter, jitter)))
+
+
+def start_prewarmer() -> asyncio.Task | None:
+    """Starts the pre-warmer on the running event loop unless it is disabled."""
+    if NEWS_PREWARM_INTERVAL <= 0:
+        return None
+    return asyncio.create_task(prewarm_forever())
@@ -0,0 +1,104 @@
+"""
+Health scores for news sources.
+
+The fetch engine reports, for every source it ran, how long it took, whether it
+failed or timed out and how many of its articles were fresh. Exponential moving
+averages of those numbers give each source a score; ``order_sources`` puts the
+best sources first and leaves out ones that keep failing, retrying each of them
+once per ``PROBE_INTERVAL`` so a recovered feed comes back on its own.
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+# Weight of the newest observation in the moving averages
+ALPHA = 0.3
+# A source is skipped once it has this many attempts and this error rate...
+MIN_ATTEMPTS_TO_SKIP = 5
+SKIP_ERROR_RATE = 0.8
+# ...except for one probe attempt every this many seconds
+PROBE_INTERVAL = 120.0
+
+
+@dataclass
+class SourceStats:
+    """Moving averages of one source's fetches; the defaults are the prior for new sources."""
+
+    attempts: int = 0
+    latency: float = 1.0
+    error_rate: float = 0.0
+    fresh_yield: float = 1.0
+    last_attempt: float = 0.0
+
+    @property
+    def score(self) -> float:
+        """Higher is better: fresh articles per call, discounted by errors and latency."""
+        return (1.0 - self.error_rate) * (1.0 + self.fresh_yield) / (1.0 + self.latency)
+
+    @property
+    def failing(self) -> bool:
+        return self.attempts >= MIN_ATTEMPTS_TO_SKIP and self.error_rate >= SKIP_ERROR_RATE
+
+
+_stats: dict[str, SourceStats] = {}
+_lock = threading.Lock()
+
+
+def _ewma(old: float, new: float) -> float:
+    return old + ALPHA * (new - old)
+
+
+def record_fetch(name: str, latency: float, failed: bool, fresh: int | None = None):
+    """
+    Records one run of a source.
+
+    :param latency: Seconds until the source finished (the timeout if it did not).
+    :param failed: Whether the source raised or timed out.
+    :param fresh: Articles that passed the caller's freshness check, if it had one.
+    """
+    with _lock:
+        stats = _stats.setdefault(name, SourceStats())
+        stats.attempts += 1
+        stats.last_attempt = time.monotonic()
+        stats.latency = _ewma(stats.latency, latency)
+        stats.error_rate = _ewma(stats.error_rate, 1.0 if failed else 0.0)
+        if fresh is not None:
+            stats.fresh_yield = _ewma(stats.fresh_yield, fresh)
+
+
+def order_sources(sources: list) -> list:
+    """
+    Returns (name, fetch) sources best score first, without failing sources.
+
+    A failing source is kept if it is due for a probe, and the best one is kept
+    if every source is failing, so a fetch always has something to try.
+    """
+    now = time.monotonic()
+    with _lock:
+        stats = {name: _stats.get(name, SourceStats()) for name, _ in sources}
+
+    ranked = sorted(sources, key=lambda source: -stats[source[0]].score)
+    kept = [
+        source
+        for source in ranked
+        if not stats[source[0]].failing or now - stats[source[0]].last_attempt >= PROBE_INTERVAL
+    ]
+    return kept or ranked[:1]
+
+
+def provider_scores() -> dict[str, dict]:
+    """Per-source stats and score, best first, for the health tool."""
+    with _lock:
+        snapshot = {name: SourceStats(**asdict(stats)) for name, stats in _stats.items()}
+    return {
+        name: {
+            "score": round(stats.score, 3),
+            "failing": stats.failing,
+            "attempts": stats.attempts,
+            "latency": round(stats.latency, 3),
+            "error_rate": round(stats.error_rate, 3),
+            "fresh_yield": round(stats.fresh_yield, 2),
+        }
+        for name, stats in sorted(snapshot.items(), key=lambda item: -item[1].score)
+    }
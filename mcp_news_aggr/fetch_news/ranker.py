@@ -0,0 +1,93 @@
+"""
+Chooses which new articles of a pool go into a digest.
+
+Each candidate gets its features computed once: freshness (exponential decay of
+its publication time), novelty against today's already served stories (SimHash
+distance to the nearest one) and its SimHash and source for the pairwise terms.
+Articles are then picked greedily: every round takes the candidate with the best
+score after penalties for repeating a source or an already picked topic, so the
+digest covers the freshest, most different stories instead of whatever the
+scraper returned first.
+"""
+
+import math
+import time
+from typing import NamedTuple
+
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.fingerprint import DuplicateIndex, article_keys, hamming_distance
+
+# Hours after which an article's freshness has halved
+FRESHNESS_HALF_LIFE_HOURS = 6.0
+# Freshness assumed for articles without a readable publication time
+UNKNOWN_FRESHNESS = 0.3
+# SimHash distance from which two stories count as fully unrelated
+NOVEL_DISTANCE = 24
+
+WEIGHT_FRESHNESS = 1.0
+WEIGHT_NOVELTY = 0.6
+PENALTY_SAME_SOURCE = 0.5
+PENALTY_SAME_TOPIC = 0.8
+
+
+class _Features(NamedTuple):
+    article: Article
+    base: float
+    simhash: int
+    source: str
+
+
+def _freshness(timestamp: float | None, now: float) -> float:
+    if timestamp is None:
+        return UNKNOWN_FRESHNESS
+    age_hours = max(0.0, now - timestamp) / 3600
+    return math.exp(-math.log(2) * age_hours / FRESHNESS_HALF_LIFE_HOURS)
+
+
+def _similarity(distance: int | None) -> float:
+    """1.0 for the same story, 0.0 at NOVEL_DISTANCE bits or more (or nothing nearby)."""
+    if distance is None:
+        return 0.0
+    return max(0.0, 1.0 - distance / NOVEL_DISTANCE)
+
+
+def article_features(articles, history: DuplicateIndex | None = None, now: float | None = None):
+    """Precomputes the per-article ranking features."""
+    now = time.time() if now is None else now
+    features = []
+    for article in articles:
+        _, value = article_keys(article)
+        nearest = history.nearest_distance(value) if history is not None else None
+        novelty = 1.0 - _similarity(nearest)
+        base = WEIGHT_FRESHNESS * _freshness(article.timestamp, now) + WEIGHT_NOVELTY * novelty
+        features.append(_Features(article, base, value, article.source))
+    return features
+
+
+def rank_articles(
+    candidates: list[Article],
+    k: int,
+    history: DuplicateIndex | None = None,
+    now: float | None = None,
+) -> list[Article]:
+    """
+    Returns up to k of the candidates, picked greedily for freshness, novelty
+    against history and diversity of sources and topics among the picks.
+    Ties keep the pool order, which follows source priority.
+    """
+    remaining = article_features(candidates, history, now)
+    chosen: list[_Features] = []
+    while remaining and len(chosen) < k:
+        best_index, best_score = 0, -math.inf
+        for index, candidate in enumerate(remaining):
+            score = candidate.base
+            for picked in chosen:
+                if picked.source == candidate.source:
+                    score -= PENALTY_SAME_SOURCE
+                score -= PENALTY_SAME_TOPIC * _similarity(
+                    hamming_distance(picked.simhash, candidate.simhash)
+                )
+            if score > best_score:
+                best_index, best_score = index, score
+        chosen.append(remaining.pop(best_index))
+    return [features.article for features in chosen]
@@ -0,0 +1,149 @@
+"""
+Per-host rate limiting and circuit breaking for news providers.
+
+Every upstream host gets a token bucket shared by all worker threads, so a burst
+of category fetches cannot hammer Google or a feed server. 429 and 5xx answers
+(or unreadable responses) back the host off exponentially; after a few failures
+in a row its circuit opens and callers get ``ProviderUnavailable`` immediately
+instead of waiting on a request that is going to be refused.
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+from mcp_news_aggr.config import (
+    NEWS_HOST_BACKOFF,
+    NEWS_HOST_BACKOFF_MAX,
+    NEWS_HOST_BURST,
+    NEWS_HOST_RATE,
+)
+
+# Consecutive failures after which a host's circuit opens
+FAILURES_TO_OPEN = 3
+# Longest a fetch waits for a token before giving up on the host
+MAX_TOKEN_WAIT = 2.0
+
+
+class ProviderUnavailable(Exception):
+    """
+    Raised when a host is rate limited or its circuit is open.
+
+    ``local`` is set when our own limiter refused before any request was sent,
+    so the error says nothing new about the provider's health.
+    """
+
+    def __init__(self, host: str, retry_after: float, local: bool = False):
+        super().__init__(f"{host} unavailable, retry after {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+        self.local = local
+
+
+def is_throttling_status(status: int | None) -> bool:
+    """True for responses that mean the host wants us to slow down."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+class HostLimiter:
+    """
+    Token bucket plus circuit breaker for a single upstream host.
+    """
+
+    def __init__(self, host: str, rate: float = NEWS_HOST_RATE, burst: float = NEWS_HOST_BURST):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit closes again (0 when it is closed)."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def acquire(self, max_wait: float = MAX_TOKEN_WAIT):
+        """
+        Takes one request token, sleeping briefly if the bucket is empty.
+
+        Raises ProviderUnavailable if the circuit is open or no token frees up
+        within max_wait seconds. Blocks the calling (worker) thread only.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                raise ProviderUnavailable(self.host, self._open_until - now, local=True)
+            self._refill(now)
+            # Reserve the token now; a negative balance is the queue of waiters.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait > max_wait:
+                self._tokens += 1
+                raise ProviderUnavailable(self.host, wait, local=True)
+        if wait:
+            time.sleep(wait)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self, retry_after: float | None = None):
+        """
+        Backs the host off after a throttling or unreadable response.
+
+        The pause doubles with every failure in a row (capped), or follows the
+        server's Retry-After when given; the circuit opens once it is reached.
+        """
+        with self._lock:
+            self._failures += 1
+            backoff = min(NEWS_HOST_BACKOFF * 2 ** (self._failures - 1), NEWS_HOST_BACKOFF_MAX)
+            if retry_after is not None:
+                backoff = max(backoff, retry_after)
+            # Drain the bucket so the next requests are spaced out even before the circuit opens
+            self._tokens = min(self._tokens, 0.0)
+            if self._failures >= FAILURES_TO_OPEN or retry_after is not None:
+                self._open_until = max(self._open_until, time.monotonic() + backoff)
+
+
+_limiters: dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower() or url
+
+
+def limiter_for(url_or_host: str, burst: float | None = None) -> HostLimiter:
+    """
+    Returns the shared limiter of the host serving url_or_host.
+
+    burst raises the host's bucket size above NEWS_HOST_BURST, for callers
+    that fan out several requests at once (GoogleNews result pages).
+    """
+    host = host_of(url_or_host) if "/" in url_or_host else url_or_host.lower()
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter(host)
+    if burst is not None and burst > limiter.burst:
+        with limiter._lock:
+            limiter._tokens += burst - limiter.burst
+            limiter.burst = burst
+    return limiter
+
+
+def degraded_hosts() -> dict[str, float]:
+    """Hosts whose circuit is open, with the seconds until they are retried."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {
+        limiter.host: round(wait, 1)
+        for limiter in limiters
+        if (wait := limiter.retry_after()) > 0
+    }
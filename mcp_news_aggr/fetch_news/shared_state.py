@@ -0,0 +1,128 @@
+"""
+State shared by aggregator replicas: claimed articles and category pools.
+
+A single process keeps everything in memory and on local disk (``LocalState``).
+With several replicas behind the router, NEWS_SHARED_STATE points them at one
+backend so an article is served by at most one of them per day and a pool
+fetched by one replica is reused by the others. ``SQLiteState`` is the local
+stand-in: one SQLite file (WAL mode) on a volume all replicas mount, e.g.
+``NEWS_SHARED_STATE=sqlite:////data/news_state.db``.
+"""
+
+import json
+import sqlite3
+import threading
+
+from mcp_news_aggr.config import NEWS_SHARED_STATE
+
+
+class LocalState:
+    """Single-process backend: every claim wins and nothing is shared."""
+
+    def claim(self, day: str, records: list[dict]) -> list[dict]:
+        """Returns the records whose fingerprint no one claimed yet for day."""
+        return records
+
+    def claims_since(self, day: str, cursor: int) -> tuple[list[dict], int]:
+        """Records claimed for day after cursor, and the new cursor."""
+        return [], cursor
+
+    def pool_timestamp(self, category: str) -> float | None:
+        return None
+
+    def load_pool(self, category: str) -> tuple[float, list[dict]] | None:
+        return None
+
+    def store_pool(self, category: str, ts: float, articles: list[dict]):
+        pass
+
+    def prune_claims(self, before_day: str):
+        pass
+
+
+class SQLiteState(LocalState):
+    """Shared backend on a SQLite file; claims are atomic inserts."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS claims ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT, day TEXT NOT NULL, fp TEXT NOT NULL,"
+            " u TEXT, sh INTEGER, UNIQUE (day, fp))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pools (category TEXT PRIMARY KEY, ts REAL, articles TEXT)"
+        )
+        self._lock = threading.Lock()
+
+    def claim(self, day, records):
+        won = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record in records:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO claims (day, fp, u, sh) VALUES (?, ?, ?, ?)",
+                        # SimHashes are unsigned 64-bit; SQLite integers are signed
+                        (day, record["fp"], record.get("u", ""), record.get("sh", 0) - (1 << 63)),
+                    )
+                    if cursor.rowcount:
+                        won.append(record)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return won
+
+    def claims_since(self, day, cursor):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, fp, u, sh FROM claims WHERE day = ? AND seq > ? ORDER BY seq",
+                (day, cursor),
+            ).fetchall()
+        if not rows:
+            return [], cursor
+        records = [{"fp": fp, "u": u or "", "sh": sh + (1 << 63)} for _, fp, u, sh in rows]
+        return records, rows[-1][0]
+
+    def prune_claims(self, before_day: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM claims WHERE day < ?", (before_day,))
+
+    def pool_timestamp(self, category):
+        with self._lock:
+            row = self._conn.execute("SELECT ts FROM pools WHERE category = ?", (category,)).fetchone()
+        return row[0] if row else None
+
+    def load_pool(self, category):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ts, articles FROM pools WHERE category = ?", (category,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def store_pool(self, category, ts, articles):
+        payload = json.dumps(articles, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pools (category, ts, articles) VALUES (?, ?, ?)"
+                " ON CONFLICT (category) DO UPDATE SET ts = excluded.ts, articles = excluded.articles"
+                " WHERE excluded.ts > pools.ts",
+                (category, ts, payload),
+            )
+
+
+def _create_state(url: str | None) -> LocalState:
+    if not url:
+        return LocalState()
+    if url.startswith("sqlite:///"):
+        return SQLiteState(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported NEWS_SHARED_STATE backend: {url}")
+
+
+shared_state = _create_state(NEWS_SHARED_STATE)
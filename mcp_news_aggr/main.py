@@ -4,10 +4,11 @@
 
 import os
 import json
+import asyncio
 import logging
 
-from mcp_news_aggr.fetch_news.fetch_all_news import fetch_all_news
-from mcp_news_aggr.summarize_news import summarize_all_articles
+from mcp_news_aggr.fetch_news.fetch_all_news import fetch_all_news_async
+from mcp_news_aggr.summarize_news import summarize_articles
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -18,21 +19,16 @@ def clear_json_file():
     with open(JSON_FILE, "w", encoding="utf-8") as f:
         json.dump({}, f)
 
-def main():
+async def run():
 
     #'world', 'europe','US', 'finland','financial','tech','sport', 'asia'
 
-    articles = fetch_all_news('world')
+    articles = await fetch_all_news_async('world')
     if not articles:
         logger.error("No articles fetched.")
         return
 
-    combined_texts = [
-        f"Article {i+1}:\nTitle: {a['title']}\nSummary: {a['summary']}\nSource: {a['source']}\n"
-        for i, a in enumerate(articles)
-    ]
-
-    full_summary = summarize_all_articles(combined_texts)
+    full_summary = await summarize_articles(articles)
 
     clear_json_file()
     with open(JSON_FILE, "w", encoding="utf-8") as f:
@@ -41,5 +37,8 @@ def main():
     print("=== Full Combined Summary ===")
     print(full_summary)
 
+def main():
+    asyncio.run(run())
+
 if __name__ == "__main__":
     main()
@@ -1,12 +1,28 @@
 import os
 import json
+import asyncio
+import contextlib
 import logging
-from mcp.server.fastmcp import FastMCP
+import time
+import uvicorn
+from datetime import datetime, timezone
+from mcp.server.fastmcp import Context, FastMCP
 
-from .fetch_news.fetch_all_news import AVAILABLE_CATEGORIES, fetch_all_news
+from .config import SUMMARY_CACHE_TTL
+from .digest_store import digest_store
+from .fetch_news.date_normalizer import parse_timestamp
+from .fetch_news.fetch_all_news import (
+    AVAILABLE_CATEGORIES,
+    fetch_all_news_async,
+    fetch_news_batch_async,
+)
+from .fetch_news.full_text import extract_full_texts
+from .fetch_news.prewarm import start_prewarmer
+from .fetch_news.provider_health import provider_scores
+from .fetch_news.rate_limiter import degraded_hosts
 
 VALID_CATEGORY_KEYS = {c.lower(): c for c in AVAILABLE_CATEGORIES}
-from .summarize_news import summarize_all_articles
+from .summarize_news import stream_summary, summarize_articles
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -19,34 +35,149 @@ def clear_json_file():
     with open(JSON_FILE, "w", encoding="utf-8") as f:
         json.dump({}, f)
 
+def store_summary(summary_text: str, category: str, article_count: int):
+    clear_json_file()
+    with open(JSON_FILE, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary_text}, f, ensure_ascii=False, indent=2)
+    return digest_store.append(category, summary_text, article_count)
+
+def to_timestamp(value: str | float | None) -> float | None:
+    """Epoch seconds from a number, an ISO / RFC 822 date or a phrase like "2 hours ago"."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    timestamp = parse_timestamp(str(value), datetime.now(timezone.utc))
+    if timestamp is None:
+        raise ValueError(f"Unreadable time: {value!r}")
+    return timestamp
+
+def no_articles_error() -> dict:
+    """Error payload for an empty fetch, naming providers that are backing off."""
+    error = {"error": "No articles fetched."}
+    degraded = degraded_hosts()
+    if degraded:
+        error["degraded_hosts"] = degraded
+        error["retry_after"] = min(degraded.values())
+    return error
+
+def no_new_articles(category: str) -> dict:
+    """
+    Payload for a fetch without new articles. History dedup gives every call a
+    new article set, so instead of an error the category's last digest is
+    served again (marked "reused") while it is younger than SUMMARY_CACHE_TTL.
+    """
+    record = digest_store.latest(category, since=time.time() - SUMMARY_CACHE_TTL)
+    if record is None:
+        return no_articles_error()
+    return {"category": category, "summary": record["summary"], "ts": record["ts"], "reused": True}
+
+def canonical_category(category: str | None) -> str:
+    requested = category or "world"
+    return VALID_CATEGORY_KEYS.get(requested.lower(), "world")
+
+async def aggregate_category(category: str | None) -> dict:
+    """
+    Fetches a category, summarizes it (with full texts when enabled) and
+    archives the digest; without new articles the recent last digest is
+    reused. Shared by every server exposing aggregate_news.
+    """
+    canonical = canonical_category(category)
+
+    articles = await fetch_all_news_async(category=canonical)
+    if not articles:
+        return no_new_articles(canonical)
+
+    full_texts = await extract_full_texts(articles)
+    summary_text = await summarize_articles(articles, full_texts)
+    record = store_summary(summary_text, canonical, len(articles))
+
+    return {"category": canonical, "summary": summary_text, "ts": record["ts"]}
+
 @app.tool()
-def aggregate_news(category: str = "world") -> dict:
+async def aggregate_news(category: str = "world") -> dict:
     """Fetch, summarize, and store news."""
-    requested = category or "world"
-    canonical = VALID_CATEGORY_KEYS.get(requested.lower(), "world")
+    return await aggregate_category(category)
+
+@app.tool()
+async def aggregate_news_stream(ctx: Context, category: str = "world") -> dict:
+    """
+    Fetch, summarize, and store news, streaming the summary while it is written.
+
+    Each piece of summary text is sent as a progress notification (the message
+    carries the new text, progress counts the characters so far). The final
+    result is the same as aggregate_news.
+    """
+    canonical = canonical_category(category)
 
-    articles = fetch_all_news(category=canonical)
+    articles = await fetch_all_news_async(category=canonical)
     if not articles:
-        return {"error": "No articles fetched."}
+        payload = no_new_articles(canonical)
+        if "summary" in payload:
+            await ctx.report_progress(progress=len(payload["summary"]), message=payload["summary"])
+        return payload
 
-    combined_texts = [
-        f"Article {i+1}:\nTitle: {a['title']}\nSummary: {a['summary']}\nSource: {a['source']}\n"
-        for i, a in enumerate(articles)
-    ]
+    full_texts = await extract_full_texts(articles)
+    parts = []
+    written = 0
+    async for delta in stream_summary(articles, full_texts):
+        parts.append(delta)
+        written += len(delta)
+        await ctx.report_progress(progress=written, message=delta)
 
-    summary_text = summarize_all_articles(combined_texts)
+    summary_text = "".join(parts).strip()
+    record = store_summary(summary_text, canonical, len(articles))
 
-    clear_json_file()
-    with open(JSON_FILE, "w", encoding="utf-8") as f:
-        json.dump({"summary": summary_text}, f, ensure_ascii=False, indent=2)
+    return {"category": canonical, "summary": summary_text, "ts": record["ts"]}
+
+@app.tool()
+async def aggregate_news_batch(categories: list[str]) -> dict:
+    """
+    Fetch and summarize news for several categories in one call.
 
-    return {"category": canonical, "summary": summary_text}
+    Categories are fetched concurrently and deduplicated together, so no story
+    appears under two categories. Digests are written in parallel, bounded by
+    SUMMARY_CONCURRENCY. Returns {"digests": {category: {"summary": ...}}}; a
+    category without new articles gets its recent last digest again, or
+    {"error": ...} if there is none.
+    """
+    batch = await fetch_news_batch_async(
+        [canonical_category(c) for c in categories or ["world"]]
+    )
+
+    async def digest(category, articles):
+        if not articles:
+            return no_new_articles(category)
+        full_texts = await extract_full_texts(articles)
+        summary_text = await summarize_articles(articles, full_texts)
+        record = store_summary(summary_text, category, len(articles))
+        return {"summary": summary_text, "ts": record["ts"]}
+
+    results = await asyncio.gather(*(digest(c, a) for c, a in batch.items()))
+    return {"digests": dict(zip(batch.keys(), results))}
 
 @app.tool()
-def get_summary() -> dict:
+def get_summary(category: str | None = None, since: str | None = None) -> dict:
     """
-    Returns the latest summarized news from JSON_FILE.
+    Returns the latest summarized news.
+
+    With a category, the newest archived digest of that category is returned,
+    optionally only if it was written at or after since (epoch seconds, an ISO
+    date or e.g. "30 minutes ago"). Without one, the latest digest of any
+    category is read from JSON_FILE.
     """
+    if category is not None or since is not None:
+        canonical = canonical_category(category)
+        try:
+            record = digest_store.latest(canonical, since=to_timestamp(since))
+        except ValueError as e:
+            return {"error": str(e)}
+        if record is None:
+            return {"category": canonical, "summary": "", "error": "No digest in range."}
+        return {"category": canonical, "summary": record["summary"], "ts": record["ts"]}
+
     if not os.path.exists(JSON_FILE):
         return {"summary": "No summarized news available."}
 
@@ -58,17 +189,93 @@ def get_summary() -> dict:
         logger.exception("Failed to read summarized news JSON")
         return {"summary": f"Error reading news: {e}"}
 
+@app.tool()
+def get_summaries(
+    category: str = "world",
+    since: str | None = None,
+    until: str | None = None,
+    limit: int = 20,
+) -> dict:
+    """
+    Returns archived digests of a category written between since and until
+    (epoch seconds, ISO dates or phrases like "1 day ago"), newest first.
+    """
+    canonical = canonical_category(category)
+    try:
+        records = digest_store.range(
+            canonical, since=to_timestamp(since), until=to_timestamp(until), limit=limit
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+    return {
+        "category": canonical,
+        "digests": [
+            {"ts": r["ts"], "summary": r["summary"], "articles": r.get("articles")}
+            for r in records
+        ],
+    }
+
 @app.tool()
 def health() -> dict:
-    return {"name": "mcp-news-aggregator", "status": "ok"}
+    return {
+        "name": "mcp-news-aggregator",
+        "status": "ok",
+        "providers": provider_scores(),
+        "degraded_hosts": degraded_hosts(),
+    }
+
+async def serve():
+    """Runs the HTTP server together with the background cache pre-warmer."""
+    prewarmer = start_prewarmer()
+    try:
+        await app.run_streamable_http_async()
+    finally:
+        if prewarmer is not None:
+            prewarmer.cancel()
+
+def create_http_app():
+    """
+    Builds the ASGI app of one worker in multi-worker mode.
+
+    Workers share no memory, so sessions are stateless (any worker can answer
+    any request) and the pre-warmer runs inside each worker's lifespan.
+    """
+    if not os.getenv("NEWS_SHARED_STATE"):
+        logger.warning("MCP_WORKERS > 1 without NEWS_SHARED_STATE: workers will not share dedup state")
+    app.settings.stateless_http = True
+    http_app = app.streamable_http_app()
+    session_lifespan = http_app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(starlette_app):
+        prewarmer = start_prewarmer()
+        try:
+            async with session_lifespan(starlette_app):
+                yield
+        finally:
+            if prewarmer is not None:
+                prewarmer.cancel()
+
+    http_app.router.lifespan_context = lifespan
+    return http_app
 
 def main():
     host = os.getenv("MCP_HOST", "0.0.0.0")
     port = int(os.getenv("MCP_PORT", 8000))
-    logger.info(f"Starting MCP News Aggregator on {host}:{port}")
+    workers = int(os.getenv("MCP_WORKERS", 1))
+    logger.info(f"Starting MCP News Aggregator on {host}:{port} with {workers} worker(s)")
+    if workers > 1:
+        uvicorn.run(
+            "mcp_news_aggr.mcp_server:create_http_app",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+        )
+        return
     app.settings.host = host
     app.settings.port = port
-    app.run(transport="streamable-http")
+    asyncio.run(serve())
 
 if __name__ == "__main__":
     main()
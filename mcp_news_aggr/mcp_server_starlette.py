@@ -1,6 +1,4 @@
 from __future__ import annotations
-import os
-import json
 import logging
 import contextlib
 
@@ -10,14 +8,12 @@ from starlette.routing import Mount
 
 from mcp.server.fastmcp import FastMCP
 
-from .fetch_news.fetch_all_news import fetch_all_news
-from .summarize_news import summarize_all_articles
+from .fetch_news.prewarm import start_prewarmer
+from .mcp_server import aggregate_category
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
-JSON_FILE = os.path.join(os.path.dirname(__file__), "summarized_news.json")
-
 # Create an API server and a Chat server
 api_mcp = FastMCP("API Server", stateless_http=True)  # stateless is fine for demo
 chat_mcp = FastMCP("Chat Server", stateless_http=True)
@@ -32,28 +28,10 @@ def api_status() -> str:
     """Get API status."""
     return "API is running"
 
-def clear_json_file():
-    with open(JSON_FILE, "w", encoding="utf-8") as f:
-        json.dump({}, f)
-
 @chat_mcp.tool()
-def aggregate_news() -> dict:
+async def aggregate_news() -> dict:
     """Fetch, summarize, and store news."""
-    articles = fetch_all_news("world")
-    if not articles:
-        return {"error": "No articles fetched."}
-
-    combined_texts = [
-        f"Article {i+1}:\nTitle: {a['title']}\nSummary: {a['summary']}\nSource: {a['source']}\n"
-        for i, a in enumerate(articles)
-    ]
-
-    summary_text = summarize_all_articles(combined_texts)
-
-    clear_json_file()
-    with open(JSON_FILE, "w", encoding="utf-8") as f:
-        json.dump({"summary": summary_text}, f, ensure_ascii=False, indent=2)
-    return {"summary": summary_text}
+    return await aggregate_category("world")
 
 
 # Optional: manage both session managers if running stateful servers
@@ -64,6 +42,9 @@ async def lifespan(app: Starlette):
         # For stateful servers use:
         await stack.enter_async_context(api_mcp.session_manager.run())
         await stack.enter_async_context(chat_mcp.session_manager.run())
+        prewarmer = start_prewarmer()
+        if prewarmer is not None:
+            stack.callback(prewarmer.cancel)
         yield
 
 
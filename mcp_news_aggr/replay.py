@@ -0,0 +1,255 @@
+"""
+Offline replay of the news pipeline from fixtures.
+
+Inside ``replay()`` the GoogleNews scraper, feedparser and the OpenAI summarizer
+are swapped for stand-ins that serve ``fixtures/``: GoogleNews result pages per
+search query (``google/<query>.json``) and raw RSS XML per feed URL
+(``rss/index.json`` maps URLs to files; a null entry is a dead feed). Every
+replayed request sleeps ``delay`` seconds to stand in for the network. History
+is written to a temporary directory, so replaying never touches the real log.
+
+The fixtures shipped in ``fixtures/`` are synthetic: hand-written result pages
+and feeds shaped like the providers' responses, with made-up stories on
+example.com links and syndicated copies across sources. Replace them with
+recordings from the live providers with:
+    python -m mcp_news_aggr.replay record world tech
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+import feedparser
+
+from mcp_news_aggr import summarize_news
+from mcp_news_aggr.fetch_news import (
+    category_fetcher,
+    fetch_all_news,
+    fetch_engine,
+    history_manager,
+    provider_health,
+    rate_limiter,
+)
+from mcp_news_aggr.summary_cache import summary_cache
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+# Fixture used for search queries that have no fixture of their own
+DEFAULT_GOOGLE_FIXTURE = "world_news"
+
+
+def _query_slug(query):
+    return "_".join(query.lower().split())
+
+
+class ReplayFixtures:
+    """Provider responses from the fixture files, loaded lazily and kept in memory."""
+
+    def __init__(self, directory=FIXTURE_DIR, delay=0.02, failing=False):
+        self.directory = directory
+        self.delay = delay
+        self.failing = failing
+        self._google: dict[str, list[list[dict]]] = {}
+        with open(os.path.join(directory, "rss", "index.json"), "r", encoding="utf-8") as f:
+            self.feeds: dict[str, str | None] = json.load(f)
+
+    def _network(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError("replayed provider failure")
+
+    def google_page(self, query, page):
+        """Returns result page ``page`` (0 is the search itself) of a query."""
+        self._network()
+        slug = _query_slug(query or "")
+        if slug not in self._google:
+            path = os.path.join(self.directory, "google", f"{slug}.json")
+            if not os.path.exists(path):
+                path = os.path.join(self.directory, "google", f"{DEFAULT_GOOGLE_FIXTURE}.json")
+            with open(path, "r", encoding="utf-8") as f:
+                self._google[slug] = json.load(f)["pages"]
+        pages = self._google[slug]
+        return list(pages[page]) if page < len(pages) else []
+
+    def parse_feed(self, url, etag=None, modified=None):
+        """feedparser.parse for a fixture feed, answering 304 when the etag matches."""
+        try:
+            self._network()
+        except ConnectionError as e:
+            return feedparser.FeedParserDict(bozo=1, bozo_exception=e, entries=[], headers={})
+
+        name = self.feeds.get(url)
+        if name is None:
+            error = ConnectionError(f"{url} is a dead feed in the fixtures")
+            return feedparser.FeedParserDict(bozo=1, bozo_exception=error, entries=[], headers={})
+
+        with open(os.path.join(self.directory, "rss", name), "rb") as f:
+            body = f.read()
+        recorded_etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        if etag == recorded_etag:
+            return feedparser.FeedParserDict(status=304, bozo=0, entries=[], headers={}, etag=etag)
+
+        feed = feedparser.parse(io.BytesIO(body))
+        feed["status"] = 200
+        feed["etag"] = recorded_etag
+        feed["headers"] = {"etag": recorded_etag}
+        return feed
+
+
+def _replay_googlenews(fixtures):
+    class ReplayGoogleNews:
+        """GoogleNews stand-in: same methods the category fetcher uses."""
+
+        def __init__(self, lang="en", period="1d"):
+            self._query = None
+            self._results = []
+
+        def set_topic(self, topic):
+            pass
+
+        def search(self, query):
+            self._query = query
+            self._results = fixtures.google_page(query, 0)
+
+        def get_page(self, page):
+            self._results = self._results + fixtures.google_page(self._query, page)
+
+        def results(self):
+            return self._results
+
+        def clear(self):
+            self._results = []
+
+    return ReplayGoogleNews
+
+
+class _ReplayFeedparser:
+    def __init__(self, fixtures):
+        self.parse = fixtures.parse_feed
+
+
+def stub_summarizer(delay=0.0):
+    """Returns a summarize_all_articles stand-in that answers without an LLM."""
+
+    async def summarize_all_articles(articles):
+        if delay:
+            await asyncio.sleep(delay)
+        if not articles:
+            return "No articles available to summarize."
+        titles = [text.split("\n")[1].removeprefix("Title: ") for text in articles]
+        return f"Replayed digest of {len(articles)} articles: " + "; ".join(titles)
+
+    return summarize_all_articles
+
+
+def reset_history():
+    """Forgets today's fetched articles so the same fixtures count as new again."""
+    if os.path.isdir(history_manager.HISTORY_DIR):
+        for name in os.listdir(history_manager.HISTORY_DIR):
+            os.remove(os.path.join(history_manager.HISTORY_DIR, name))
+    history_manager._index.clear()
+    history_manager._near_index.clear()
+    history_manager._offsets.clear()
+    history_manager._shared_cursors.clear()
+
+
+def reset_state():
+    """Clears every in-memory cache of the pipeline, as after a process restart."""
+    reset_history()
+    fetch_all_news._category_cache.clear()
+    fetch_all_news._category_hits.clear()
+    category_fetcher._feed_states.clear()
+    provider_health._stats.clear()
+    rate_limiter._limiters.clear()
+    summary_cache.clear()
+
+
+async def settle():
+    """Waits for background collectors and refreshes started by earlier calls."""
+    pending = list(fetch_engine._background_collectors) + list(fetch_all_news._refreshing.values())
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+@contextlib.contextmanager
+def replay(directory=FIXTURE_DIR, delay=0.02, failing=False, summary_delay=0.0):
+    """
+    Runs the news pipeline against the fixtures.
+
+    :param delay: Seconds every replayed provider request takes.
+    :param failing: Make every provider fail, as when all of them are down.
+    :param summary_delay: Seconds the stub summarizer takes per digest.
+    """
+    fixtures = ReplayFixtures(directory, delay, failing)
+    patches = [
+        (category_fetcher, "GoogleNews", _replay_googlenews(fixtures)),
+        (category_fetcher, "feedparser", _ReplayFeedparser(fixtures)),
+        (summarize_news, "summarize_all_articles", stub_summarizer(summary_delay)),
+        (history_manager, "_legacy_imported", True),
+    ]
+    saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    with tempfile.TemporaryDirectory(prefix="news-replay-") as history_dir:
+        saved.append((history_manager, "HISTORY_DIR", history_manager.HISTORY_DIR))
+        history_manager.HISTORY_DIR = history_dir
+        for module, name, value in patches:
+            setattr(module, name, value)
+        reset_state()
+        try:
+            yield fixtures
+        finally:
+            reset_state()
+            for module, name, value in saved:
+                setattr(module, name, value)
+
+
+def record_fixtures(categories, directory=FIXTURE_DIR):
+    """Records GoogleNews pages and RSS feeds of categories from the live providers."""
+    os.makedirs(os.path.join(directory, "google"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "rss"), exist_ok=True)
+    index_path = os.path.join(directory, "rss", "index.json")
+    with open(index_path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+
+    for category in categories:
+        googlenews = category_fetcher._configured_googlenews(category)
+        pages = [googlenews.results()]
+        for page in range(1, category_fetcher.GOOGLE_PAGES + 1):
+            pages.append(category_fetcher._fetch_google_page(googlenews, page))
+        query = getattr(googlenews, "_GoogleNews__key", category).replace("+", " ")
+        with open(os.path.join(directory, "google", f"{_query_slug(query)}.json"), "w", encoding="utf-8") as f:
+            json.dump({"query": query, "pages": pages}, f, ensure_ascii=False, indent=1)
+
+        for url in category_fetcher.feeds_for_category(category):
+            name = f"{category.lower()}_{hashlib.blake2b(url.encode(), digest_size=4).hexdigest()}.xml"
+            try:
+                with urllib.request.urlopen(url, timeout=10) as response:
+                    body = response.read()
+            except OSError as e:
+                print(f"Recording {url} failed, replayed as dead feed: {e}")
+                index[url] = None
+                continue
+            with open(os.path.join(directory, "rss", name), "wb") as f:
+                f.write(body)
+            index[url] = name
+
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "record":
+        print("usage: python -m mcp_news_aggr.replay record CATEGORY [CATEGORY ...]")
+        sys.exit(2)
+    record_fixtures(sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
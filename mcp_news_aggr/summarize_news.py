@@ -1,21 +1,44 @@
-from openai import OpenAI
-from mcp_news_aggr.config import OPENAI_API_KEY
+import asyncio
+import hashlib
 
-# Set OpenAI key
-client = OpenAI(api_key=OPENAI_API_KEY)
+import httpx
+from openai import AsyncOpenAI
+from mcp_news_aggr.article_packing import article_budget, pack_text, strip_markup
+from mcp_news_aggr.config import OPENAI_API_KEY, SUMMARY_CONCURRENCY
+from mcp_news_aggr.summary_cache import summary_cache, summary_cache_key
+
+# One client (and HTTP connection pool) per process, created on first use
+_client: AsyncOpenAI | None = None
+# Caps how many completions run at the same time across all callers
+_limiter = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+
+def get_client() -> AsyncOpenAI:
+    """Returns the shared AsyncOpenAI client, keeping connections alive between calls."""
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=SUMMARY_CONCURRENCY * 2,
+                max_keepalive_connections=SUMMARY_CONCURRENCY,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        _client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+    return _client
+
+# Bump whenever the prompt below changes so cached digests are not reused
+PROMPT_VERSION = 2
 
 """def get_prompt() -> str:
     with open("mcp_news_aggr.prompt.txt", "r") as input_file:
         text = input_file.read()
     return text"""
 
-def summarize_all_articles(articles):
+def build_prompt(articles):
     """
-    Create a long, full-text summary of all articles combined.
+    Builds the digest prompt for the formatted article texts.
     """
-    if not articles:
-        return "No articles available to summarize."
-
     combined_text = "\n\n---\n\n".join(articles)
 
 
@@ -42,13 +65,103 @@ def summarize_all_articles(articles):
         f"Articles:\n{combined_text}\n\n"
         "Now write the full summary following all above mentioned rules."
     )
+    return prompt
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.5,
-        max_completion_tokens=2000
-    )
+
+async def summarize_all_articles(articles):
+    """
+    Create a long, full-text summary of all articles combined.
+    """
+    if not articles:
+        return "No articles available to summarize."
+
+    prompt = build_prompt(articles)
+
+    async with _limiter:
+        response = await get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.5,
+            max_completion_tokens=2000
+        )
 
     summary = response.choices[0].message.content.strip()
     return summary
+
+
+def format_articles(articles, full_texts=None):
+    """
+    Turns articles into the per-article text blocks fed to the summarizer, with
+    markup stripped and each summary packed into its share of the token budget.
+    An article's extracted page text from full_texts ({url: text}) replaces
+    its provider snippet.
+    """
+    full_texts = full_texts or {}
+    budget = article_budget(len(articles))
+    blocks = []
+    for i, a in enumerate(articles):
+        title = strip_markup(a.title)
+        summary = pack_text(title, full_texts.get(a.url) or a.summary, budget)
+        blocks.append(f"Article {i+1}:\nTitle: {title}\nSummary: {summary}\nSource: {a.source}\n")
+    return blocks
+
+
+def _cache_key(articles, full_texts):
+    # A digest written from full page texts is only served for the same texts
+    if not full_texts:
+        return summary_cache_key(articles, PROMPT_VERSION)
+    h = hashlib.sha256()
+    for url, text in sorted(full_texts.items()):
+        h.update(f"{url}\n{text}\x1f".encode("utf-8"))
+    return summary_cache_key(articles, f"{PROMPT_VERSION}:full:{h.hexdigest()}")
+
+
+async def summarize_articles(articles, full_texts=None):
+    """
+    Summarizes articles, reusing the cached digest if this exact set
+    of articles was already summarized with the current prompt.
+    """
+    key = _cache_key(articles, full_texts)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    summary = await summarize_all_articles(format_articles(articles, full_texts))
+    summary_cache.put(key, summary)
+    return summary
+
+
+async def stream_summary(articles, full_texts=None):
+    """
+    Yields the digest of articles piece by piece as the model produces it.
+
+    A cached digest is yielded in one piece; a freshly streamed one is cached
+    once complete.
+    """
+    key = _cache_key(articles, full_texts)
+    cached = summary_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    prompt = build_prompt(format_articles(articles, full_texts))
+    parts = []
+    async with _limiter:
+        stream = await get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.5,
+            max_completion_tokens=2000,
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+    summary = "".join(parts).strip()
+    if summary:
+        summary_cache.put(key, summary)
@@ -0,0 +1,119 @@
+"""
+Cache of generated digests keyed by the exact article set that was summarized.
+
+The key is a hash of the ordered article fingerprints plus the summarizer prompt
+version, so a prompt change never serves an old digest. Entries live in an
+in-memory LRU with a TTL and, when SUMMARY_CACHE_DIR is set, in a JSON file per
+key on disk that survives restarts and is shared by processes on the same host.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from mcp_news_aggr.config import SUMMARY_CACHE_DIR, SUMMARY_CACHE_SIZE, SUMMARY_CACHE_TTL
+from mcp_news_aggr.fetch_news.history_manager import article_fingerprint
+
+
+def summary_cache_key(articles, prompt_version) -> str:
+    """Hash of the ordered article fingerprints and the prompt version."""
+    h = hashlib.sha256(f"prompt:{prompt_version}".encode("utf-8"))
+    for article in articles:
+        h.update(b"\n")
+        h.update(article_fingerprint(article).encode("ascii"))
+    return h.hexdigest()
+
+
+class SummaryCache:
+    """LRU + TTL summary cache with an optional on-disk tier."""
+
+    def __init__(self, max_entries=SUMMARY_CACHE_SIZE, ttl=SUMMARY_CACHE_TTL, directory=SUMMARY_CACHE_DIR):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory or None
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read_disk(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return float(data["ts"]), data["summary"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key, ts, summary):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ts": ts, "summary": summary}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+    def _prune_disk(self):
+        """Deletes on-disk entries older than the TTL."""
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".json") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def _remember(self, key, ts, summary):
+        self._entries[key] = (ts, summary)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """Returns the cached summary for key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        if self.directory is None:
+            return None
+        entry = self._read_disk(key)
+        if entry is None or now - entry[0] >= self.ttl:
+            return None
+        with self._lock:
+            self._remember(key, *entry)
+        return entry[1]
+
+    def put(self, key, summary):
+        ts = time.time()
+        with self._lock:
+            self._remember(key, ts, summary)
+            self._puts += 1
+            prune = self._puts % 50 == 0
+        if self.directory is not None:
+            try:
+                self._write_disk(key, ts, summary)
+            except OSError as e:
+                print(f"Could not persist summary cache entry: {e}")
+            if prune:
+                self._prune_disk()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+summary_cache = SummaryCache()
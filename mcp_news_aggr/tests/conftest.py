@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import pytest
+
+from mcp_news_aggr.fetch_news import history_manager
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """history_manager on an empty log in tmp_path, as in a fresh process."""
+    monkeypatch.setattr(history_manager, "HISTORY_DIR", str(tmp_path / "history"))
+    monkeypatch.setattr(history_manager, "DB_FILE", str(tmp_path / "legacy.json"))
+    monkeypatch.setattr(history_manager, "_legacy_imported", False)
+    monkeypatch.setattr(history_manager, "_last_compacted_day", None)
+    for name in ("_index", "_near_index", "_offsets", "_shared_cursors"):
+        monkeypatch.setattr(history_manager, name, {})
+    return history_manager
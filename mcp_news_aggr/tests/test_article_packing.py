@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from mcp_news_aggr import article_packing
+from mcp_news_aggr.article_packing import article_budget, count_tokens, pack_text, strip_markup
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.summarize_news import format_articles
+
+LONG_SENTENCE = " ".join(f"word{i}" for i in range(200)) + "."
+
+
+def _story(n):
+    return " ".join(
+        f"Minister Virtanen said on Monday {n + i} projects in Helsinki would get 40 million euros."
+        for i in range(12)
+    )
+
+
+def test_empty_input():
+    assert strip_markup(None) == ""
+    assert pack_text("Title", "", 50) == ""
+    assert pack_text("Title", "<p> </p>", 50) == ""
+    assert format_articles([]) == []
+    assert article_budget(0) == article_packing.SUMMARY_ARTICLE_TOKENS
+
+
+def test_text_within_budget_is_only_stripped():
+    text = "<p>Markets rose &amp; bonds fell.</p>  Oil was flat."
+
+    assert pack_text("Markets", text, 50) == "Markets rose & bonds fell. Oil was flat."
+
+
+def test_packed_text_never_exceeds_budget():
+    text = _story(0) + " " + LONG_SENTENCE
+    for budget in (5, 16, 40, 100, 160):
+        packed = pack_text("Helsinki projects", text, budget)
+        assert packed
+        assert count_tokens(packed) <= budget
+
+
+def test_sentences_keep_their_order():
+    text = "First thing happened. Second thing followed. Third thing ended it all."
+
+    packed = pack_text("Things", text, count_tokens(text) - 1)
+
+    sentences = packed.split(". ")
+    assert sentences == sorted(sentences, key=text.index)
+
+
+def test_overlong_first_sentence_is_cut_at_a_word():
+    packed = pack_text("Words", LONG_SENTENCE, 20)
+
+    assert packed.endswith(" …")
+    kept = packed[: -len(" …")].split()
+    assert kept == LONG_SENTENCE.split()[: len(kept)]
+    assert count_tokens(packed) <= 20
+
+
+def test_budget_is_shared_between_articles(monkeypatch):
+    monkeypatch.setattr(article_packing, "SUMMARY_ARTICLE_TOKENS", 160)
+    monkeypatch.setattr(article_packing, "SUMMARY_INPUT_TOKENS", 300)
+
+    assert article_budget(1) == 160
+    assert article_budget(3) == 100
+    # Never starved below a usable minimum
+    assert article_budget(100) == 16
+
+
+def test_every_article_fits_its_share_of_the_input_budget(monkeypatch):
+    monkeypatch.setattr(article_packing, "SUMMARY_INPUT_TOKENS", 120)
+    articles = [
+        Article(f"Story {n}", _story(n), "2026-01-01", f"https://example.com/{n}", "Example")
+        for n in range(3)
+    ]
+    # The last article is the one that used to be cut mid-sentence
+    articles[-1].summary = LONG_SENTENCE
+
+    blocks = format_articles(articles)
+
+    summaries = [block.split("\nSummary: ")[1].split("\nSource: ")[0] for block in blocks]
+    assert len(summaries) == 3
+    assert all(0 < count_tokens(s) <= 40 for s in summaries)
+    assert sum(count_tokens(s) for s in summaries) <= 120
+    assert summaries[-1].endswith(" …")
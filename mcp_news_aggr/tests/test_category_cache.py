@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import tracemalloc
+
+from mcp_news_aggr.fetch_news import fingerprint
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.category_cache import CategoryCache
+from mcp_news_aggr.fetch_news.shared_state import LocalState
+
+
+def _pool(category, size):
+    return [
+        Article(f"{category} story {i}", "A summary long enough to matter. " * 4, "2026-01-01", f"https://example.com/{category}/{i}", "Example")
+        for i in range(size)
+    ]
+
+
+def test_pools_over_the_byte_budget_evict_least_recently_used():
+    pool_bytes = sum(article.size() for article in _pool("world", 10))
+    cache = CategoryCache(max_bytes=int(pool_bytes * 2.5), pool_limit=100, shared=LocalState())
+    cache.put("world", _pool("world", 10))
+    cache.put("tech", _pool("tech", 10))
+    assert cache.get("world") is not None
+
+    cache.put("sport", _pool("sport", 10))
+
+    assert "tech" not in cache
+    assert "world" in cache and "sport" in cache
+    assert cache.bytes <= cache.max_bytes
+
+
+def test_newest_pool_is_kept_even_over_budget():
+    cache = CategoryCache(max_bytes=1, pool_limit=100, shared=LocalState())
+    cache.put("world", _pool("world", 3))
+    cache.put("tech", _pool("tech", 3))
+
+    assert len(cache) == 1
+    assert len(cache.get("tech")[1]) == 3
+
+
+def test_pools_are_trimmed_to_the_limit():
+    cache = CategoryCache(pool_limit=5, shared=LocalState())
+    cache.put("world", _pool("world", 20))
+
+    assert [a.title for a in cache.get("world")[1]] == [f"world story {i}" for i in range(5)]
+
+
+def test_token_hash_memo_stays_within_its_budget():
+    fingerprint._spread_hash.cache_clear()
+    entries = fingerprint._spread_hash.cache_info().maxsize
+    tracemalloc.start()
+    try:
+        for i in range(2 * entries):
+            fingerprint._spread_hash(f"token{i} bigram{i}")
+        held, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        fingerprint._spread_hash.cache_clear()
+
+    assert held <= fingerprint.SPREAD_CACHE_BYTES
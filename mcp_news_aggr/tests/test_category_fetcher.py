@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import time
+
+import feedparser
+import pytest
+
+from mcp_news_aggr.fetch_news import category_fetcher, rate_limiter
+from mcp_news_aggr.fetch_news.rate_limiter import ProviderUnavailable
+
+
+class _FakeGoogleNews:
+    def __init__(self, results):
+        self._results = results
+
+    def results(self):
+        return self._results
+
+
+def _item(title):
+    return {"title": title, "desc": "", "date": "", "link": f"https://example.com/{title}", "media": "Example"}
+
+
+def test_refused_page_is_skipped(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(category_fetcher, "_configured_googlenews", lambda category, lang: _FakeGoogleNews([_item("first")]))
+
+    def fetch_page(googlenews, page):
+        if page == 2:
+            raise ProviderUnavailable(category_fetcher.GOOGLE_HOST, 1.0, local=True)
+        return [_item(f"page{page}")]
+
+    monkeypatch.setattr(category_fetcher, "_fetch_google_page", fetch_page)
+
+    titles = {article.title for article in category_fetcher.google_iter_category_news("world", pages=3)}
+
+    assert titles == {"first", "page1", "page3"}
+
+
+def test_empty_first_search_is_not_a_failure(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(category_fetcher, "_configured_googlenews", lambda category, lang: _FakeGoogleNews([]))
+
+    assert list(category_fetcher.google_iter_category_news("world")) == []
+    assert rate_limiter.limiter_for(category_fetcher.GOOGLE_HOST)._failures == 0
+
+
+FEED_URL = "https://feeds.example.com/world.xml"
+
+
+def _entry(n):
+    return feedparser.FeedParserDict(
+        id=f"entry-{n}",
+        title=f"Story {n}",
+        summary=f"Summary of story {n}",
+        link=f"https://example.com/{n}",
+        published="Sat, 17 Oct 2026 09:00:00 +0000",
+        published_parsed=time.gmtime(1792227600),
+    )
+
+
+class _StubFeedparser:
+    """feedparser stand-in answering with the queued responses and recording requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def parse(self, url, etag=None, modified=None):
+        self.requests.append((url, etag, modified))
+        return feedparser.FeedParserDict(self.responses.pop(0))
+
+
+@pytest.fixture
+def feeds(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(category_fetcher, "_feed_states", {})
+
+    def install(*responses):
+        stub = _StubFeedparser(*responses)
+        monkeypatch.setattr(category_fetcher, "feedparser", stub)
+        return stub
+
+    return install
+
+
+def test_unchanged_feed_answers_304_with_previous_articles(feeds):
+    stub = feeds(
+        {"status": 200, "etag": '"v1"', "modified": "Sat, 17 Oct 2026 09:00:00 GMT", "entries": [_entry(1), _entry(2)]},
+        {"status": 304, "entries": []},
+    )
+
+    first = category_fetcher.feedparser_fetch_feed(FEED_URL)
+    second = category_fetcher.feedparser_fetch_feed(FEED_URL)
+
+    assert [a.title for a in first] == ["Story 1", "Story 2"]
+    assert second == first
+    assert stub.requests[1] == (FEED_URL, '"v1"', "Sat, 17 Oct 2026 09:00:00 GMT")
+
+
+def test_only_new_entries_are_converted(feeds):
+    feeds(
+        {"status": 200, "etag": '"v1"', "entries": [_entry(1), _entry(2)]},
+        {"status": 200, "etag": '"v2"', "entries": [_entry(3), _entry(1)]},
+    )
+
+    first = category_fetcher.feedparser_fetch_feed(FEED_URL)
+    second = category_fetcher.feedparser_fetch_feed(FEED_URL)
+
+    assert [a.title for a in second] == ["Story 3", "Story 1"]
+    assert second[1] is first[0]
+    assert category_fetcher._feed_states[FEED_URL].etag == '"v2"'
+
+
+def test_bozo_feed_backs_off_and_keeps_previous_articles(feeds):
+    feeds(
+        {"status": 200, "entries": [_entry(1)]},
+        {"bozo": 1, "bozo_exception": ConnectionError("unreachable"), "entries": []},
+    )
+
+    first = category_fetcher.feedparser_fetch_feed(FEED_URL)
+    assert category_fetcher.feedparser_fetch_feed(FEED_URL) == first
+    assert rate_limiter.limiter_for(FEED_URL)._failures == 1
+
+
+def test_throttled_feed_without_articles_is_unavailable(feeds):
+    feeds({"status": 429, "headers": {"retry-after": "120"}, "entries": []})
+
+    with pytest.raises(ProviderUnavailable) as unavailable:
+        category_fetcher.feedparser_fetch_feed(FEED_URL)
+
+    assert not unavailable.value.local
+    assert unavailable.value.retry_after > 100
+    assert "feeds.example.com" in rate_limiter.degraded_hosts()
+
+
+class _PagedGoogleNews(_FakeGoogleNews):
+    """GoogleNews stand-in whose copies load one result per page."""
+
+    def clear(self):
+        self._results = []
+
+    def get_page(self, page):
+        self._results = [_item(f"page{page}")]
+
+
+def test_a_whole_category_fetch_fits_the_google_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(category_fetcher, "_configured_googlenews", lambda category, lang: _PagedGoogleNews([_item("first")]))
+
+    started = time.monotonic()
+    titles = {article.title for article in category_fetcher.google_iter_category_news("world")}
+
+    assert len(titles) == 1 + category_fetcher.GOOGLE_PAGES
+    assert time.monotonic() - started < 1.0
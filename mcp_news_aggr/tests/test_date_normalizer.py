@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from mcp_news_aggr.fetch_news.date_normalizer import day_string, normalize_dates, parse_timestamp
+
+NOW = datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def test_relative_dates():
+    assert parse_timestamp("35 minutes ago", NOW) == NOW.timestamp() - 35 * 60
+    assert parse_timestamp("an hour ago", NOW) == NOW.timestamp() - 3600
+    assert parse_timestamp("Yesterday", NOW) == NOW.timestamp() - 86400
+
+
+def test_absolute_dates_are_utc():
+    expected = datetime(2025, 11, 29, tzinfo=timezone.utc).timestamp()
+
+    assert parse_timestamp("Nov 29, 2025", NOW) == expected
+    assert parse_timestamp("Sat, 29 Nov 2025 00:00:00 +0000", NOW) == expected
+    assert parse_timestamp("2025-11-29T00:00:00Z", NOW) == expected
+
+
+def test_yearless_date_in_the_future_is_last_year():
+    assert parse_timestamp("Dec 30", NOW) == datetime(2025, 12, 30, tzinfo=timezone.utc).timestamp()
+    assert parse_timestamp("Jan 1", NOW) == datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def test_unreadable_dates_are_none():
+    assert normalize_dates(["", "sometime", "1 hour ago"], NOW) == [None, None, NOW.timestamp() - 3600]
+
+
+def test_day_string_falls_back_to_now():
+    assert day_string(None, datetime(2026, 3, 4)) == "2026-03-04"
+    assert day_string(datetime(2026, 3, 4, 12).timestamp()) == "2026-03-04"
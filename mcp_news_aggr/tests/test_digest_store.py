@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from mcp_news_aggr.digest_store import DigestStore
+
+
+def test_range_is_newest_first_and_bounded(tmp_path):
+    store = DigestStore(str(tmp_path))
+    for ts in (100.0, 300.0, 200.0):
+        store.append("world", f"digest {ts:.0f}", article_count=5, ts=ts)
+    store.append("tech", "other category", ts=250.0)
+
+    assert [r["ts"] for r in store.range("world")] == [300.0, 200.0, 100.0]
+    assert [r["summary"] for r in store.range("world", since=150, until=300)] == ["digest 300", "digest 200"]
+    assert [r["ts"] for r in store.range("world", limit=1)] == [300.0]
+    assert store.range("world", since=400) == []
+    assert store.range("sport") == []
+    assert store.latest("world")["articles"] == 5
+
+
+def test_sees_records_of_other_writers(tmp_path):
+    reader = DigestStore(str(tmp_path))
+    assert reader.latest("world") is None
+
+    DigestStore(str(tmp_path)).append("world", "from another process", ts=10.0)
+    with open(tmp_path / "world.jsonl", "a") as f:
+        f.write('{"ts": 20.0, "summ')
+
+    assert reader.latest("world")["summary"] == "from another process"
+    assert reader.latest("world", since=15) is None
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcp_news_aggr.fetch_news import fetch_all_news, history_manager, provider_health
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.category_cache import CategoryCache
+from mcp_news_aggr.fetch_news.fingerprint import collapse_near_duplicates
+from mcp_news_aggr.fetch_news.ranker import rank_articles
+from mcp_news_aggr.fetch_news.shared_state import LocalState, SQLiteState
+
+STORIES = [
+    ("Parliament passes the new climate bill", "Lawmakers approved the climate bill late on Tuesday after a long debate over emission targets and subsidies."),
+    ("Storm floods coastal towns in the north", "Heavy rain and a storm surge flooded several coastal towns overnight, forcing hundreds of residents to leave."),
+    ("Chipmaker reports record quarterly profit", "The chipmaker said demand from data centres pushed its quarterly profit to a record, beating analyst forecasts."),
+    ("Museum returns looted bronzes to Nigeria", "A European museum handed back a collection of looted bronzes in a ceremony attended by officials from Nigeria."),
+]
+
+
+def _story(n, publisher, host):
+    title, summary = STORIES[n]
+    return Article(f"{title} - {publisher}", summary, "2026-01-01", f"https://{host}/news/{n}", publisher, time.time())
+
+
+@pytest.fixture
+def cold_cache(history, monkeypatch):
+    monkeypatch.setattr(fetch_all_news, "_category_cache", CategoryCache(shared=LocalState()))
+    monkeypatch.setattr(provider_health, "_stats", {})
+
+
+def test_syndicated_copies_count_once_towards_early_return(cold_cache, monkeypatch):
+    def syndicated():
+        return [_story(0, publisher, f"{publisher.lower()}.example.com") for publisher in ("Reuters", "AP", "AFP")]
+
+    def slower_feed():
+        time.sleep(0.05)
+        return [_story(n, "BBC", "bbc.example.com") for n in (1, 2, 3)]
+
+    monkeypatch.setattr(
+        fetch_all_news, "category_sources", lambda category: [("google", syndicated), ("feed", slower_feed)]
+    )
+    is_new = fetch_all_news._new_article_filter()
+
+    pool = asyncio.run(fetch_all_news._article_pool("world", is_new))
+
+    assert len(collapse_near_duplicates(pool)) >= fetch_all_news.ARTICLES_PER_FETCH
+    assert len(fetch_all_news._pick_new(pool, is_new)) == fetch_all_news.ARTICLES_PER_FETCH
+
+
+WORDS = (
+    "amber basin cedar delta ember fjord glacier harbor island jungle kettle lagoon meadow nectar orchard "
+    "prairie quarry ravine summit tundra upland valley willow yarrow zephyr anchor beacon canyon dune estuary "
+    "falcon grove heron inlet juniper kestrel lantern marble nomad oasis pebble quartz reef sierra thicket "
+    "umber vortex wharf yonder zenith atlas bramble cobalt drizzle echo fable garnet hollow ivory jasper "
+    "kelp lichen mosaic nimbus opal plume quill rustle saffron timber ultra velvet wisp xenon yodel zinnia "
+    "arbor bluff crest dell fen gully heath isle knoll ledge moor notch outcrop peak ridge slope tor vale"
+).split()
+
+
+def _distinct_story(n, source, age_hours):
+    words = WORDS[n * 7:(n + 1) * 7]
+    title = " ".join(words[:4]).capitalize()
+    summary = f"Reports on {' '.join(words)} spread quickly as {words[0]} and {words[-1]} made the news."
+    return Article(title, summary, "2026-01-01", f"https://{source}.example.com/{n}", source, time.time() - age_hours * 3600)
+
+
+def test_cold_fetch_ranks_more_candidates_than_it_returns(cold_cache, monkeypatch):
+    def stale_first():
+        return [_distinct_story(n, "stale", 30) for n in range(3)]
+
+    def fresh_later():
+        time.sleep(0.05)
+        return [_distinct_story(n, f"fresh{n}", 0.5) for n in range(3, 13)]
+
+    monkeypatch.setattr(
+        fetch_all_news, "category_sources", lambda category: [("google", stale_first), ("feed", fresh_later)]
+    )
+
+    articles = asyncio.run(fetch_all_news.fetch_all_news_async("world"))
+
+    assert len(articles) == fetch_all_news.ARTICLES_PER_FETCH
+    assert all(article.source.startswith("fresh") for article in articles)
+
+
+@pytest.fixture
+def two_workers(cold_cache, tmp_path, monkeypatch):
+    """This process and another replica claiming articles in one SQLite state."""
+    path = str(tmp_path / "state.db")
+    monkeypatch.setattr(history_manager, "shared_state", SQLiteState(path))
+    return SQLiteState(path)
+
+
+def test_pick_new_reranks_when_another_worker_claims_first(two_workers, monkeypatch):
+    pool = [_distinct_story(n, f"source{n}", n + 1) for n in range(6)]
+    rankings = []
+
+    def rank_then_lose_race(candidates, count, history):
+        ranked = rank_articles(candidates, count, history)
+        if not rankings:
+            # The other replica claims our top pick between ranking and claiming
+            two_workers.claim(history_manager._get_today_str(), [history_manager._record(ranked[0], "")])
+        rankings.append(ranked)
+        return ranked
+
+    monkeypatch.setattr(fetch_all_news, "rank_articles", rank_then_lose_race)
+    is_new = fetch_all_news._new_article_filter()
+
+    picked = fetch_all_news._pick_new(pool, is_new)
+
+    lost = rankings[0][0]
+    assert len(rankings) == 2
+    assert len(picked) == fetch_all_news.ARTICLES_PER_FETCH
+    assert lost not in picked
+    assert lost not in rankings[1]
+    assert rankings[0][1:] == picked[:2]
+    claimed, _ = two_workers.claims_since(history_manager._get_today_str(), 1)
+    assert {r["fp"] for r in claimed} == {history_manager.article_fingerprint(a) for a in picked}
+
+
+def test_pick_new_gives_up_after_claim_attempts(two_workers, monkeypatch):
+    pool = [_distinct_story(n, f"source{n}", n + 1) for n in range(12)]
+    calls = []
+
+    def everything_taken(candidates, count, history):
+        calls.append(count)
+        ranked = rank_articles(candidates, count, history)
+        two_workers.claim(history_manager._get_today_str(), [history_manager._record(a, "") for a in ranked])
+        return ranked
+
+    monkeypatch.setattr(fetch_all_news, "rank_articles", everything_taken)
+
+    assert fetch_all_news._pick_new(pool, fetch_all_news._new_article_filter()) == []
+    assert calls == [fetch_all_news.ARTICLES_PER_FETCH] * fetch_all_news.CLAIM_ATTEMPTS
+
+
+def test_claims_run_off_the_event_loop(cold_cache, monkeypatch):
+    monkeypatch.setattr(
+        fetch_all_news, "category_sources",
+        lambda category: [("google", lambda: [_distinct_story(n, f"source{n}", 1) for n in range(4)])],
+    )
+    threads = []
+
+    def log(articles):
+        threads.append(threading.current_thread())
+        return history_manager.log_fetched_articles(articles)
+
+    monkeypatch.setattr(fetch_all_news, "log_fetched_articles", log)
+
+    articles = asyncio.run(fetch_all_news.fetch_all_news_async("world"))
+
+    assert len(articles) == fetch_all_news.ARTICLES_PER_FETCH
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp_news_aggr.fetch_news import fetch_engine, provider_health
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.rate_limiter import ProviderUnavailable
+
+
+def _article(title):
+    return Article(title, "summary", "2025-01-01", f"https://example.com/{title}", "Example", 0.0)
+
+
+def _feed():
+    return [_article("a"), _article("b")]
+
+
+def _self_throttled():
+    raise ProviderUnavailable("www.google.com", 3.0, local=True)
+
+
+def _throttled_by_provider():
+    raise ProviderUnavailable("www.google.com", 30.0)
+
+
+def test_self_throttling_does_not_demote_source(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    sources = [("google", _self_throttled), ("feed", _feed)]
+
+    for _ in range(provider_health.MIN_ATTEMPTS_TO_SKIP + 1):
+        outcome = asyncio.run(fetch_engine.fetch_from_sources(sources, timeout=2.0))
+        assert "google" in outcome.errors
+        assert len(outcome.articles) == 2
+
+    assert "google" not in provider_health.provider_scores()
+    assert "google" in [name for name, _ in provider_health.order_sources(sources)]
+
+
+def test_provider_errors_are_recorded(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    sources = [("google", _throttled_by_provider), ("feed", _feed)]
+
+    for _ in range(provider_health.MIN_ATTEMPTS_TO_SKIP):
+        asyncio.run(fetch_engine.fetch_from_sources(sources, timeout=2.0))
+
+    scores = provider_health.provider_scores()
+    assert scores["google"]["failing"]
+    assert not scores["feed"]["failing"]
+    assert [name for name, _ in provider_health.order_sources(sources)] == ["feed"]
+
+
+def _sleeping(seconds, title):
+    def fetch():
+        time.sleep(seconds)
+        return [_article(title)]
+    return fetch
+
+
+def test_timeout_starts_when_a_worker_picks_the_source_up(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    monkeypatch.setattr(fetch_engine, "_executor", ThreadPoolExecutor(max_workers=1))
+    sources = [("first", _sleeping(0.4, "a")), ("queued", _sleeping(0.3, "b"))]
+
+    outcome = asyncio.run(fetch_engine.fetch_from_sources(sources, timeout=0.5))
+
+    assert outcome.complete
+    assert outcome.errors == {}
+    assert len(outcome.articles) == 2
+
+
+def test_source_without_a_worker_is_dropped_without_blame(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    monkeypatch.setattr(fetch_engine, "_executor", ThreadPoolExecutor(max_workers=1))
+    ran = []
+
+    def queued():
+        ran.append(True)
+        return [_article("b")]
+
+    sources = [("blocker", _sleeping(0.5, "a")), ("queued", queued)]
+    outcome = asyncio.run(fetch_engine.fetch_from_sources(sources, timeout=0.2))
+    time.sleep(0.5)
+
+    assert not outcome.complete
+    assert set(outcome.errors) == {"blocker", "queued"}
+    assert ran == []
+    assert list(provider_health.provider_scores()) == ["blocker"]
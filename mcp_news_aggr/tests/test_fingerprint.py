@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.fingerprint import (
+    DuplicateIndex,
+    canonicalize_url,
+    collapse_near_duplicates,
+    hamming_distance,
+    normalize_text,
+    simhash,
+)
+
+STORY = (
+    "Central bank raises interest rates again",
+    "The central bank raised its key interest rate by a quarter point on Tuesday, "
+    "citing persistent inflation in services and a tight labour market across the region.",
+)
+
+
+def test_canonicalize_url_drops_tracking_and_www():
+    url = "https://www.example.com/news/story/?utm_source=rss&id=7&fbclid=abc#comments"
+
+    assert canonicalize_url(url) == "example.com/news/story?id=7"
+    assert canonicalize_url("https://example.com/news/story&ved=1&usg=2") == "example.com/news/story"
+    assert canonicalize_url("") == ""
+
+
+def test_normalize_text_strips_markup_and_publisher():
+    tokens = normalize_text("Markets rally - Reuters", "<b>Stocks</b> &amp; bonds rose")
+
+    assert tokens == ["markets", "rally", "stocks", "bonds", "rose"]
+
+
+def test_simhash_is_close_for_edited_copies():
+    original = simhash(normalize_text(*STORY))
+    edited = simhash(normalize_text(STORY[0] + " - BBC News", STORY[1].replace("Tuesday", "Tuesday morning")))
+    unrelated = simhash(normalize_text("Local team wins cup final", "Fans celebrated late into the night."))
+
+    assert simhash([]) == 0
+    assert hamming_distance(original, edited) < hamming_distance(original, unrelated)
+
+
+def test_duplicate_index_matches_url_and_near_hash():
+    value = simhash(normalize_text(*STORY))
+    index = DuplicateIndex()
+    index.add("example.com/a", value)
+
+    assert index.is_duplicate("example.com/a", 0)
+    assert index.is_duplicate("other.com/b", value ^ 0b101)
+    assert not index.is_duplicate("other.com/b", value ^ 0xFFFF)
+    assert index.nearest_distance(value ^ 0b1) == 1
+    assert index.nearest_distance(0) is None
+
+
+def test_collapse_keeps_first_copy():
+    first = Article(STORY[0] + " - Reuters", STORY[1], url="https://reuters.com/a?utm_medium=rss")
+    same_link = Article("Different headline", "Different text entirely here", url="https://www.reuters.com/a")
+    other = Article("Local team wins cup final", "Fans celebrated late into the night.", url="https://bbc.co.uk/b")
+
+    assert collapse_near_duplicates([first, same_link, other]) == [first, other]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import httpx
+
+from mcp_news_aggr import summarize_news
+from mcp_news_aggr.fetch_news import full_text, rate_limiter
+from mcp_news_aggr.fetch_news.article import Article
+
+
+def _download_with_status(monkeypatch, status):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    transport = httpx.MockTransport(lambda request: httpx.Response(status, text="<p>gone</p>"))
+
+    async def run():
+        monkeypatch.setattr(full_text, "_client", httpx.AsyncClient(transport=transport))
+        return await full_text._download("https://example.com/story")
+
+    page = asyncio.run(run())
+    return page, rate_limiter.limiter_for("https://example.com/story")._failures
+
+
+def test_missing_page_does_not_back_off_host(monkeypatch):
+    assert _download_with_status(monkeypatch, 404) == (None, 0)
+    assert _download_with_status(monkeypatch, 403) == (None, 0)
+
+
+def test_throttling_status_backs_off_host(monkeypatch):
+    assert _download_with_status(monkeypatch, 429) == (None, 1)
+    assert _download_with_status(monkeypatch, 503) == (None, 1)
+
+
+def test_summary_key_depends_on_full_texts():
+    articles = [Article("t", "s", "2025-01-01", "https://example.com/a", "Example", 0.0)]
+    snippets = summarize_news._cache_key(articles, {})
+    first = summarize_news._cache_key(articles, {"https://example.com/a": "First text."})
+    second = summarize_news._cache_key(articles, {"https://example.com/a": "Second text."})
+
+    assert len({snippets, first, second}) == 3
+    assert summarize_news._cache_key(articles, {"https://example.com/a": "First text."}) == first
+
+
+ARTICLE_PAGE = "<p>" + "The publisher's own article text, long enough to count as a paragraph. " * 2 + "</p>"
+
+
+def _google_link(token):
+    return f"https://news.google.com/rss/articles/{token}?oc=5"
+
+
+def _old_style_token(url):
+    # Protobuf framing around the publisher URL, as in pre-2024 Google News ids
+    raw = b"\x08\x13\x22" + bytes([len(url)]) + url.encode() + b"\xd2\x01\x00"
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _fetch_page(monkeypatch, url, pages):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return pages.get(str(request.url)) or httpx.Response(404)
+
+    async def run():
+        transport = httpx.MockTransport(handler)
+        monkeypatch.setattr(
+            full_text, "_client", httpx.AsyncClient(transport=transport, follow_redirects=True)
+        )
+        return await full_text._fetch_page(url)
+
+    return asyncio.run(run()), requested
+
+
+def test_decodes_publisher_url_from_old_google_ids():
+    url = "https://publisher.example.com/2026/01/story.html"
+
+    assert full_text.decode_google_news_url(_google_link(_old_style_token(url))) == url
+    assert full_text.decode_google_news_url(_google_link("AU_yqLOpaqueId")) is None
+    assert full_text.decode_google_news_url("https://publisher.example.com/story") is None
+
+
+def test_old_google_ids_skip_the_google_request(monkeypatch):
+    url = "https://publisher.example.com/story"
+    link = _google_link(_old_style_token(url))
+
+    page, requested = _fetch_page(monkeypatch, link, {url: httpx.Response(200, html=ARTICLE_PAGE)})
+
+    assert page == ARTICLE_PAGE
+    assert requested == [url]
+
+
+def test_follows_the_publisher_link_of_a_redirect_page(monkeypatch):
+    link = _google_link("AU_yqLOpaqueId")
+    url = "https://publisher.example.com/story?id=1&ref=gn"
+    redirect_page = f'<html><c-wiz data-n-au="{url.replace("&", "&amp;")}"></c-wiz></html>'
+
+    page, requested = _fetch_page(monkeypatch, link, {
+        link: httpx.Response(200, html=redirect_page),
+        url: httpx.Response(200, html=ARTICLE_PAGE),
+    })
+
+    assert page == ARTICLE_PAGE
+    assert requested == [link, url]
+
+
+def test_http_redirects_land_on_the_publisher(monkeypatch):
+    link = _google_link("AU_yqLOpaqueId")
+    url = "https://publisher.example.com/story"
+
+    page, requested = _fetch_page(monkeypatch, link, {
+        link: httpx.Response(302, headers={"Location": url}),
+        url: httpx.Response(200, html=ARTICLE_PAGE),
+    })
+
+    assert page == ARTICLE_PAGE
+    assert requested == [link, url]
+
+
+def test_javascript_only_redirect_has_no_text(monkeypatch):
+    link = _google_link("AU_yqLOpaqueId")
+    shell = '<html><script>location.href = resolve("AU_yqLOpaqueId")</script><a href="https://news.google.com/">Google News</a></html>'
+
+    page, requested = _fetch_page(monkeypatch, link, {link: httpx.Response(200, html=shell)})
+
+    assert requested == [link]
+    assert full_text.extract_main_text(page) == ""
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from mcp_news_aggr.fetch_news.article import Article
+
+
+def _article(n, source="Reuters"):
+    return Article(
+        f"Story number {n} about the harbour strike",
+        f"Dock workers in city {n} walked out on Monday over pay and the new shift rules.",
+        "2026-01-01",
+        f"https://example.com/story/{n}",
+        source,
+    )
+
+
+def _day(days_ago):
+    return (datetime.today() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+def _restart(history):
+    for index in (history._index, history._near_index, history._offsets, history._shared_cursors):
+        index.clear()
+
+
+def test_logged_articles_survive_restart(history):
+    articles = [_article(1), _article(2)]
+
+    assert history.log_fetched_articles(articles) == articles
+    third = _article(3)
+    assert history.log_fetched_articles([_article(1), third]) == [third]
+    _restart(history)
+
+    fetched = history.get_fetched_today()
+    assert {history.article_fingerprint(a) for a in articles + [third]} <= fetched
+    copy = Article(_article(1).title + " - BBC News", _article(1).summary, url="https://www.example.com/story/1?utm_source=rss")
+    assert history.get_duplicate_index_today().has_article(copy)
+
+
+def test_duplicates_are_not_logged_twice(history):
+    history.log_fetched_articles([_article(1)])
+
+    assert history.log_fetched_articles([_article(1), _article(1)]) == []
+    with open(history._partition_path(_day(0)), encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+
+def test_index_picks_up_lines_appended_by_other_processes(history):
+    history.log_fetched_articles([_article(1)])
+    other = history._record(_article(2), _day(0))
+    line = json.dumps(other) + "\n"
+
+    with open(history._partition_path(_day(0)), "a", encoding="utf-8") as f:
+        f.write(line[:20])
+    assert other["fp"] not in history.get_fetched_today()
+
+    with open(history._partition_path(_day(0)), "a", encoding="utf-8") as f:
+        f.write(line[20:])
+    assert other["fp"] in history.get_fetched_today()
+
+
+def test_compaction_drops_old_days_and_duplicate_lines(history):
+    old, yesterday, today = _day(history.RETENTION_DAYS + 1), _day(1), _day(0)
+    record = history._record(_article(1), yesterday)
+    history._append_records(old, [record])
+    history._append_records(yesterday, [record, record, history._record(_article(2), yesterday)])
+    history._append_records(today, [record, record])
+
+    history.compact_history()
+
+    assert not os.path.exists(history._partition_path(old))
+    with open(history._partition_path(yesterday), encoding="utf-8") as f:
+        assert [json.loads(line)["fp"] for line in f] == [record["fp"], history.article_fingerprint(_article(2))]
+    with open(history._partition_path(today), encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+
+def test_day_rollover_starts_a_new_partition(history, monkeypatch):
+    monkeypatch.setattr(history, "_get_today_str", lambda: _day(1))
+    history.log_fetched_articles([_article(1)])
+    assert history.article_fingerprint(_article(1)) in history.get_fetched_today()
+
+    monkeypatch.setattr(history, "_get_today_str", lambda: _day(0))
+    assert history.article_fingerprint(_article(1)) not in history.get_fetched_today()
+    assert len(history.log_fetched_articles([_article(1)])) == 1
+
+    assert os.path.exists(history._partition_path(_day(1)))
+    assert os.path.exists(history._partition_path(_day(0)))
+    # The first write of the new day compacted the previous one out of memory
+    assert _day(1) not in history._index
+
+
+def test_legacy_file_is_imported_once(history):
+    with open(history.DB_FILE, "w", encoding="utf-8") as f:
+        json.dump({_day(0): [_article(1).to_dict()]}, f)
+
+    assert history.article_fingerprint(_article(1)) in history.get_fetched_today()
+    assert history.log_fetched_articles([_article(1)]) == []
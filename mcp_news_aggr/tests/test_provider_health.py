@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from mcp_news_aggr.fetch_news import provider_health
+from mcp_news_aggr.fetch_news.provider_health import MIN_ATTEMPTS_TO_SKIP, order_sources, provider_scores, record_fetch
+
+SOURCES = [("google", None), ("slow-feed", None), ("broken-feed", None)]
+
+
+def _names(sources):
+    return [name for name, _ in sources]
+
+
+def test_unknown_sources_keep_their_order(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+
+    assert _names(order_sources(SOURCES)) == ["google", "slow-feed", "broken-feed"]
+
+
+def test_sources_ranked_by_latency_and_fresh_yield(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    record_fetch("google", 3.0, failed=False, fresh=2)
+    record_fetch("slow-feed", 6.0, failed=False, fresh=0)
+    record_fetch("broken-feed", 0.5, failed=False, fresh=10)
+
+    assert _names(order_sources(SOURCES)) == ["broken-feed", "google", "slow-feed"]
+    assert list(provider_scores()) == ["broken-feed", "google", "slow-feed"]
+
+
+def test_failing_source_is_skipped_until_probe(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    for _ in range(MIN_ATTEMPTS_TO_SKIP):
+        record_fetch("broken-feed", 8.0, failed=True)
+        record_fetch("google", 1.0, failed=False)
+
+    assert provider_scores()["broken-feed"]["failing"]
+    assert "broken-feed" not in _names(order_sources(SOURCES))
+
+    provider_health._stats["broken-feed"].last_attempt -= provider_health.PROBE_INTERVAL
+    assert "broken-feed" in _names(order_sources(SOURCES))
+
+
+def test_best_source_kept_when_all_fail(monkeypatch):
+    monkeypatch.setattr(provider_health, "_stats", {})
+    for _ in range(MIN_ATTEMPTS_TO_SKIP):
+        record_fetch("google", 1.0, failed=True)
+
+    assert _names(order_sources(SOURCES[:1])) == ["google"]
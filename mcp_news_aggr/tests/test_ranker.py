@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.fetch_news.fingerprint import DuplicateIndex
+from mcp_news_aggr.fetch_news.ranker import rank_articles
+
+NOW = 1_800_000_000.0
+HOUR = 3600.0
+
+TOPICS = {
+    "rates": "Central bank raises interest rates again as inflation in services stays stubbornly high",
+    "storm": "Storm floods coastal towns in the north and forces hundreds of residents to leave home",
+    "chips": "Chipmaker reports record quarterly profit on demand from new data centres worldwide",
+    "bronzes": "Museum returns looted bronzes to Nigeria in a ceremony attended by officials",
+    "strike": "Dock workers walk out over pay and new shift rules, halting exports at the harbour",
+}
+
+
+def _article(topic, source="Reuters", age_hours=1.0, variant=""):
+    text = TOPICS[topic] + variant
+    timestamp = None if age_hours is None else NOW - age_hours * HOUR
+    return Article(text, text, "2026-01-01", f"https://{source.lower()}.example.com/{topic}{variant}", source, timestamp)
+
+
+def _topics(articles):
+    return [article.url.rsplit("/", 1)[1] for article in articles]
+
+
+def test_fresher_articles_rank_first():
+    candidates = [_article("rates", "A", 20), _article("storm", "B", 1), _article("chips", "C", 5)]
+
+    assert _topics(rank_articles(candidates, 3, now=NOW)) == ["storm", "chips", "rates"]
+
+
+def test_unknown_publication_time_ranks_below_fresh_news():
+    candidates = [_article("rates", "A", None), _article("storm", "B", 2)]
+
+    assert _topics(rank_articles(candidates, 2, now=NOW)) == ["storm", "rates"]
+
+
+def test_stories_already_served_today_lose_novelty():
+    history = DuplicateIndex()
+    served = _article("rates", "Other")
+    history.add_article(served)
+    candidates = [_article("rates", "A", 1, variant=" today"), _article("storm", "B", 2)]
+
+    assert _topics(rank_articles(candidates, 1, history, now=NOW)) == ["storm"]
+
+
+def test_repeating_a_source_is_penalized():
+    candidates = [_article("rates", "Reuters", 1), _article("storm", "Reuters", 1.5), _article("chips", "BBC", 3)]
+
+    assert _topics(rank_articles(candidates, 2, now=NOW)) == ["rates", "chips"]
+
+
+def test_repeating_a_topic_is_penalized():
+    candidates = [
+        _article("rates", "A", 1),
+        _article("rates", "B", 1.2, variant=" on Tuesday"),
+        _article("strike", "C", 4),
+    ]
+
+    assert _topics(rank_articles(candidates, 2, now=NOW)) == ["rates", "strike"]
+
+
+def test_ties_keep_pool_order_and_k_bounds_the_result():
+    candidates = [_article(topic, topic, 2) for topic in TOPICS]
+
+    assert _topics(rank_articles(candidates, 3, now=NOW)) == list(TOPICS)[:3]
+    assert rank_articles([], 3, now=NOW) == []
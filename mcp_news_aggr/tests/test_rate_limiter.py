@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from mcp_news_aggr.fetch_news import rate_limiter
+from mcp_news_aggr.fetch_news.rate_limiter import (
+    FAILURES_TO_OPEN,
+    HostLimiter,
+    ProviderUnavailable,
+    degraded_hosts,
+    is_throttling_status,
+    limiter_for,
+)
+
+
+def test_empty_bucket_refuses_locally():
+    limiter = HostLimiter("example.com", rate=0.1, burst=1)
+    limiter.acquire()
+
+    with pytest.raises(ProviderUnavailable) as refused:
+        limiter.acquire(max_wait=0.5)
+    assert refused.value.local
+    assert refused.value.retry_after > 0.5
+
+
+def test_failures_open_the_circuit():
+    limiter = HostLimiter("example.com", rate=100, burst=10)
+    for _ in range(FAILURES_TO_OPEN - 1):
+        limiter.record_failure()
+    limiter.acquire(max_wait=1.0)
+
+    limiter.record_failure()
+    assert limiter.retry_after() > 0
+    with pytest.raises(ProviderUnavailable):
+        limiter.acquire()
+
+
+def test_retry_after_opens_at_once_and_success_resets():
+    limiter = HostLimiter("example.com")
+    limiter.record_failure(retry_after=60)
+    assert limiter.retry_after() > 59
+
+    limiter.record_success()
+    assert limiter._failures == 0
+
+
+def test_limiters_are_shared_per_host(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    feed = limiter_for("https://Feeds.Example.com/rss.xml")
+
+    assert limiter_for("feeds.example.com") is feed
+    assert degraded_hosts() == {}
+    feed.record_failure(retry_after=30)
+    assert list(degraded_hosts()) == ["feeds.example.com"]
+
+
+def test_throttling_statuses():
+    assert is_throttling_status(429)
+    assert is_throttling_status(503)
+    assert not is_throttling_status(404)
+    assert not is_throttling_status(None)
+
+
+def test_fan_out_callers_can_raise_the_burst(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    limiter = limiter_for("www.google.com")
+    default = limiter.burst
+
+    assert limiter_for("www.google.com", burst=default + 5) is limiter
+    assert limiter.burst == default + 5
+    for _ in range(int(default) + 5):
+        limiter.acquire(max_wait=0)
+    # A smaller burst never shrinks the bucket
+    assert limiter_for("www.google.com", burst=1).burst == default + 5
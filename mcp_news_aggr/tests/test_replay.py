@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+
+from mcp_news_aggr.fetch_news.fetch_all_news import fetch_all_news_async
+from mcp_news_aggr.replay import replay, settle
+
+
+async def _fetch_twice():
+    first = await fetch_all_news_async("world")
+    await settle()
+    second = await fetch_all_news_async("world")
+    await settle()
+    return first, second
+
+
+def test_replay_serves_new_articles_per_call():
+    with replay(delay=0):
+        first, second = asyncio.run(_fetch_twice())
+
+    assert len(first) == 3
+    assert len(second) == 3
+    assert not {a.url for a in first} & {a.url for a in second}
+
+
+def test_replay_with_every_provider_down():
+    with replay(delay=0, failing=True):
+        assert asyncio.run(fetch_all_news_async("world")) == []
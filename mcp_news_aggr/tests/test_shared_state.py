@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+
+from mcp_news_aggr.fetch_news.shared_state import SQLiteState
+
+DAY = "2026-01-01"
+
+
+def _records(*fps):
+    return [{"fp": fp, "u": f"example.com/{fp}", "sh": 0xF0F0_0000_0000_0001} for fp in fps]
+
+
+def test_each_article_is_claimed_by_one_worker(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = SQLiteState(path), SQLiteState(path)
+
+    assert [r["fp"] for r in first.claim(DAY, _records("a", "b"))] == ["a", "b"]
+    assert [r["fp"] for r in second.claim(DAY, _records("b", "c"))] == ["c"]
+    # Claims are per day
+    assert [r["fp"] for r in second.claim("2026-01-02", _records("a"))] == ["a"]
+
+
+def test_claims_of_other_workers_are_read_back(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = SQLiteState(path), SQLiteState(path)
+    first.claim(DAY, _records("a", "b"))
+
+    records, cursor = second.claims_since(DAY, 0)
+    assert records == _records("a", "b")
+
+    first.claim(DAY, _records("c"))
+    records, cursor = second.claims_since(DAY, cursor)
+    assert [r["fp"] for r in records] == ["c"]
+    assert second.claims_since(DAY, cursor) == ([], cursor)
+
+
+def test_concurrent_claims_never_win_twice(tmp_path):
+    path = str(tmp_path / "state.db")
+    workers = [SQLiteState(path) for _ in range(4)]
+    fps = [f"fp{i}" for i in range(50)]
+    won: list[str] = []
+    lock = threading.Lock()
+
+    def run(state):
+        claimed = state.claim(DAY, _records(*fps))
+        with lock:
+            won.extend(r["fp"] for r in claimed)
+
+    threads = [threading.Thread(target=run, args=(state,)) for state in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(won) == sorted(fps)
+
+
+def test_prune_claims_drops_past_days(tmp_path):
+    state = SQLiteState(str(tmp_path / "state.db"))
+    state.claim("2025-12-31", _records("old"))
+    state.claim(DAY, _records("new"))
+
+    state.prune_claims(DAY)
+
+    assert state.claims_since("2025-12-31", 0) == ([], 0)
+    assert [r["fp"] for r in state.claims_since(DAY, 0)[0]] == ["new"]
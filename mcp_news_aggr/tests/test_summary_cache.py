@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+
+from mcp_news_aggr.fetch_news.article import Article
+from mcp_news_aggr.summary_cache import SummaryCache, summary_cache_key
+
+
+def _articles(*titles):
+    return [Article(title, "summary", "2026-01-01", f"https://example.com/{title}", "Example") for title in titles]
+
+
+def test_key_depends_on_article_order_and_prompt():
+    key = summary_cache_key(_articles("a", "b"), 2)
+
+    assert summary_cache_key(_articles("a", "b"), 2) == key
+    assert summary_cache_key(_articles("b", "a"), 2) != key
+    assert summary_cache_key(_articles("a", "b"), 3) != key
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache = SummaryCache(ttl=60, directory=None)
+    cache.put("k", "digest")
+    assert cache.get("k") == "digest"
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 61)
+    assert cache.get("k") is None
+    assert len(cache._entries) == 0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = SummaryCache(max_entries=2, directory=None)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_disk_tier_survives_a_new_cache(tmp_path, monkeypatch):
+    SummaryCache(directory=str(tmp_path)).put("k", "persisted")
+
+    assert SummaryCache(directory=str(tmp_path)).get("k") == "persisted"
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 10_000)
+    assert SummaryCache(ttl=3600, directory=str(tmp_path)).get("k") is None
+
+
+def test_disk_tier_prunes_expired_files(tmp_path):
+    cache = SummaryCache(ttl=0.01, directory=str(tmp_path))
+    cache.put("old", "stale")
+    time.sleep(0.02)
+    for i in range(50):
+        cache.put(f"k{i}", "fresh")
+
+    assert not (tmp_path / "old.json").exists()
@@ -5,6 +5,17 @@ class News(BaseModel):
     news: str
 
 
+class HumorizeItem(BaseModel):
+    id: str
+    summarized_text: str
+    style: str | None = None
+
+
+class HumorizeBatchRequest(BaseModel):
+    items: list[HumorizeItem]
+    coalesce: bool = False
+
+
 class HumorText(BaseModel):
     humor_text: str
 
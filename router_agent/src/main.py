@@ -1,15 +1,20 @@
 import asyncio
+import json
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Query, Request
 
 # Import the CORSMiddleware
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 
 from src.services.mcp_server_services import (
     call_humorizer,
+    call_humorizer_batch,
     call_news_aggr,
+    call_news_aggr_batch,
+    call_news_aggr_stream,
+    get_recent_news,
     generate_trancript,
     generate_video,
     get_best_prompt,
@@ -18,6 +23,7 @@ from src.services.mcp_server_services import (
 
 from src.data_classes import (
     News,
+    HumorizeBatchRequest,
     HumorText,
     StudioGenerateRequest,
     Transcript,
@@ -83,11 +89,21 @@ def ping():
 
 
 @app.get("/news")
-async def news_route(category: str = Query("world")):
+async def news_route(
+    category: str = Query("world"), max_age: int | None = Query(None, ge=0)
+):
+    """
+    Return a news summary for a category. With max_age (seconds), an archived
+    digest at most that old is served without fetching and summarizing again.
+    """
     canonical_category = NEWS_CATEGORY_LOOKUP.get(category.lower(), "world")
 
     try:
-        news_payload = await call_news_aggr(canonical_category)
+        news_payload = None
+        if max_age is not None:
+            news_payload = await get_recent_news(canonical_category, max_age)
+        if news_payload is None:
+            news_payload = await call_news_aggr(canonical_category)
     except Exception as exc:  # pragma: no cover - surfaced to client
         raise HTTPException(
             status_code=502, detail=f"Failed to fetch news: {exc}"
@@ -103,6 +119,81 @@ async def news_route(category: str = Query("world")):
     }
 
 
+@app.get("/news/batch")
+async def news_batch_route(categories: list[str] = Query(["world"])):
+    """Return one news summary per requested category."""
+    canonical_categories = list(
+        dict.fromkeys(NEWS_CATEGORY_LOOKUP.get(c.lower(), "world") for c in categories)
+    )
+
+    try:
+        news_payload = await call_news_aggr_batch(canonical_categories)
+    except Exception as exc:  # pragma: no cover - surfaced to client
+        raise HTTPException(
+            status_code=502, detail=f"Failed to fetch news: {exc}"
+        ) from exc
+
+    return {
+        "digests": news_payload.get("digests", {}),
+        "available_categories": list(AVAILABLE_NEWS_CATEGORIES),
+    }
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.get("/news/stream")
+async def news_stream_route(category: str = Query("world")):
+    """
+    Stream the news summary as server-sent events while it is being written.
+
+    Emits "delta" events with {"text": ...} for each piece of summary, then a
+    single "done" event with the same payload as /news, or an "error" event.
+    """
+    canonical_category = NEWS_CATEGORY_LOOKUP.get(category.lower(), "world")
+    deltas: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        try:
+            return await call_news_aggr_stream(canonical_category, deltas.put)
+        finally:
+            await deltas.put(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while (delta := await deltas.get()) is not None:
+                yield _sse_event("delta", {"text": delta})
+
+            try:
+                news_payload = await task
+            except Exception as exc:  # pragma: no cover - surfaced to client
+                yield _sse_event("error", {"detail": f"Failed to fetch news: {exc}"})
+                return
+
+            if "error" in news_payload:
+                yield _sse_event("error", {"detail": news_payload["error"]})
+                return
+
+            yield _sse_event(
+                "done",
+                {
+                    "summary": news_payload.get("summary", ""),
+                    "category": news_payload.get("category", canonical_category),
+                    "available_categories": list(AVAILABLE_NEWS_CATEGORIES),
+                },
+            )
+        finally:
+            task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/humorize_news")
 async def humorizer_route(news: News):
     print(f"news.news: {news.news}")
@@ -111,6 +202,55 @@ async def humorizer_route(news: News):
     return {"huomrized_news": huomrized_text}
 
 
+@app.post("/humorize_news/batch")
+async def humorizer_batch_route(request: HumorizeBatchRequest):
+    items = [item.model_dump(exclude_none=True) for item in request.items]
+    results = await call_humorizer_batch(items, request.coalesce)
+
+    return {"results": results}
+
+
+@app.post("/humorize_news/batch/stream")
+async def humorizer_batch_stream_route(request: HumorizeBatchRequest):
+    """
+    Stream a batch's results as server-sent events as soon as each is ready.
+
+    Emits a "result" event per item ({"id", "comedic_text"} or {"id", "error"}),
+    in completion order, then a "done" event with all results in input order,
+    or an "error" event.
+    """
+    items = [item.model_dump(exclude_none=True) for item in request.items]
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def run():
+        try:
+            return await call_humorizer_batch(items, request.coalesce, results.put)
+        finally:
+            await results.put(None)
+
+    async def events():
+        task = asyncio.create_task(run())
+        try:
+            while (result := await results.get()) is not None:
+                yield _sse_event("result", result)
+
+            try:
+                all_results = await task
+            except Exception as exc:  # pragma: no cover - surfaced to client
+                yield _sse_event("error", {"detail": f"Failed to humorize batch: {exc}"})
+                return
+
+            yield _sse_event("done", {"results": all_results})
+        finally:
+            task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/transcript")
 async def transcript_route(huomr_text: HumorText):
     print(f"humor_text: {huomr_text}")
@@ -36,6 +36,29 @@ async def call_humorizer(session, text):
     return parsed["comedic_text"]
 
 
+@mcp_http_session("http://mcp_humorizer:8000/mcp")
+async def call_humorizer_batch(
+    session, items: list[dict], coalesce: bool = False, on_result=None
+):
+    """
+    Comedicize several texts in one call; returns [{id, comedic_text | error}].
+    If given, on_result is awaited with each item's result as soon as it is ready.
+    """
+    await session.initialize()
+
+    async def handle_progress(progress, total, message):
+        if message and on_result is not None:
+            await on_result(json.loads(message))
+
+    result = await session.call_tool(
+        "comedicize_batch",
+        {"items": items, "coalesce": coalesce},
+        progress_callback=handle_progress,
+    )
+    parsed = json.loads(result.content[0].text)
+    return parsed["results"]
+
+
 @mcp_http_session("http://mcp_prompt_opt:8000/mcp")
 async def get_best_prompt(
     session, prompt: str, summary: str, allow_quick_opt: bool = True
@@ -90,6 +113,57 @@ async def call_news_aggr(session, category: str | None = None):
     return parsed
 
 
+@mcp_http_session("http://mcp_news_aggr:8000/mcp")
+async def get_recent_news(session, category: str, max_age_seconds: float):
+    """
+    Fetch the newest archived digest of a category if it is at most
+    max_age_seconds old, without triggering a new fetch. Returns None otherwise.
+    """
+    await session.initialize()
+    response = await session.call_tool(
+        "get_summary",
+        {"category": category, "since": f"{int(max_age_seconds)} seconds ago"},
+    )
+    parsed = json.loads(response.content[0].text)
+    if parsed.get("error") or not parsed.get("summary"):
+        return None
+    return parsed
+
+
+@mcp_http_session("http://mcp_news_aggr:8000/mcp")
+async def call_news_aggr_batch(session, categories: list[str]):
+    """Fetch one digest per category from the news aggregator in a single session."""
+    await session.initialize()
+    aggregated_news = await session.call_tool(
+        "aggregate_news_batch",
+        {"categories": categories},
+    )
+    text_result = aggregated_news.content[0].text
+    return json.loads(text_result)
+
+
+@mcp_http_session("http://mcp_news_aggr:8000/mcp")
+async def call_news_aggr_stream(session, category: str | None, on_delta):
+    """
+    Call the streaming aggregate_news tool, passing each piece of summary text
+    to on_delta as it arrives. Returns the final tool payload.
+    """
+    await session.initialize()
+
+    async def handle_progress(progress, total, message):
+        if message:
+            await on_delta(message)
+
+    payload = {"category": category} if category else None
+    aggregated_news = await session.call_tool(
+        "aggregate_news_stream",
+        payload,
+        progress_callback=handle_progress,
+    )
+    text_result = aggregated_news.content[0].text
+    return json.loads(text_result)
+
+
 @mcp_http_session("http://mcp_text_to_video:8000/mcp")
 async def generate_trancript(session, humorized_text):
     """Request a narrated transcript from the Text-to-Video MCP service."""